@@ -0,0 +1,67 @@
+"""
+Measures checkout throughput with 1..N threads ordering disjoint products
+from one shared Store.
+
+Usage:
+    python -m benchmarks.concurrency [--orders 20000] [--max-threads 8]
+
+On a GIL build of CPython the threads still share one core, so throughput
+stays roughly flat; the striped stock locks keep contention out of the way
+so that free-threaded builds can scale with the thread count.
+"""
+import argparse
+import threading
+import time
+
+import products
+import store
+
+
+def run(thread_count: int, orders: int) -> float:
+    """
+    Runs the given number of orders split over thread_count threads.
+
+    Parameters:
+        thread_count (int): The number of worker threads.
+        orders (int): The total number of orders.
+
+    Returns:
+        float: Orders per second.
+    """
+    catalog = [products.Product(f"Product {number}", price=10.0,
+                                quantity=orders)
+               for number in range(thread_count)]
+    best_buy = store.Store(catalog)
+    per_thread = orders // thread_count
+
+    def worker(product):
+        for _ in range(per_thread):
+            best_buy.checkout([(product, 1)])
+
+    threads = [threading.Thread(target=worker, args=(product,))
+               for product in catalog]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * thread_count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--max-threads", type=int, default=8)
+    args = parser.parse_args()
+
+    baseline = None
+    for thread_count in range(1, args.max_threads + 1):
+        throughput = run(thread_count, args.orders)
+        baseline = baseline or throughput
+        print(f"{thread_count} threads: {throughput:10.0f} orders/s"
+              f"  ({throughput / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures durable order throughput with the write-ahead journal, for
+1..N concurrent checkout threads. Group commit lets concurrent orders share
+fsyncs, so orders per fsync grows with the thread count.
+
+Usage:
+    python -m benchmarks.journal [--orders 2000] [--max-threads 8]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import journal
+import products
+import store
+
+
+def run(thread_count: int, orders: int, directory: str) -> tuple[float, float]:
+    """
+    Runs journaled checkouts split over thread_count threads.
+
+    Parameters:
+        thread_count (int): The number of worker threads.
+        orders (int): The total number of orders.
+        directory (str): Where to put the journal file.
+
+    Returns:
+        tuple[float, float]: Orders per second and orders per fsync.
+    """
+    catalog = [products.Product(f"Product {number}", price=10.0,
+                                quantity=orders)
+               for number in range(thread_count)]
+    best_buy = store.Store(catalog)
+    path = os.path.join(directory, f"orders-{thread_count}.journal")
+    order_journal = journal.OrderJournal(path)
+    best_buy.set_journal(order_journal)
+    per_thread = orders // thread_count
+
+    def worker(product):
+        for _ in range(per_thread):
+            best_buy.checkout([(product, 1)])
+
+    threads = [threading.Thread(target=worker, args=(product,))
+               for product in catalog]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    order_journal.close()
+    done = per_thread * thread_count
+    return done / elapsed, done / max(order_journal.get_sync_count(), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--max-threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for thread_count in range(1, args.max_threads + 1):
+            throughput, per_sync = run(thread_count, args.orders, directory)
+            print(f"{thread_count} threads: {throughput:9.0f} durable orders/s"
+                  f"  {per_sync:6.1f} orders/fsync")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures the memory used per product and per promotion object.
+
+Usage:
+    python -m benchmarks.memory [--count 100000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+import products
+import promotions
+
+
+def bytes_per_object(factory, count: int) -> float:
+    """
+    Allocates count objects and measures the traced memory they hold.
+
+    Parameters:
+        factory: Callable building one object from an int.
+        count (int): The number of objects to allocate.
+
+    Returns:
+        float: Bytes per object, including its attribute values.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(number) for number in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of the object's footprint
+    list_overhead = objects.__sizeof__()
+    del objects
+    return (after - before - list_overhead) / count
+
+
+FACTORIES = {
+    "Product": lambda number: products.Product(f"SKU-{number}",
+                                               price=9.99, quantity=number),
+    "LimitedProduct": lambda number: products.LimitedProduct(
+        f"SKU-{number}", price=9.99, quantity=number, maximum=1),
+    "NonStockedProduct": lambda number: products.NonStockedProduct(
+        f"SKU-{number}", price=9.99),
+    "PercentDiscount": lambda number: promotions.PercentDiscount(
+        f"PROMO-{number}", percent=number % 100),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, factory in FACTORIES.items():
+        print(f"{name:18} {bytes_per_object(factory, args.count):8.1f} "
+              f"bytes/object")
+
+
+if __name__ == '__main__':
+    main()
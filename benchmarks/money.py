@@ -0,0 +1,60 @@
+"""
+Compares float and integer-cents order pricing: speed of Store.order versus
+Store.order_cents, and the rounding drift of the float totals.
+
+Usage:
+    python -m benchmarks.money [--lines 100000] [--repeat 5]
+"""
+import argparse
+import time
+
+import products
+import promotions
+import store
+from money import format_cents
+
+PROMOTIONS = [None,
+              promotions.SecondHalfPrice("Second Half price!"),
+              promotions.ThirdOneFree("Third One Free!"),
+              promotions.PercentDiscount("30% off!", percent=30)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    catalog = []
+    for number in range(1000):
+        product = products.Product(f"SKU-{number}",
+                                   price=round(0.05 + number * 0.37, 2),
+                                   quantity=10 ** 12)
+        promotion = PROMOTIONS[number % len(PROMOTIONS)]
+        if promotion:
+            product.set_promotion(promotion)
+        catalog.append(product)
+    best_buy = store.Store(catalog)
+    shopping_list = [(catalog[line % len(catalog)], line % 7 + 1)
+                     for line in range(args.lines)]
+
+    timings = {}
+    for name, order in (("float", best_buy.order),
+                        ("cents", best_buy.order_cents)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            total = order(shopping_list)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = (best, total)
+
+    float_seconds, float_total = timings["float"]
+    cents_seconds, cents_total = timings["cents"]
+    print(f"{args.lines} lines")
+    print(f"float: {float_seconds:.3f}s  total {float_total!r}")
+    print(f"cents: {cents_seconds:.3f}s  total {format_cents(cents_total)}")
+    print(f"cents/float time: {cents_seconds / float_seconds:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Replays random single-product orders against ShardedStore with 1..N shards
+and prints the order throughput per shard count.
+
+Usage:
+    python -m benchmarks.sharding [--orders 200000] [--products 10000]
+                                  [--max-shards CPUS]
+"""
+import argparse
+import os
+import random
+import time
+
+import products
+from sharded_store import ShardedStore
+
+
+def run(shard_count: int, orders: list, product_count: int) -> float:
+    """
+    Replays the orders against a fresh sharded store.
+
+    Parameters:
+        shard_count (int): The number of worker processes.
+        orders (list): The shopping lists to replay.
+        product_count (int): The size of the synthetic catalog.
+
+    Returns:
+        float: Orders per second.
+    """
+    catalog = [products.Product(f"SKU-{number}", price=9.99,
+                                quantity=10 ** 9)
+               for number in range(product_count)]
+    with ShardedStore(catalog, shard_count=shard_count) as sharded:
+        start = time.perf_counter()
+        sharded.order_many(orders)
+        return len(orders) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    orders = [[(f"SKU-{rng.randrange(args.products)}", rng.randint(1, 3))]
+              for _ in range(args.orders)]
+
+    baseline = None
+    for shard_count in range(1, args.max_shards + 1):
+        throughput = run(shard_count, orders, args.products)
+        baseline = baseline or throughput
+        print(f"{shard_count} shards: {throughput:10.0f} orders/s"
+              f"  ({throughput / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures snapshot save and load times for a synthetic catalog, loading
+into a Store and, if NumPy is installed, into a ColumnarStore.
+
+Usage:
+    python -m benchmarks.snapshot [--products 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import products
+import promotions
+import store
+
+try:
+    from columnar_store import ColumnarStore
+except ImportError:  # numpy is optional
+    ColumnarStore = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=1000000)
+    args = parser.parse_args()
+
+    discount = promotions.PercentDiscount("10% off!", percent=10)
+    catalog = []
+    for number in range(args.products):
+        product = products.Product(f"SKU-{number}", price=9.99,
+                                   quantity=number)
+        if number % 10 == 0:
+            product.set_promotion(discount)
+        catalog.append(product)
+    best_buy = store.Store(catalog)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.snap")
+        start = time.perf_counter()
+        best_buy.save_snapshot(path)
+        saved = time.perf_counter()
+        store.Store.load_snapshot(path)
+        loaded = time.perf_counter()
+        size = os.path.getsize(path)
+        columnar_loaded = None
+        if ColumnarStore is not None:
+            try:
+                ColumnarStore.load_snapshot(path)
+                columnar_loaded = time.perf_counter() - loaded
+            except ImportError:
+                pass
+
+    print(f"{args.products} products, {size / 2 ** 20:.1f} MiB")
+    print(f"save: {saved - start:.3f}s  load: {loaded - saved:.3f}s")
+    if columnar_loaded is not None:
+        print(f"columnar load: {columnar_loaded:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
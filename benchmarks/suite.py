@@ -0,0 +1,234 @@
+"""
+Benchmarks the catalog, validation, pricing and ordering hot paths on
+synthetic catalogs and writes the results to a JSON file. A previous results
+file can be given to flag regressions between commits.
+
+Usage:
+    python -m benchmarks.suite [--sizes 1000 100000 10000000]
+                               [--output results.json]
+                               [--compare baseline.json] [--threshold 0.2]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from pricing_cache import PRICING_CACHE
+import products
+import promotions
+import store
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+MINIMUM_DIFFERENCE = 1e-5  # seconds
+PROMOTIONS = [promotions.SecondHalfPrice("Second Half price!"),
+              promotions.ThirdOneFree("Third One Free!"),
+              promotions.PercentDiscount("30% off!", percent=30)]
+
+
+def build_catalog(size: int) -> list[products.Product]:
+    """
+    Builds a synthetic catalog: mostly plain products, every 50th limited,
+    every 100th non-stocked and every 10th with a promotion.
+
+    Parameter:
+        size (int): The number of products.
+
+    Returns:
+        list[products.Product]: The catalog.
+    """
+    catalog = []
+    for number in range(size):
+        name = f"SKU-{number}"
+        if number % 100 == 99:
+            product = products.NonStockedProduct(name, price=4.99)
+        elif number % 50 == 49:
+            product = products.LimitedProduct(name, price=19.99,
+                                              quantity=10 ** 9, maximum=5)
+        else:
+            product = products.Product(name, price=9.99, quantity=10 ** 9)
+        if number % 10 == 0:
+            product.set_promotion(PROMOTIONS[number // 10 % len(PROMOTIONS)])
+        catalog.append(product)
+    return catalog
+
+
+def measure(function, repeat: int, setup=None) -> float:
+    """
+    Times a function, keeping the best of several runs.
+
+    Parameters:
+        function: Callable taking the setup result, or nothing.
+        repeat (int): The number of timed runs.
+        setup: Optional untimed callable run before every run.
+
+    Returns:
+        float: The fastest run in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        if setup:
+            function(argument)
+        else:
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def catalog_benchmarks(size: int, repeat: int) -> dict[str, float]:
+    """
+    Runs the store benchmarks on one catalog size.
+
+    Parameters:
+        size (int): The number of products.
+        repeat (int): Timed runs per benchmark.
+
+    Returns:
+        dict[str, float]: Seconds per benchmark.
+    """
+    catalog = build_catalog(size)
+    best_buy = store.Store(catalog)
+    large_order = [(product, 1) for product in catalog[:1000]]
+    duplicate_order = [(catalog[number % 10], 1) for number in range(10000)]
+    sample = catalog[::max(1, size // 1000)]
+
+    def removal_setup():
+        # Fresh products: a store built over the shared catalog would stay
+        # registered as an observer of every product and slow down the
+        # following benchmarks
+        removal_catalog = build_catalog(size)
+        return (store.Store(removal_catalog),
+                removal_catalog[size // 2:size // 2 + 100])
+
+    def remove(arguments):
+        removal_store, removed = arguments
+        for product in removed:
+            removal_store.remove_product(product)
+
+    results = {
+        "get_all_products": measure(best_buy.get_all_products, repeat),
+        "get_total_quantity x1000":
+            measure(lambda: [best_buy.get_total_quantity()
+                             for _ in range(1000)], repeat),
+        "validate_order 1000 lines":
+            measure(lambda: best_buy.validate_order(large_order), repeat),
+        "validate_order 10000 duplicate lines":
+            measure(lambda: best_buy.validate_order(duplicate_order), repeat),
+        "order 1000 lines":
+            measure(lambda: best_buy.order(large_order), repeat),
+        "Product.__str__ x1000":
+            measure(lambda: [str(product) for product in sample], repeat),
+    }
+    # Last, so the removal stores cannot affect the other benchmarks
+    results["remove_product x100"] = measure(remove, repeat, removal_setup)
+    return results
+
+
+def promotion_benchmarks(repeat: int, calls: int = 10000) -> dict[str, float]:
+    """
+    Times apply_promotion of every promotion, independent of catalog size.
+
+    Parameters:
+        repeat (int): Timed runs per promotion.
+        calls (int): apply_promotion calls per run.
+
+    Returns:
+        dict[str, float]: Seconds per run of calls, keyed by promotion class.
+    """
+    product = products.Product("Benchmark", price=9.99, quantity=10 ** 9)
+    results = {}
+    for promotion in PROMOTIONS:
+        def apply(promotion=promotion):
+            for quantity in range(calls):
+                promotion.apply_promotion(product, quantity)
+        results[f"{type(promotion).__name__}.apply_promotion x{calls}"] = \
+            measure(apply, repeat)
+
+        def apply_cached(promotion=promotion):
+            for quantity in range(calls):
+                PRICING_CACHE.apply(promotion, product, quantity % 10)
+        maxsize = PRICING_CACHE.get_maxsize()
+        PRICING_CACHE.set_maxsize(1024)
+        results[f"{type(promotion).__name__}.apply_promotion cached "
+                f"x{calls}"] = measure(apply_cached, repeat)
+        PRICING_CACHE.set_maxsize(maxsize)
+    return results
+
+
+def current_commit() -> str | None:
+    """
+    Retrieves the checked out git commit, if any.
+
+    Returns:
+        str | None: The commit hash, None outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict[str, float], baseline: dict[str, float],
+            threshold: float) -> list[str]:
+    """
+    Prints the change of every benchmark against a baseline.
+
+    Parameters:
+        results (dict[str, float]): The current seconds per benchmark.
+        baseline (dict[str, float]): The baseline seconds per benchmark.
+        threshold (float): Relative slowdown counted as a regression.
+
+    Returns:
+        list[str]: The names of the regressed benchmarks.
+    """
+    regressions = []
+    for name in sorted(results.keys() & baseline.keys()):
+        ratio = results[name] / baseline[name] if baseline[name] else 1.0
+        marker = ""
+        # Differences below the timer noise are not regressions
+        if (ratio > 1 + threshold
+                and results[name] - baseline[name] > MINIMUM_DIFFERENCE):
+            regressions.append(name)
+            marker = "  REGRESSION"
+        print(f"{name:<50} {baseline[name] * 1e3:10.3f}ms -> "
+              f"{results[name] * 1e3:10.3f}ms ({ratio:5.2f}x){marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = promotion_benchmarks(args.repeat)
+    for size in args.sizes:
+        for name, seconds in catalog_benchmarks(size, args.repeat).items():
+            results[f"{size}/{name}"] = seconds
+    for name, seconds in results.items():
+        print(f"{name:<50} {seconds * 1e3:10.3f}ms")
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump({"commit": current_commit(),
+                   "python": platform.python_version(),
+                   "results": results}, output, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nCompared to {baseline.get('commit') or args.compare}:")
+        if compare(results, baseline["results"], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,434 @@
+"""
+Cart-level promotions evaluated once per shopping list.
+
+Rules discount a whole cart on top of the per-product promotions: bundles
+across products, buy X get Y free and tiered spend discounts. The
+PromotionEngine indexes its rules by product name, so evaluating a cart only
+looks at the rules of the products in it plus the cart-wide rules.
+
+Stacking: rules run by descending priority, item rules before cart-wide
+rules. A stackable rule combines with other stackable rules. A rule that is
+not stackable only applies to products no other rule discounted, and once
+applied its products take no further discounts.
+"""
+from abc import ABC, abstractmethod
+import itertools
+
+import pricing
+from products import Product
+
+
+class CartRule(ABC):
+    """
+    Abstract base class for cart-level promotion rules.
+
+    Attributes:
+        __name (str): The name of the rule.
+        __priority (int): Rules with a higher priority apply first.
+        __stackable (bool): Whether the rule combines with other rules.
+    """
+
+    def __init__(self, name: str, priority: int = 0, stackable: bool = True):
+        """
+        Initializes the rule.
+
+        Parameters:
+            name (str): The name of the rule.
+            priority (int, optional): Evaluation priority. Defaults to 0.
+            stackable (bool, optional): Whether the rule combines with other
+                                        rules on the same products.
+                                        Defaults to True.
+
+        Raises:
+            ValueError: If name is not a non-empty string or priority not an
+            int.
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Name must be a non-empty string")
+        if not isinstance(priority, int):
+            raise ValueError("Priority must be a int")
+        self.__name = name
+        self.__priority = priority
+        self.__stackable = bool(stackable)
+
+    def get_name(self) -> str:
+        """
+        Retrieves the name of the rule.
+
+        Returns:
+            str: The name of the rule.
+        """
+        return self.__name
+
+    def get_priority(self) -> int:
+        """
+        Retrieves the priority of the rule.
+
+        Returns:
+            int: The priority, higher applies first.
+        """
+        return self.__priority
+
+    def is_stackable(self) -> bool:
+        """
+        Checks whether the rule combines with other rules.
+
+        Returns:
+            bool: True if the rule is stackable.
+        """
+        return self.__stackable
+
+    @abstractmethod
+    def get_product_names(self) -> frozenset[str] | None:
+        """
+        Retrieves the products the rule applies to.
+
+        Returns:
+            frozenset[str] | None: The product names, None for a cart-wide
+                                   rule.
+        """
+        pass
+
+    @abstractmethod
+    def discount(self, lines: dict[str, tuple[Product, int]],
+                 total: float) -> float:
+        """
+        Calculates the discount of the rule for a cart.
+
+        Parameters:
+            lines (dict[str, tuple[Product, int]]): Product and aggregated
+                                                    quantity per name.
+            total (float): The cart total after the rules applied so far.
+
+        Returns:
+            float: The discount, 0.0 if the rule does not apply.
+        """
+        pass
+
+
+class BundleRule(CartRule):
+    """
+    A set of products sold together at a fixed bundle price.
+    """
+
+    def __init__(self, name: str, bundle: dict[str, int], price: float,
+                 priority: int = 0, stackable: bool = True):
+        """
+        Initializes the bundle.
+
+        Parameters:
+            name (str): The name of the rule.
+            bundle (dict[str, int]): Quantity per product name in one bundle.
+            price (float): The price of one bundle.
+            priority (int, optional): Evaluation priority. Defaults to 0.
+            stackable (bool, optional): Whether the rule combines with other
+                                        rules. Defaults to True.
+
+        Raises:
+            ValueError: If the bundle is empty, a quantity is not a positive
+            int or the price is negative.
+        """
+        super().__init__(name, priority, stackable)
+        if not bundle or not all(isinstance(quantity, int) and quantity > 0
+                                 for quantity in bundle.values()):
+            raise ValueError("Bundle quantities must be positive ints")
+        if not isinstance(price, (int, float)) or price < 0:
+            raise ValueError("Price must be a non-negative number")
+        self.__bundle = dict(bundle)
+        self.__price = price
+
+    def get_product_names(self) -> frozenset[str]:
+        return frozenset(self.__bundle)
+
+    def discount(self, lines: dict[str, tuple[Product, int]],
+                 total: float) -> float:
+        """
+        Discounts every complete bundle in the cart down to the bundle price.
+        """
+        bundles = min((lines[name][1] // quantity if name in lines else 0)
+                      for name, quantity in self.__bundle.items())
+        if not bundles:
+            return 0.0
+        regular = sum(lines[name][0].get_price() * quantity
+                      for name, quantity in self.__bundle.items())
+        return max(0.0, bundles * (regular - self.__price))
+
+
+class BuyXGetYRule(CartRule):
+    """
+    Buy a number of a product and get a number more of it for free.
+    """
+
+    def __init__(self, name: str, product_name: str, buy: int, get: int,
+                 priority: int = 0, stackable: bool = True):
+        """
+        Initializes the rule.
+
+        Parameters:
+            name (str): The name of the rule.
+            product_name (str): The product the rule applies to.
+            buy (int): The number of paid items per group.
+            get (int): The number of free items per group.
+            priority (int, optional): Evaluation priority. Defaults to 0.
+            stackable (bool, optional): Whether the rule combines with other
+                                        rules. Defaults to True.
+
+        Raises:
+            ValueError: If buy or get is not a positive int.
+        """
+        super().__init__(name, priority, stackable)
+        if not all(isinstance(count, int) and count > 0
+                   for count in (buy, get)):
+            raise ValueError("Buy and get must be positive ints")
+        self.__product_name = product_name
+        self.__buy = buy
+        self.__get = get
+
+    def get_product_names(self) -> frozenset[str]:
+        return frozenset((self.__product_name,))
+
+    def discount(self, lines: dict[str, tuple[Product, int]],
+                 total: float) -> float:
+        """
+        Discounts the free items of every complete buy + get group.
+        """
+        if self.__product_name not in lines:
+            return 0.0
+        product, quantity = lines[self.__product_name]
+        groups = quantity // (self.__buy + self.__get)
+        return groups * self.__get * product.get_price()
+
+
+class TieredSpendRule(CartRule):
+    """
+    A cart-wide percentage discount that grows with the cart total.
+    """
+
+    def __init__(self, name: str, tiers: list[tuple[float, int]],
+                 priority: int = 0, stackable: bool = True):
+        """
+        Initializes the rule.
+
+        Parameters:
+            name (str): The name of the rule.
+            tiers (list[tuple[float, int]]): (minimum total, percent) pairs.
+            priority (int, optional): Evaluation priority. Defaults to 0.
+            stackable (bool, optional): Whether the rule combines with other
+                                        rules. Defaults to True.
+
+        Raises:
+            ValueError: If there are no tiers or a percent is not an int
+            between 0 and 100.
+        """
+        super().__init__(name, priority, stackable)
+        if not tiers or not all(isinstance(percent, int)
+                                and 0 <= percent <= 100
+                                for _, percent in tiers):
+            raise ValueError("Tiers must have percents between 0 and 100")
+        self.__tiers = sorted(tiers)
+
+    def get_product_names(self) -> None:
+        return None
+
+    def discount(self, lines: dict[str, tuple[Product, int]],
+                 total: float) -> float:
+        """
+        Discounts the percent of the highest tier the total reaches.
+        """
+        percent = 0
+        for minimum, tier_percent in self.__tiers:
+            if total < minimum:
+                break
+            percent = tier_percent
+        return total * (percent / 100)
+
+
+class CartPricing:
+    """
+    The price of a cart after the cart-level rules.
+
+    Attributes:
+        __subtotal (float): The total after per-product promotions.
+        __discounts (list[tuple[str, float]]): (rule name, discount) of every
+                                               applied rule, in order.
+    """
+
+    def __init__(self, subtotal: float, discounts: list[tuple[str, float]]):
+        self.__subtotal = subtotal
+        self.__discounts = discounts
+
+    def get_subtotal(self) -> float:
+        """
+        Retrieves the total before the cart-level rules.
+
+        Returns:
+            float: The total after per-product promotions.
+        """
+        return self.__subtotal
+
+    def get_discounts(self) -> list[tuple[str, float]]:
+        """
+        Retrieves the applied rules.
+
+        Returns:
+            list[tuple[str, float]]: (rule name, discount) pairs.
+        """
+        return self.__discounts
+
+    def get_total(self) -> float:
+        """
+        Retrieves the price of the cart.
+
+        Returns:
+            float: The subtotal minus all discounts.
+        """
+        total = self.__subtotal
+        for _, discount in self.__discounts:
+            total -= discount
+        return total
+
+
+class PromotionEngine:
+    """
+    Evaluates cart-level rules against whole shopping lists.
+
+    Attributes:
+        __rules (dict[CartRule, int]): The rules and their registration
+                                       number, which breaks priority ties.
+        __by_product (dict[str, list[CartRule]]): The item rules per product
+                                                  name.
+        __cart_wide (list[CartRule]): The rules that apply to every cart.
+        __sequence (itertools.count): Registration number generator.
+    """
+
+    def __init__(self, rules: list[CartRule] | None = None):
+        """
+        Initializes the engine.
+
+        Parameter:
+            rules (list[CartRule], optional): The initial rules.
+        """
+        self.__rules: dict[CartRule, int] = {}
+        self.__by_product: dict[str, list[CartRule]] = {}
+        self.__cart_wide: list[CartRule] = []
+        self.__sequence = itertools.count()
+        for rule in rules or []:
+            self.add_rule(rule)
+
+    def __sort_key(self, rule: CartRule) -> tuple[int, int]:
+        """Orders rules by descending priority, then registration."""
+        return -rule.get_priority(), self.__rules[rule]
+
+    def add_rule(self, rule: CartRule):
+        """
+        Adds a rule and indexes it by the products it applies to.
+
+        Parameter:
+            rule (CartRule): The rule to add.
+
+        Raises:
+            ValueError: If the rule is already added.
+        """
+        if rule in self.__rules:
+            raise ValueError(f"Rule already added: {rule.get_name()}")
+        self.__rules[rule] = next(self.__sequence)
+        names = rule.get_product_names()
+        if names is None:
+            self.__cart_wide.append(rule)
+            self.__cart_wide.sort(key=self.__sort_key)
+        for name in names or ():
+            rules = self.__by_product.setdefault(name, [])
+            rules.append(rule)
+            rules.sort(key=self.__sort_key)
+
+    def remove_rule(self, rule: CartRule):
+        """
+        Removes a rule.
+
+        Parameter:
+            rule (CartRule): The rule to remove.
+
+        Raises:
+            ValueError: If the rule is not in the engine.
+        """
+        if rule not in self.__rules:
+            raise ValueError(f"Unknown rule: {rule.get_name()}")
+        del self.__rules[rule]
+        names = rule.get_product_names()
+        if names is None:
+            self.__cart_wide.remove(rule)
+        for name in names or ():
+            self.__by_product[name].remove(rule)
+            if not self.__by_product[name]:
+                del self.__by_product[name]
+
+    def get_rules(self) -> list[CartRule]:
+        """
+        Retrieves all rules in evaluation order.
+
+        Returns:
+            list[CartRule]: The rules.
+        """
+        return sorted(self.__rules, key=self.__sort_key)
+
+    def get_rules_for(self, name: str) -> list[CartRule]:
+        """
+        Retrieves the item rules of a product.
+
+        Parameter:
+            name (str): The product name.
+
+        Returns:
+            list[CartRule]: The rules in evaluation order.
+        """
+        return list(self.__by_product.get(name, ()))
+
+    def evaluate(self, shopping_list: list[tuple[Product, int]]) \
+            -> CartPricing:
+        """
+        Prices a shopping list with per-product promotions and the cart-level
+        rules, without changing any stock. Only the rules indexed for the
+        products in the cart and the cart-wide rules are looked at.
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]):
+                                A list of tuples where each tuple consists of
+                                a Product and the quantity to be purchased.
+
+        Returns:
+            CartPricing: The subtotal and the applied discounts.
+        """
+        subtotal: float = 0.0
+        lines: dict[str, list] = {}
+        for product, quantity in shopping_list:
+            subtotal += pricing.price_line(product, quantity)
+            line = lines.setdefault(product.get_name(), [product, 0])
+            line[1] += quantity
+        lines = {name: tuple(line) for name, line in lines.items()}
+
+        candidates: dict[CartRule, None] = {}
+        for name in lines:
+            for rule in self.__by_product.get(name, ()):
+                candidates[rule] = None
+        item_rules = sorted(candidates, key=self.__sort_key)
+
+        total = subtotal
+        discounts: list[tuple[str, float]] = []
+        discounted: set[str] = set()
+        exclusive: set[str] = set()
+        cart = frozenset(lines)
+        for rule in itertools.chain(item_rules, self.__cart_wide):
+            names = rule.get_product_names()
+            names = cart if names is None else names & cart
+            if names & exclusive or (not rule.is_stackable()
+                                     and names & discounted):
+                continue
+            discount = min(rule.discount(lines, total), total)
+            if discount <= 0:
+                continue
+            discounts.append((rule.get_name(), discount))
+            total -= discount
+            discounted |= names
+            if not rule.is_stackable():
+                exclusive |= names
+        return CartPricing(subtotal, discounts)
@@ -0,0 +1,301 @@
+"""
+Streaming catalog import from CSV or JSONL files.
+
+Each row describes one product:
+
+    type       product | limited | non_stocked   (default: product)
+    name       the product name
+    price      the price
+    quantity   the stock, ignored for non_stocked products
+    maximum    the order maximum of limited products
+    promotion  optional key into the promotions mapping given to the import
+
+Rows flow through a generator pipeline (read, parse and validate, batch), so
+memory stays bounded by the batch size regardless of the file size.
+
+Usage:
+    python catalog_import.py catalog.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import time
+
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import Promotion
+
+
+class ImportReport:
+    """
+    Outcome of a catalog import.
+
+    Attributes:
+        __imported (int): The number of products added to the store.
+        __rejected (list[tuple[int, str]]): (line number, reason) of rejected
+                                            rows, up to max_rejected of them.
+        __rejected_count (int): The number of rejected rows.
+        __seconds (float): The duration of the import.
+    """
+
+    def __init__(self, max_rejected: int):
+        """
+        Initializes an empty report.
+
+        Parameter:
+            max_rejected (int): How many rejected rows to keep details for.
+        """
+        self.__max_rejected = max_rejected
+        self.__imported: int = 0
+        self.__rejected: list[tuple[int, str]] = []
+        self.__rejected_count: int = 0
+        self.__seconds: float = 0.0
+
+    def add_imported(self, count: int):
+        """Counts imported products."""
+        self.__imported += count
+
+    def add_rejected(self, line_number: int, reason: str):
+        """Records a rejected row."""
+        self.__rejected_count += 1
+        if len(self.__rejected) < self.__max_rejected:
+            self.__rejected.append((line_number, reason))
+
+    def set_seconds(self, seconds: float):
+        """Sets the duration of the import."""
+        self.__seconds = seconds
+
+    def get_imported(self) -> int:
+        """
+        Retrieves the number of products added to the store.
+
+        Returns:
+            int: The imported product count.
+        """
+        return self.__imported
+
+    def get_rejected(self) -> list[tuple[int, str]]:
+        """
+        Retrieves the first rejected rows.
+
+        Returns:
+            list[tuple[int, str]]: (line number, reason) pairs.
+        """
+        return self.__rejected
+
+    def get_rejected_count(self) -> int:
+        """
+        Retrieves the number of rejected rows, including those without details.
+
+        Returns:
+            int: The rejected row count.
+        """
+        return self.__rejected_count
+
+    def get_rows_per_second(self) -> float:
+        """
+        Retrieves the import throughput.
+
+        Returns:
+            float: Rows (imported and rejected) per second.
+        """
+        rows = self.__imported + self.__rejected_count
+        return rows / self.__seconds if self.__seconds else 0.0
+
+
+def read_rows(path: str):
+    """
+    Streams the rows of a CSV (by header) or JSONL (one object per line) file.
+
+    Parameter:
+        path (str): The catalog file, .jsonl/.json for JSON lines, else CSV.
+
+    Yields:
+        tuple[int, dict | None]: The line number and the row, None when the
+                                 line cannot be decoded.
+    """
+    with open(path, newline="", encoding="utf-8") as catalog:
+        if path.endswith((".jsonl", ".json")):
+            for line_number, line in enumerate(catalog, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    row = None
+                yield line_number, row if isinstance(row, dict) else None
+        else:
+            reader = csv.DictReader(catalog)
+            for row in reader:
+                yield reader.line_num, row
+
+
+def parse_number(value, convert, message: str):
+    """
+    Converts a CSV string strictly, e.g. "2.7" is not an int. Other values
+    come from JSON and are passed through unchanged, for the Product setters
+    to reject anything of the wrong type instead of truncating it. Booleans
+    are rejected here, the setters would take them as ints.
+
+    Parameters:
+        value: The row value.
+        convert (type): int or float.
+        message (str): The error message for an invalid string.
+
+    Returns:
+        The converted string or the value itself.
+
+    Raises:
+        ValueError: If a string is not a valid number or value is a boolean.
+    """
+    if isinstance(value, bool):
+        raise ValueError(message)
+    if not isinstance(value, str):
+        return value
+    try:
+        return convert(value)
+    except ValueError:
+        raise ValueError(message) from None
+
+
+def parse_product(row: dict, promotions: dict[str, Promotion]) -> Product:
+    """
+    Builds a product from a row, validating it through the Product setters.
+
+    Parameters:
+        row (dict): The row values.
+        promotions (dict[str, Promotion]): Promotions by their row key.
+
+    Returns:
+        Product: The validated product.
+
+    Raises:
+        ValueError: If the row is invalid.
+    """
+    kind = (row.get("type") or "product").strip()
+    if "name" not in row or "price" not in row:
+        raise ValueError("Name, price and quantity are required")
+    product = new_product(kind, row)
+    product.set_name(row["name"])
+    price = parse_number(row["price"], float, "Price must be a float")
+    # JSON writes whole prices as integers, which are exact as floats
+    product.set_price(float(price) if type(price) is int else price)
+    if kind != "non_stocked" and row.get("quantity") not in (None, ""):
+        product.set_quantity(parse_number(row["quantity"], int,
+                                          "Quantity must be a int"))
+    if row.get("promotion"):
+        if row["promotion"] not in promotions:
+            raise ValueError(f"Unknown promotion: {row['promotion']}")
+        product.set_promotion(promotions[row["promotion"]])
+    return product
+
+
+def new_product(kind: str, row: dict) -> Product:
+    """
+    Creates an empty product of a row's type, with the maximum of limited
+    products set.
+
+    Parameters:
+        kind (str): The product type of the row.
+        row (dict): The row values.
+
+    Returns:
+        Product: The product, to be filled in by parse_product.
+
+    Raises:
+        ValueError: If the type is unknown or the maximum is invalid.
+    """
+    if kind == "product":
+        return Product("", 0.0, 0)
+    if kind == "non_stocked":
+        return NonStockedProduct("", 0.0)
+    if kind == "limited":
+        product = LimitedProduct("", 0.0, 0, 0)
+        product.set_maximum(parse_number(row.get("maximum"), int,
+                                         "Maximum must be a int"))
+        return product
+    raise ValueError(f"Unknown product type: {kind}")
+
+
+def import_catalog(best_buy, path: str, batch_size: int = 10000,
+                   promotions: dict[str, Promotion] | None = None,
+                   max_rejected: int = 1000) -> ImportReport:
+    """
+    Streams a catalog file into a store in batches.
+
+    Parameters:
+        best_buy: The store to fill, anything with add_products(), e.g.
+                  Store or SQLiteStore.
+        path (str): The CSV or JSONL catalog file.
+        batch_size (int): Products per add_products call.
+        promotions (dict[str, Promotion], optional): Promotions by row key.
+        max_rejected (int): How many rejected rows to keep details for.
+
+    Returns:
+        ImportReport: Imported and rejected counts and the throughput.
+    """
+    report = ImportReport(max_rejected)
+    start = time.perf_counter()
+
+    def valid_products():
+        for line_number, row in read_rows(path):
+            if row is None:
+                report.add_rejected(line_number, "Malformed row")
+                continue
+            try:
+                yield line_number, parse_product(row, promotions or {})
+            except ValueError as error:
+                report.add_rejected(line_number, str(error))
+
+    rows = valid_products()
+    while batch := list(itertools.islice(rows, batch_size)):
+        add_batch(best_buy, batch, report)
+
+    report.set_seconds(time.perf_counter() - start)
+    return report
+
+
+def add_batch(best_buy, batch: list[tuple[int, Product]],
+              report: ImportReport):
+    """
+    Adds a batch of parsed products to a store in one call. A duplicate name
+    rejects the whole batch, which is then retried row by row so only the
+    duplicates are rejected.
+
+    Parameters:
+        best_buy: The store to fill, see import_catalog.
+        batch (list[tuple[int, Product]]): Line numbers and products.
+        report (ImportReport): Counts the imported and rejected rows.
+    """
+    try:
+        best_buy.add_products([product for _, product in batch])
+        report.add_imported(len(batch))
+    except ValueError:
+        for line_number, product in batch:
+            try:
+                best_buy.add_products([product])
+                report.add_imported(1)
+            except ValueError as error:
+                report.add_rejected(line_number, str(error))
+
+
+def main():
+    """Imports a catalog file into an empty store and prints the report."""
+    from store import Store
+
+    parser = argparse.ArgumentParser(description="Import a product catalog")
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    best_buy = Store([])
+    report = import_catalog(best_buy, args.path, args.batch_size)
+    print(f"Imported {report.get_imported()} products, rejected "
+          f"{report.get_rejected_count()} rows "
+          f"({report.get_rows_per_second():.0f} rows/s)")
+    for line_number, reason in report.get_rejected():
+        print(f"  line {line_number}: {reason}")
+
+
+if __name__ == '__main__':
+    main()
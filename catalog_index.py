@@ -0,0 +1,93 @@
+import bisect
+
+
+class SortedIndex:
+    """
+    A sorted list of unique keys, kept in order with bisect.
+
+    Lookups and range starts cost O(log n); an insert or removal is one
+    bisect plus a list memmove.
+
+    Attributes:
+        __keys (list): The keys in ascending order.
+    """
+
+    def __init__(self, keys=()):
+        """
+        Initializes the index.
+
+        Parameter:
+            keys (iterable, optional): The initial keys, in any order.
+        """
+        self.__keys: list = sorted(keys)
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def add(self, key):
+        """
+        Inserts a key at its sorted position.
+
+        Parameter:
+            key: The key to insert.
+        """
+        bisect.insort(self.__keys, key)
+
+    def remove(self, key):
+        """
+        Removes a key.
+
+        Parameter:
+            key: The key to remove.
+
+        Raises:
+            ValueError: If the key is not in the index.
+        """
+        position = bisect.bisect_left(self.__keys, key)
+        if position == len(self.__keys) or self.__keys[position] != key:
+            raise ValueError(f"Key not in index: {key!r}")
+        del self.__keys[position]
+
+    def bisect_left(self, key, by=None) -> int:
+        """
+        Finds the first position whose key is not below the given one.
+
+        Parameters:
+            key: The key, or the key part extracted by `by`.
+            by (optional): Extracts the compared part of a key.
+
+        Returns:
+            int: The position.
+        """
+        return bisect.bisect_left(self.__keys, key, key=by)
+
+    def bisect_right(self, key, by=None) -> int:
+        """
+        Finds the first position whose key is above the given one.
+
+        Parameters:
+            key: The key, or the key part extracted by `by`.
+            by (optional): Extracts the compared part of a key.
+
+        Returns:
+            int: The position.
+        """
+        return bisect.bisect_right(self.__keys, key, key=by)
+
+    def iterate(self, start: int, stop: int, descending: bool = False):
+        """
+        Yields the keys of a position range.
+
+        Parameters:
+            start (int): The first position.
+            stop (int): The position after the last one.
+            descending (bool, optional): Yield from stop - 1 down to start.
+
+        Yields:
+            The keys of the range.
+        """
+        keys = self.__keys
+        positions = (range(stop - 1, start - 1, -1) if descending
+                     else range(start, stop))
+        for position in positions:
+            yield keys[position]
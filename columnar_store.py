@@ -0,0 +1,642 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only this backend needs it
+    np = None
+
+from money import to_cents
+import pricing
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import Promotion
+import snapshot
+from store import QuantityExceededError, MaximumExceededError
+
+KIND_PRODUCT = 0
+KIND_NON_STOCKED = 1
+KIND_LIMITED = 2
+
+NO_MAXIMUM = -1
+
+
+class _RowView:
+    """
+    Mixin that turns a Product class into a lightweight view over one row of
+    a ColumnarStore. Every getter and setter reads or writes the store's
+    columns, so changes made through a view and through the vectorized
+    store operations are always consistent.
+    """
+
+    def __init__(self, store, row: int):
+        """
+        Initializes the view.
+
+        Parameters:
+            store (ColumnarStore): The store that owns the columns.
+            row (int): The row of the product in the columns.
+        """
+        self._store = store
+        self._row = row
+
+    def get_row(self) -> int:
+        """
+        Retrieves the row of the product in the store's columns.
+
+        Returns:
+            int: The row index.
+        """
+        return self._row
+
+    def get_name(self):
+        """Reads the name column."""
+        return self._store._names[self._row]
+
+    def set_name(self, name: str):
+        """Renames the row, keeping the name index in sync."""
+        if isinstance(name, str) and name.strip():
+            self._store._rename(self._row, name)
+        else:
+            raise ValueError("Name must be a non-empty string")
+
+    def get_price(self):
+        """Reads the price column."""
+        return float(self._store._prices[self._row])
+
+    def set_price(self, price: float):
+        """Writes the price column, validated like Product.set_price."""
+        if isinstance(price, float) and price >= 0.0:
+            self._store._prices[self._row] = price
+        else:
+            raise ValueError("Price must be a float")
+
+    def get_price_cents(self) -> int:
+        """Converts the price column to whole cents."""
+        return to_cents(self.get_price())
+
+    def set_price_cents(self, price_cents: int):
+        """Writes the price column from whole cents."""
+        if isinstance(price_cents, int) and price_cents >= 0:
+            self.set_price(price_cents / 100)
+        else:
+            raise ValueError("Price cents must be a non-negative int")
+
+    def get_quantity(self):
+        """Reads the quantity column."""
+        return int(self._store._quantities[self._row])
+
+    def set_quantity(self, quantity: int):
+        """Writes the quantity column, validated like Product.set_quantity."""
+        if isinstance(quantity, int) and quantity >= 0:
+            self._store._quantities[self._row] = quantity
+        else:
+            raise ValueError("Quantity must be a int")
+
+        if quantity == 0:  # Deactivate if Zero (0)
+            self.deactivate()
+
+    def is_active(self):
+        """Reads the active column."""
+        return bool(self._store._active[self._row])
+
+    def set_is_active(self, is_active: bool):
+        """Writes the active column."""
+        if isinstance(is_active, bool):
+            self._store._active[self._row] = is_active
+        else:
+            raise ValueError("Is_active must be a bool")
+
+    def get_promotion(self):
+        """Reads the promotion column."""
+        return self._store._promotions[self._row]
+
+    def set_promotion(self, promotion: Promotion):
+        """Writes the promotion column."""
+        if isinstance(promotion, Promotion) and promotion:
+            self._store._promotions[self._row] = promotion
+        else:
+            raise ValueError("Promotion must be a non-empty")
+
+    def get_category(self):
+        """Columnar rows have no category column."""
+        return None
+
+    def set_category(self, category: str | None):
+        """Columnar rows have no category column."""
+        raise ValueError("Columnar products have no category")
+
+    def get_maximum(self):
+        """Reads the maximum column."""
+        return int(self._store._maximums[self._row])
+
+    def set_maximum(self, maximum: int):
+        """Writes the maximum column."""
+        if isinstance(maximum, int) and maximum >= 0:
+            self._store._maximums[self._row] = maximum
+        else:
+            raise ValueError("Maximum must be a int")
+
+    def add_observer(self, observer):
+        """Views have no observers, the store derives everything from columns."""
+        raise TypeError("Columnar product views cannot be observed")
+
+    def remove_observer(self, observer):
+        """Views have no observers."""
+        pass
+
+    def _notify(self, attribute: str, old_value, new_value):
+        """Views have no observers."""
+        pass
+
+    def __hash__(self):
+        """Returns a hash of the product's name."""
+        return hash(self.get_name())
+
+
+class ProductRow(_RowView, Product):
+    """A Product backed by a row of a ColumnarStore."""
+
+
+class NonStockedProductRow(_RowView, NonStockedProduct):
+    """A NonStockedProduct backed by a row of a ColumnarStore."""
+
+
+class LimitedProductRow(_RowView, LimitedProduct):
+    """A LimitedProduct backed by a row of a ColumnarStore."""
+
+
+_VIEW_CLASSES = {
+    KIND_PRODUCT: ProductRow,
+    KIND_NON_STOCKED: NonStockedProductRow,
+    KIND_LIMITED: LimitedProductRow
+}
+
+
+class ColumnarStore:
+    """
+    Optional Store backend that keeps the catalog in NumPy columns instead of
+    one object per product. It offers the same catalog and order API as
+    store.Store, returning Product views over single rows, plus vectorized
+    bulk operations for reports and repricing.
+
+    Removed products leave a tombstone row so existing views stay valid.
+
+    Attributes:
+        _names (list[str]): Product names per row, see the property.
+        _prices (np.ndarray): float64 prices per row.
+        _quantities (np.ndarray): int64 quantities per row.
+        _maximums (np.ndarray): int64 order maximums, NO_MAXIMUM if unlimited.
+        _active (np.ndarray): bool active flags per row.
+        _present (np.ndarray): bool, False for removed rows.
+        _kinds (np.ndarray): int8 product kind per row.
+        _promotions (list[Promotion | None]): Promotion per row.
+        __names (list[str] | None): The names, None until a loaded
+                                    snapshot's names are decoded.
+        __name_source (tuple | None): The encoded names of a loaded snapshot.
+        __rows (dict[str, int] | None): Row index keyed by product name,
+                                        None until first used after a load.
+        __size (int): Number of rows in use.
+    """
+
+    def __init__(self, product_list: list[Product], capacity: int = 1024):
+        """
+        Initializes the ColumnarStore, copying the given products into columns.
+
+        Parameters:
+            product_list (list[Product]): Products to load into the columns.
+            capacity (int): Initial number of rows to allocate.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("ColumnarStore requires numpy")
+
+        capacity = max(capacity, len(product_list), 1)
+        self.__names: list[str] | None = []
+        self.__name_source: tuple | None = None
+        self._promotions: list[Promotion | None] = []
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._quantities = np.zeros(capacity, dtype=np.int64)
+        self._maximums = np.full(capacity, NO_MAXIMUM, dtype=np.int64)
+        self._active = np.zeros(capacity, dtype=bool)
+        self._present = np.zeros(capacity, dtype=bool)
+        self._kinds = np.zeros(capacity, dtype=np.int8)
+        self.__rows: dict[str, int] | None = {}
+        self.__size: int = 0
+
+        for product in product_list:
+            self.add_product(product)
+
+    @classmethod
+    def load_snapshot(cls, path: str):
+        """
+        Creates a store from a snapshot written by Store.save_snapshot.
+
+        The product records are read straight into the columns with
+        np.frombuffer, so no Product object is built per row. The names are
+        decoded and indexed on first use, so vectorized operations such as
+        get_total_quantity() or scale_prices() never pay for them.
+
+        Parameter:
+            path (str): The snapshot file to read.
+
+        Returns:
+            ColumnarStore: A store holding the restored catalog.
+
+        Raises:
+            ValueError: If the file is not a snapshot.
+        """
+        columns = snapshot.load_columns(path)
+        columnar = cls([], capacity=1)
+        columnar.__load_columns(columns)
+        return columnar
+
+    def __load_columns(self, columns: dict):
+        """
+        Replaces the empty columns with loaded ones.
+
+        Parameter:
+            columns (dict): The columns, see snapshot.load_columns.
+        """
+        size = len(columns["kinds"])
+        if not size:
+            return  # Keep the allocated columns, __grow() cannot double 0
+        self._promotions = columns["promotions"]
+        self._kinds = columns["kinds"]
+        self._prices = columns["prices"]
+        self._quantities = columns["quantities"]
+        self._maximums = np.where(self._kinds == KIND_LIMITED,
+                                  columns["maximums"], NO_MAXIMUM)
+        self._active = columns["active"]
+        self._present = np.ones(size, dtype=bool)
+        self.__names = None
+        self.__name_source = (columns["name_blob"], columns["name_offsets"],
+                              columns["name_lengths"])
+        self.__rows = None
+        self.__size = size
+
+    @property
+    def _names(self) -> list[str]:
+        """Product names per row, decoded on first use after a load."""
+        if self.__names is None:
+            self.__names = snapshot.decode_names(*self.__name_source)
+            self.__name_source = None
+        return self.__names
+
+    def __row_index(self) -> dict[str, int]:
+        """
+        Retrieves the row index keyed by product name, building it on first
+        use after a load.
+
+        Raises:
+            ValueError: If a loaded snapshot repeats a name.
+        """
+        if self.__rows is None:
+            names = self._names
+            rows = dict(zip(names, range(len(names))))
+            if len(rows) != len(names):
+                raise ValueError("Product already exists in store")
+            self.__rows = rows
+        return self.__rows
+
+    def __grow(self):
+        """Doubles the capacity of every column."""
+        capacity = len(self._prices) * 2
+        for column in ("_prices", "_quantities", "_maximums", "_active",
+                       "_present", "_kinds"):
+            old = getattr(self, column)
+            new = np.resize(old, capacity)
+            new[len(old):] = NO_MAXIMUM if column == "_maximums" else 0
+            setattr(self, column, new)
+
+    def __view(self, row: int) -> Product:
+        """
+        Creates a product view over a row.
+
+        Parameter:
+            row (int): The row index.
+
+        Returns:
+            Product: A view of the matching product class.
+        """
+        return _VIEW_CLASSES[int(self._kinds[row])](self, row)
+
+    def __live(self):
+        """Returns a mask of the rows that hold a product."""
+        return self._present[:self.__size]
+
+    def _rename(self, row: int, name: str):
+        """
+        Moves a row to a new name in the name index.
+
+        Parameters:
+            row (int): The row index.
+            name (str): The new product name.
+        """
+        rows = self.__row_index()
+        del rows[self._names[row]]
+        rows[name] = row
+        self._names[row] = name
+
+    def add_product(self, product):
+        """
+        Copies a product into a new row.
+
+        Parameter:
+            product (Product): The product to add to the store's inventory.
+
+        Raises:
+            ValueError: If a product with the same name is already in the store.
+        """
+        if product.get_name() in self.__row_index():
+            raise ValueError("Product already exists in store")
+        if self.__size == len(self._prices):
+            self.__grow()
+
+        row = self.__size
+        if isinstance(product, LimitedProduct):
+            self._kinds[row] = KIND_LIMITED
+            self._maximums[row] = product.get_maximum()
+        elif isinstance(product, NonStockedProduct):
+            self._kinds[row] = KIND_NON_STOCKED
+        else:
+            self._kinds[row] = KIND_PRODUCT
+        self._names.append(product.get_name())
+        self._promotions.append(product.get_promotion())
+        self._prices[row] = product.get_price()
+        self._quantities[row] = product.get_quantity()
+        self._active[row] = product.is_active()
+        self._present[row] = True
+        self.__row_index()[product.get_name()] = row
+        self.__size += 1
+
+    def add_products(self, product_list: list[Product]):
+        """
+        Copies many products into new rows. Either every product is added
+        or, on a duplicate name, none is.
+
+        Parameter:
+            product_list (list[Product]): The products to add.
+
+        Raises:
+            ValueError: If a name repeats or is already in the store.
+        """
+        names = [product.get_name() for product in product_list]
+        if (len(set(names)) != len(names)
+                or not self.__row_index().keys().isdisjoint(names)):
+            raise ValueError("Product already exists in store")
+        for product in product_list:
+            self.add_product(product)
+
+    def remove_product(self, product):
+        """
+        Removes a product, leaving a tombstone row.
+
+        Parameter:
+            product (Product): The product to remove from the store's inventory.
+
+        Raises:
+            ValueError: If the product is not in the store.
+        """
+        if product not in self:
+            raise ValueError("Product not found in store")
+        row = self.__row_index().pop(product.get_name())
+        self._present[row] = False
+        self._active[row] = False
+        self._quantities[row] = 0
+
+    def get_product(self, name: str) -> Product | None:
+        """
+        Looks up a product by its name.
+
+        Parameter:
+            name (str): The name of the product.
+
+        Returns:
+            Product | None: A view of the product, or None if not found.
+        """
+        row = self.__row_index().get(name)
+        return None if row is None else self.__view(row)
+
+    def contains(self, product) -> bool:
+        """
+        Checks if the store carries an equal product.
+
+        Parameter:
+            product (Product): The product to look up.
+
+        Returns:
+            bool: True if the store carries an equal product, False otherwise.
+        """
+        return self.get_product(product.get_name()) == product
+
+    def __contains__(self, product):
+        """Supports `product in store` through the name index."""
+        return self.contains(product)
+
+    def __len__(self):
+        """Returns the number of products in the store's inventory."""
+        return len(self.__row_index())
+
+    def get_products(self) -> list[Product]:
+        """
+        Retrieves views of every product in the store.
+
+        Returns:
+            list[Product]: The products in the store's inventory.
+        """
+        return [self.__view(row) for row in np.flatnonzero(self.__live())]
+
+    def get_all_products(self) -> list[Product]:
+        """
+        Retrieves views of all active products, filtered in one vector operation.
+
+        Returns:
+            list[Product]: A list of active products in the store.
+        """
+        return [self.__view(row)
+                for row in np.flatnonzero(self.active_mask())]
+
+    def active_mask(self):
+        """
+        Retrieves the active flags of the rows in use.
+
+        Returns:
+            np.ndarray: A boolean mask, True where a product is active.
+        """
+        return self._active[:self.__size] & self.__live()
+
+    def get_total_quantity(self) -> int:
+        """
+        Sums the quantity column.
+
+        Returns:
+            int: The sum of quantities for all products in the store.
+        """
+        return int(self._quantities[:self.__size].sum())
+
+    def get_inventory_value(self) -> float:
+        """
+        Computes the stock value (price times quantity) of the whole catalog.
+
+        Returns:
+            float: The summed value of all products in stock.
+        """
+        size = self.__size
+        return float(np.dot(self._prices[:size],
+                            self._quantities[:size]))
+
+    def scale_prices(self, factor: float, mask=None):
+        """
+        Multiplies the price of every product (or of the masked rows) by a
+        factor in a single vector operation.
+
+        Parameters:
+            factor (float): The multiplier, e.g. 1.05 for a 5% increase.
+            mask (np.ndarray, optional): Boolean mask over the rows in use,
+                                         e.g. from active_mask().
+
+        Raises:
+            ValueError: If factor is negative.
+        """
+        if factor < 0:
+            raise ValueError("Factor must not be negative")
+        prices = self._prices[:self.__size]
+        if mask is None:
+            prices *= factor
+        else:
+            prices[mask] *= factor
+
+    def set_prices(self, names: list[str], prices):
+        """
+        Sets the price of many products at once.
+
+        Parameters:
+            names (list[str]): The product names.
+            prices: The new prices, aligned with names.
+
+        Raises:
+            KeyError: If a name is not in the store.
+            ValueError: If any price is negative.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if (prices < 0).any():
+            raise ValueError("Price must be a float")
+        index = self.__row_index()
+        rows = np.fromiter((index[name] for name in names),
+                           dtype=np.int64, count=len(names))
+        self._prices[rows] = prices
+
+    def validate_order(self,
+                       shopping_list: list[tuple[Product, int]]) -> None:
+        """
+        Validates a shopping list against the stock and maximum columns.
+        Quantities of repeated products are aggregated before checking.
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]):
+                                A list of tuples, each containing a Product
+                                and the quantity to be ordered.
+
+        Raises:
+            ValueError: If a product is not in the store, a quantity is not
+            a non-negative int, or any product quantity exceeds the available
+            quantity or maximum order limit.
+        """
+        if shopping_list:
+            self.__check_order(*self.__order_rows(shopping_list))
+
+    def __order_rows(self, shopping_list: list[tuple[Product, int]]):
+        """
+        Looks up the rows and quantities of a shopping list.
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]): The order lines.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The row and quantity per line.
+
+        Raises:
+            ValueError: If a product is not in the store or a quantity is not
+            a non-negative int.
+        """
+        index = self.__row_index()
+        rows = np.empty(len(shopping_list), dtype=np.int64)
+        orders = np.empty(len(shopping_list), dtype=np.int64)
+        for line, (product, order) in enumerate(shopping_list):
+            row = index.get(product.get_name())
+            if row is None:
+                raise ValueError("Product not found in store: "
+                                 f"{product.get_name()}")
+            if not isinstance(order, int) or isinstance(order, bool) \
+                    or order < 0:
+                raise ValueError("Quantity must be a int")
+            rows[line], orders[line] = row, order
+        return rows, orders
+
+    def __check_order(self, rows, orders):
+        """
+        Checks the aggregated quantity per product against the stock and
+        maximum columns.
+
+        Parameters:
+            rows (np.ndarray): The row per order line.
+            orders (np.ndarray): The quantity per order line.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The distinct rows and their total
+                                           ordered quantities.
+
+        Raises:
+            ValueError: If any product quantity exceeds the available quantity
+            or maximum order limit.
+        """
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        totals = np.zeros(len(unique_rows), dtype=np.int64)
+        np.add.at(totals, inverse, orders)
+        kinds = self._kinds[unique_rows]
+
+        stocked = kinds != KIND_NON_STOCKED
+        if (stocked & (self._quantities[unique_rows] < totals)).any():
+            raise QuantityExceededError(
+                "Error while making order! Quantity larger than what exists\n")
+
+        exceeded = (kinds == KIND_LIMITED) \
+            & (totals > self._maximums[unique_rows])
+        if exceeded.any():
+            maximum = int(self._maximums[unique_rows[exceeded][0]])
+            raise MaximumExceededError(
+                f"Error while making order! The maximum order is {maximum}\n")
+        return unique_rows, totals
+
+    def order(self, shopping_list: list[tuple[Product, int]]) -> float:
+        """
+        Processes an order based on the provided shopping list, calculating
+        the total cost. The whole list is validated first and the stock is
+        then decremented in one vector operation, so a rejected order
+        changes nothing.
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]):
+                                A list of tuples where each tuple consists of
+                                a Product and the quantity to be purchased.
+
+        Returns:
+            float: The total cost of the order.
+
+        Raises:
+            ValueError: If the order is invalid, see validate_order.
+        """
+        if not shopping_list:
+            return 0.0
+        rows, orders = self.__order_rows(shopping_list)
+        unique_rows, totals = self.__check_order(rows, orders)
+
+        stocked = self._kinds[unique_rows] != KIND_NON_STOCKED
+        unique_rows, totals = unique_rows[stocked], totals[stocked]
+        self._quantities[unique_rows] -= totals
+        # Deactivate if Zero (0), like Product.set_quantity
+        self._active[unique_rows[self._quantities[unique_rows] == 0]] = False
+
+        total_cost: float = 0.0
+        for row, order in zip(rows.tolist(), orders.tolist()):
+            total_cost += pricing.price_line(self.__view(row), order)
+        return total_cost
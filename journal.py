@@ -0,0 +1,372 @@
+"""
+Write-ahead order journal with group commit and crash recovery.
+
+Every committed order is appended as one record:
+
+    payload length, crc32, sequence    (struct JOURNAL_RECORD)
+    payload                            JSON [[product name, quantity], ...]
+
+Stock levels set by Store.bulk_update are recorded as absolute quantities,
+with the payload {"set": [[product name, quantity], ...]}.
+
+A background thread writes the pending records and fsyncs them in batches
+(group commit): orders that arrive while an fsync is running share the next
+one, so the per-order cost of durability stays low under load.
+
+On startup, recover() loads the last snapshot and replays the records with a
+higher sequence. compact() writes a fresh snapshot and empties the journal.
+"""
+import json
+import os
+import struct
+import threading
+import zlib
+
+import snapshot
+from products import NonStockedProduct
+from store import Store
+
+JOURNAL_RECORD = struct.Struct("<IIQ")
+
+
+class OrderJournal:
+    """
+    Append-only, group committed journal of stock decrements.
+
+    Attributes:
+        __path (str): The journal file.
+        __file: The journal file object, opened for appending.
+        __condition (threading.Condition): Guards the fields below.
+        __pending (list[bytes]): Encoded records not written yet.
+        __last_sequence (int): Sequence of the last appended record.
+        __durable_sequence (int): Sequence of the last fsynced record.
+        __sync_count (int): Number of fsyncs performed.
+        __io_lock (threading.Lock): Serializes writes and truncation.
+        __closing (bool): True once close() was called.
+        __error (OSError | None): The write or fsync error that stopped the
+                                  flusher, None while it works.
+        __flusher (threading.Thread): The group commit thread.
+    """
+
+    def __init__(self, path: str, start_sequence: int | None = None):
+        """
+        Opens (or creates) a journal file and starts the group commit thread.
+
+        A torn record left by a crash is cut off, so new records are appended
+        right after the last readable one.
+
+        Parameters:
+            path (str): The journal file.
+            start_sequence (int, optional): Sequence to continue from.
+                Defaults to the last sequence found in the file.
+        """
+        last_sequence, valid_length = 0, 0
+        for last_sequence, _, valid_length in _scan(path):
+            pass
+        if start_sequence is None:
+            start_sequence = last_sequence
+        self.__path = path
+        self.__file = open(path, "ab")
+        self.__file.truncate(valid_length)
+        self.__condition = threading.Condition()
+        self.__pending: list[bytes] = []
+        self.__last_sequence: int = start_sequence
+        self.__durable_sequence: int = start_sequence
+        self.__sync_count: int = 0
+        self.__io_lock = threading.Lock()
+        self.__closing: bool = False
+        self.__error: OSError | None = None
+        self.__flusher = threading.Thread(target=self.__flush_loop,
+                                          name="order-journal", daemon=True)
+        self.__flusher.start()
+
+    def append(self, lines: list[tuple[str, int]]) -> int:
+        """
+        Queues a record for the next group commit. Callers that must not
+        acknowledge the order before it is durable call wait() afterwards.
+
+        Parameter:
+            lines (list[tuple[str, int]]): (product name, quantity) pairs.
+
+        Returns:
+            int: The sequence assigned to the record.
+
+        Raises:
+            ValueError: If the journal is closed or failed.
+        """
+        return self.__append(lines)
+
+    def append_quantities(self, quantities: list[tuple[str, int]]) -> int:
+        """
+        Queues a record of absolute stock levels, replayed by setting the
+        quantities instead of subtracting them.
+
+        Parameter:
+            quantities (list[tuple[str, int]]): (product name, new quantity)
+                                                pairs.
+
+        Returns:
+            int: The sequence assigned to the record.
+
+        Raises:
+            ValueError: If the journal is closed or failed.
+        """
+        return self.__append({"set": quantities})
+
+    def __append(self, record) -> int:
+        """Encodes a record and queues it, see append()."""
+        payload = json.dumps(record, separators=(",", ":")).encode()
+        with self.__condition:
+            if self.__closing:
+                raise ValueError("Journal is closed")
+            if self.__error is not None:
+                raise ValueError(f"Journal failed: {self.__error}")
+            self.__last_sequence += 1
+            sequence = self.__last_sequence
+            self.__pending.append(
+                JOURNAL_RECORD.pack(len(payload), zlib.crc32(payload),
+                                    sequence) + payload)
+            self.__condition.notify_all()
+        return sequence
+
+    def wait(self, sequence: int) -> None:
+        """
+        Blocks until the record with the given sequence is fsynced.
+
+        Parameter:
+            sequence (int): A sequence returned by append().
+
+        Raises:
+            OSError: If writing the journal failed before the record was
+            durable. The record may be lost on a crash.
+        """
+        with self.__condition:
+            self.__condition.wait_for(
+                lambda: (self.__durable_sequence >= sequence
+                         or self.__error is not None))
+            if self.__durable_sequence < sequence:
+                raise self.__error
+
+    def get_last_sequence(self) -> int:
+        """
+        Retrieves the sequence of the last appended record.
+
+        Returns:
+            int: The last sequence, durable or not.
+        """
+        with self.__condition:
+            return self.__last_sequence
+
+    def get_sync_count(self) -> int:
+        """
+        Retrieves the number of fsyncs, to compare against the record count.
+
+        Returns:
+            int: The number of group commits performed.
+        """
+        with self.__condition:
+            return self.__sync_count
+
+    def truncate(self) -> None:
+        """
+        Empties the journal file once every appended record is durable. Used
+        after the records were folded into a snapshot.
+        """
+        self.wait(self.get_last_sequence())
+        with self.__io_lock:
+            self.__file.truncate(0)
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+
+    def close(self) -> None:
+        """Writes the pending records, stops the flusher and closes the file."""
+        with self.__condition:
+            self.__closing = True
+            self.__condition.notify_all()
+        self.__flusher.join()
+        try:
+            self.__file.close()
+        except OSError:
+            if self.__error is None:
+                raise  # A failed journal already reported its error
+
+    def __flush_loop(self):
+        """
+        Writes and fsyncs pending records in batches until closed. A write or
+        fsync error stops the loop; it is kept and raised by every wait()
+        for a record that is not durable.
+        """
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(
+                    lambda: self.__pending or self.__closing)
+                if not self.__pending:
+                    return
+                batch, self.__pending = self.__pending, []
+                sequence = self.__last_sequence
+
+            try:
+                with self.__io_lock:
+                    self.__file.write(b"".join(batch))
+                    self.__file.flush()
+                    os.fsync(self.__file.fileno())
+            except OSError as error:
+                with self.__condition:
+                    self.__error = error
+                    self.__condition.notify_all()
+                return
+
+            with self.__condition:
+                self.__durable_sequence = sequence
+                self.__sync_count += 1
+                self.__condition.notify_all()
+
+
+def read_journal(path: str):
+    """
+    Streams the records of a journal file. A torn or corrupt record ends the
+    stream: it was never acknowledged, and everything after it is unreadable.
+
+    Parameter:
+        path (str): The journal file.
+
+    Yields:
+        tuple[int, list | dict]: The sequence and lines of a record: the
+                                 (product name, quantity) decrements of an
+                                 order, or {"set": [(product name,
+                                 quantity), ...]} for absolute stock levels.
+    """
+    for sequence, lines, _ in _scan(path):
+        yield sequence, lines
+
+
+def _scan(path: str):
+    """
+    Streams the readable records of a journal file with their end offsets.
+
+    Parameter:
+        path (str): The journal file.
+
+    Yields:
+        tuple[int, list | dict, int]: The sequence and lines of a record,
+                                      see read_journal, and its end offset.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as journal:
+        while header := journal.read(JOURNAL_RECORD.size):
+            if len(header) < JOURNAL_RECORD.size:
+                return
+            length, checksum, sequence = JOURNAL_RECORD.unpack(header)
+            payload = journal.read(length)
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                return
+            record = json.loads(payload)
+            if isinstance(record, dict):
+                lines = {"set": [(name, quantity)
+                                 for name, quantity in record["set"]]}
+            else:
+                lines = [(name, quantity) for name, quantity in record]
+            yield sequence, lines, journal.tell()
+
+
+def replay(best_buy: Store, journal_path: str, after_sequence: int = 0) -> int:
+    """
+    Applies the journaled stock decrements and stock levels onto a store.
+
+    Parameters:
+        best_buy (Store): The store to update, typically just loaded from a
+                          snapshot.
+        journal_path (str): The journal file.
+        after_sequence (int): Records up to this sequence are already part
+                              of the store and are skipped.
+
+    Returns:
+        int: The last sequence applied (or after_sequence).
+
+    Raises:
+        ValueError: If a record takes more stock than the product has, which
+        means the journal does not match the snapshot.
+    """
+    last_sequence = after_sequence
+    for sequence, lines in read_journal(journal_path):
+        if sequence <= after_sequence:
+            continue
+        if isinstance(lines, dict):
+            for name, quantity in lines["set"]:
+                product = best_buy.get_product(name)
+                if product is not None:
+                    product.set_quantity(quantity)
+        else:
+            for name, quantity in lines:
+                _replay_decrement(best_buy.get_product(name), quantity,
+                                  sequence)
+        last_sequence = sequence
+    return last_sequence
+
+
+def _replay_decrement(product, quantity: int, sequence: int) -> None:
+    """
+    Subtracts one journaled order line from the stock.
+
+    Parameters:
+        product (Product | None): The ordered product, None if the store no
+                                  longer carries it.
+        quantity (int): The ordered quantity.
+        sequence (int): The sequence of the record, for the error message.
+
+    Raises:
+        ValueError: If the product has less stock than the line takes.
+    """
+    if product is None or isinstance(product, NonStockedProduct):
+        return
+    if product.get_quantity() < quantity:
+        raise ValueError(
+            f"Journal record {sequence} takes {quantity} of "
+            f"{product.get_name()!r}, but only {product.get_quantity()} "
+            "are in stock: the journal does not match the snapshot")
+    product.set_quantity(product.get_quantity() - quantity)
+
+
+def recover(snapshot_path: str, journal_path: str) -> tuple[Store, OrderJournal]:
+    """
+    Rebuilds the store after a restart or crash: loads the snapshot, replays
+    the newer journal records and reopens the journal on the store.
+
+    Parameters:
+        snapshot_path (str): The last snapshot written by compact().
+        journal_path (str): The journal file.
+
+    Returns:
+        tuple[Store, OrderJournal]: The recovered store, journaling again.
+    """
+    best_buy = Store.load_snapshot(snapshot_path)
+    last_sequence = replay(best_buy, journal_path,
+                           snapshot.read_sequence(snapshot_path))
+    journal = OrderJournal(journal_path, start_sequence=last_sequence)
+    best_buy.set_journal(journal)
+    return best_buy, journal
+
+
+def compact(best_buy: Store, journal: OrderJournal,
+            snapshot_path: str) -> None:
+    """
+    Folds the journal into a new snapshot and empties the journal.
+
+    Orders are paused while the snapshot is taken so it matches the journal
+    sequence exactly. The snapshot is written to a temporary file and renamed,
+    so a crash leaves either the old or the new snapshot; records already in
+    the snapshot are skipped on replay by their sequence.
+
+    Parameters:
+        best_buy (Store): The journaled store.
+        journal (OrderJournal): The store's journal.
+        snapshot_path (str): The snapshot file to replace.
+    """
+    temporary_path = snapshot_path + ".tmp"
+    with best_buy.pause_orders():
+        best_buy.save_snapshot(temporary_path, journal.get_last_sequence())
+        with open(temporary_path, "rb") as written:
+            os.fsync(written.fileno())
+        os.replace(temporary_path, snapshot_path)
+        journal.truncate()
@@ -0,0 +1,125 @@
+import math
+
+# Bucket boundaries grow by 5%, so percentiles are accurate to about 5%
+BUCKET_GROWTH = 1.05
+SMALLEST_LATENCY = 1e-7  # seconds, anything faster lands in bucket 0
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with constant memory, for recording
+    millions of samples and reading percentiles afterwards.
+
+    Attributes:
+        __buckets (dict[int, int]): Sample count per bucket index.
+        __count (int): The number of samples.
+        __total (float): The sum of all samples in seconds.
+        __maximum (float): The slowest sample in seconds.
+    """
+
+    def __init__(self):
+        """Initializes an empty histogram."""
+        self.__buckets: dict[int, int] = {}
+        self.__count: int = 0
+        self.__total: float = 0.0
+        self.__maximum: float = 0.0
+
+    @staticmethod
+    def bucket_of(seconds: float) -> int:
+        """
+        Maps a latency to its bucket index.
+
+        Parameter:
+            seconds (float): The latency.
+
+        Returns:
+            int: The bucket index.
+        """
+        if seconds <= SMALLEST_LATENCY:
+            return 0
+        return int(math.log(seconds / SMALLEST_LATENCY, BUCKET_GROWTH)) + 1
+
+    @staticmethod
+    def upper_bound(bucket: int) -> float:
+        """
+        Retrieves the largest latency of a bucket.
+
+        Parameter:
+            bucket (int): The bucket index.
+
+        Returns:
+            float: The bucket's upper bound in seconds.
+        """
+        return SMALLEST_LATENCY * BUCKET_GROWTH ** bucket
+
+    def record(self, seconds: float):
+        """
+        Adds one sample.
+
+        Parameter:
+            seconds (float): The latency.
+        """
+        bucket = self.bucket_of(seconds)
+        self.__buckets[bucket] = self.__buckets.get(bucket, 0) + 1
+        self.__count += 1
+        self.__total += seconds
+        if seconds > self.__maximum:
+            self.__maximum = seconds
+
+    def get_count(self) -> int:
+        """
+        Retrieves the number of samples.
+
+        Returns:
+            int: The sample count.
+        """
+        return self.__count
+
+    def get_total(self) -> float:
+        """
+        Retrieves the sum of all samples.
+
+        Returns:
+            float: The total latency in seconds.
+        """
+        return self.__total
+
+    def get_maximum(self) -> float:
+        """
+        Retrieves the slowest sample.
+
+        Returns:
+            float: The maximum latency in seconds.
+        """
+        return self.__maximum
+
+    def get_buckets(self) -> list[tuple[float, int]]:
+        """
+        Retrieves the non-empty buckets in ascending order.
+
+        Returns:
+            list[tuple[float, int]]: (upper bound in seconds, count) pairs.
+        """
+        return [(self.upper_bound(bucket), self.__buckets[bucket])
+                for bucket in sorted(self.__buckets)]
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimates a latency percentile from the buckets.
+
+        Parameter:
+            percent (float): The percentile, e.g. 99 for p99.
+
+        Returns:
+            float: The bucket upper bound holding the percentile, in seconds,
+                   never more than the maximum sample. 0.0 when empty.
+        """
+        if not self.__count:
+            return 0.0
+        rank = math.ceil(self.__count * percent / 100) or 1
+        seen = 0
+        for upper_bound, count in self.get_buckets():
+            seen += count
+            if seen >= rank:
+                return min(upper_bound, self.__maximum)
+        return self.__maximum
@@ -1,3 +1,6 @@
+import argparse
+import sys
+
 import products
 import promotions
 import store
@@ -8,6 +11,10 @@ LIST_ITEMS = "2"
 MAKE_ORDER = "3"
 EXIT_APP = "4"
 
+# Batch script command words, alongside the menu numbers
+BATCH_COMMANDS = {"list": LIST_PRODUCTS, "total": LIST_ITEMS,
+                  "order": MAKE_ORDER, "quit": EXIT_APP}
+
 
 def print_menu() -> None:
     """Display the menu options for the user."""
@@ -28,8 +35,6 @@ def list_products(best_buy: store.Store):
     """
     print_products(best_buy)
 
-    select_options(call_menu(), best_buy)
-
 
 def show_items_in_store(best_buy):
     """
@@ -40,8 +45,6 @@ def show_items_in_store(best_buy):
     """
     print(f"Total of {best_buy.get_total_quantity()} items in store\n")
 
-    select_options(call_menu(), best_buy)
-
 
 def make_order(best_buy: store.Store):
     """
@@ -52,9 +55,7 @@ def make_order(best_buy: store.Store):
     """
     list_products_for_order = order_product(best_buy)
 
-    best_buy = validate_order_util(best_buy, list_products_for_order)
-
-    select_options(call_menu(), best_buy)
+    validate_order_util(best_buy, list_products_for_order)
 
 
 def quit_app(best_buy: store.Store):
@@ -64,13 +65,16 @@ def quit_app(best_buy: store.Store):
     best_buy = []
 
 
-def select_options(user_choice: str, best_buy: store.Store) -> None:
+def select_options(user_choice: str, best_buy: store.Store) -> bool:
     """
     Executes a function based on the user's menu choice.
 
     Parameters:
         user_choice (str): The menu option selected by the user.
         best_buy (store.Store): The store instance containing product information.
+
+    Returns:
+        bool: False once the user chose to quit, else True.
     """
     func_dict = {
         f"{LIST_PRODUCTS}":
@@ -87,6 +91,7 @@ def select_options(user_choice: str, best_buy: store.Store) -> None:
 
     if user_choice in option:
         func_dict[user_choice](best_buy)
+    return user_choice != EXIT_APP
 
 
 def return_options() -> list:
@@ -112,7 +117,10 @@ def call_menu() -> str:
         try:
             print_menu()
 
-            input_available_commands = input("Please choose a number: ")
+            try:
+                input_available_commands = input("Please choose a number: ")
+            except EOFError:  # stdin closed: quit instead of looping
+                return EXIT_APP
 
             if input_available_commands == 4:
                 break
@@ -132,18 +140,90 @@ def call_menu() -> str:
 
 def start(best_buy: store.Store):
     """
-    Starts the store application by calling the selected menu option.
+    Starts the store application: a flat loop that dispatches every menu
+    choice until the user quits, so long sessions keep a constant stack.
 
     Parameter:
         best_buy (store.Store): The store instance containing product information.
     """
-    select_options(call_menu(), best_buy)
+    while select_options(call_menu(), best_buy):
+        pass
+
+
+def parse_order(arguments: str,
+                best_buy: store.Store) -> list[tuple[products.Product, int]]:
+    """
+    Parses the arguments of a batch order command.
+
+    Parameters:
+        arguments (str): Comma separated "product name=quantity" pairs.
+        best_buy (store.Store): The store to look the products up in.
+
+    Returns:
+        list[tuple[products.Product, int]]: The shopping list.
+
+    Raises:
+        ValueError: If a pair is malformed or names an unknown product.
+    """
+    shopping_list = []
+    for pair in filter(str.strip, arguments.split(",")):
+        name, separator, quantity = pair.rpartition("=")
+        product = best_buy.get_product(name.strip())
+        if not separator or product is None or not quantity.strip().isdigit():
+            raise ValueError(f"Error adding product! {pair.strip()}")
+        shopping_list.append((product, int(quantity)))
+    return shopping_list
+
+
+def run_batch(best_buy: store.Store, script) -> int:
+    """
+    Runs a script of menu commands without prompting, one command per line:
 
+        list                          (or 1)
+        total                         (or 2)
+        order Shipping=1, Google Pixel 7=2   (or 3 ...)
+        quit                          (or 4, ends the script)
 
-def main():
+    Blank lines and lines starting with # are skipped.
+
+    Parameters:
+        best_buy (store.Store): The store to run the commands against.
+        script: An iterable of lines, e.g. an open file or sys.stdin.
+
+    Returns:
+        int: The number of commands that failed.
     """
-    Main function that initializes products, assigns promotions, and starts
-    the store application.
+    errors = 0
+    for line_number, line in enumerate(script, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        command, _, arguments = line.partition(" ")
+        choice = BATCH_COMMANDS.get(command.lower(), command)
+        if choice == MAKE_ORDER:
+            try:
+                total_payment = best_buy.checkout(
+                    parse_order(arguments, best_buy))
+            except ValueError as error:
+                print(f"line {line_number}: {error}\n")
+                errors += 1
+            else:
+                print(f"Order made! Total payment: ${total_payment}\n")
+        elif choice in return_options():
+            if not select_options(choice, best_buy):
+                break
+        else:
+            print(f"line {line_number}: Unknown command: {command}\n")
+            errors += 1
+    return errors
+
+
+def create_store() -> store.Store:
+    """
+    Initializes the default products, assigns promotions and builds the store.
+
+    Returns:
+        store.Store: The store with the default catalog.
     """
     product_list = [
         products.Product("MacBook Air M2", price=1450, quantity=100),
@@ -164,10 +244,34 @@ def main():
     product_list[1].set_promotion(third_one_free)
     product_list[3].set_promotion(thirty_percent)
 
-    best_buy = store.Store(product_list)
+    return store.Store(product_list)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Main function that initializes the store and starts the store application,
+    or runs a batch script against it with --batch FILE ("-" for stdin).
+
+    Parameter:
+        argv (list[str], optional): The command line arguments.
+
+    Returns:
+        int: The exit status, 1 if a batch command failed.
+    """
+    parser = argparse.ArgumentParser(description="Best Buy store")
+    parser.add_argument("--batch", metavar="FILE",
+                        help='run the menu commands of FILE ("-" for stdin)')
+    args = parser.parse_args(argv)
 
-    start(best_buy)
+    best_buy = create_store()
+    if args.batch is None:
+        start(best_buy)
+        return 0
+    if args.batch == "-":
+        return 1 if run_batch(best_buy, sys.stdin) else 0
+    with open(args.batch, encoding="utf-8") as script:
+        return 1 if run_batch(best_buy, script) else 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Opt-in instrumentation of the order hot path.
+
+enable() swaps Store.checkout, Store.checkout_cart, Store.order,
+Store.validate_order, Product.buy, the pricing.price_line functions and
+every apply_promotion implementation for wrappers that record call counts,
+latencies and errors by type in a MetricsRegistry; disable() puts the
+original methods back. While disabled nothing is wrapped, so the hot path
+runs exactly as without this module.
+
+Usage:
+    import metrics
+    registry = metrics.enable()
+    ...
+    print(registry.to_prometheus())
+    metrics.disable()
+"""
+import functools
+import json
+import threading
+import time
+
+from latency import LatencyHistogram
+import pricing
+from products import Product
+from promotions import Promotion
+from store import Store
+
+PREFIX = "bestbuy"
+# Upper bounds in seconds of the buckets exported to Prometheus
+PROMETHEUS_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+
+class CallMetric:
+    """
+    Calls, latencies and errors of one instrumented method.
+
+    Attributes:
+        __histogram (LatencyHistogram): The call latencies.
+        __errors (dict[str, int]): Raised exceptions per exception class name.
+        __lock (threading.Lock): Guards the counters against concurrent calls.
+    """
+
+    def __init__(self):
+        """Initializes an empty metric."""
+        self.__histogram = LatencyHistogram()
+        self.__errors: dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def record(self, seconds: float, error: str | None = None):
+        """
+        Records one call.
+
+        Parameters:
+            seconds (float): The call latency.
+            error (str | None): The name of the raised exception, if any.
+        """
+        with self.__lock:
+            self.__histogram.record(seconds)
+            if error is not None:
+                self.__errors[error] = self.__errors.get(error, 0) + 1
+
+    def get_count(self) -> int:
+        """
+        Retrieves the number of calls.
+
+        Returns:
+            int: The call count, including failed calls.
+        """
+        return self.__histogram.get_count()
+
+    def get_errors(self) -> dict[str, int]:
+        """
+        Retrieves the error counts.
+
+        Returns:
+            dict[str, int]: Raised exceptions per exception class name.
+        """
+        return dict(self.__errors)
+
+    def get_histogram(self) -> LatencyHistogram:
+        """
+        Retrieves the latency histogram.
+
+        Returns:
+            LatencyHistogram: The call latencies.
+        """
+        return self.__histogram
+
+
+class MetricsRegistry:
+    """
+    In-process collection of call metrics, keyed by metric name and class.
+
+    Attributes:
+        __metrics (dict[tuple[str, str], CallMetric]): Metrics by
+                                                       (name, class name).
+        __lock (threading.Lock): Guards the creation of metrics.
+    """
+
+    def __init__(self):
+        """Initializes an empty registry."""
+        self.__metrics: dict[tuple[str, str], CallMetric] = {}
+        self.__lock = threading.Lock()
+
+    def get_metric(self, name: str, class_name: str) -> CallMetric:
+        """
+        Retrieves a metric, creating it on first use.
+
+        Parameters:
+            name (str): The metric name, e.g. "store_order".
+            class_name (str): The class whose method is measured.
+
+        Returns:
+            CallMetric: The metric.
+        """
+        with self.__lock:
+            return self.__metrics.setdefault((name, class_name), CallMetric())
+
+    def get_metrics(self) -> dict[tuple[str, str], CallMetric]:
+        """
+        Retrieves all metrics.
+
+        Returns:
+            dict[tuple[str, str], CallMetric]: Metrics by (name, class name).
+        """
+        with self.__lock:
+            return dict(self.__metrics)
+
+    def to_dict(self) -> dict:
+        """
+        Summarizes the metrics.
+
+        Returns:
+            dict: Per metric name and class, the call count, errors, total
+                  seconds and p50/p95/p99/maximum latency in seconds.
+        """
+        summary: dict = {}
+        for (name, class_name), metric in sorted(self.get_metrics().items()):
+            histogram = metric.get_histogram()
+            summary.setdefault(name, {})[class_name] = {
+                "count": metric.get_count(),
+                "errors": metric.get_errors(),
+                "total_seconds": histogram.get_total(),
+                "p50": histogram.percentile(50),
+                "p95": histogram.percentile(95),
+                "p99": histogram.percentile(99),
+                "max": histogram.get_maximum(),
+            }
+        return summary
+
+    def to_json(self) -> str:
+        """
+        Dumps the metrics as JSON.
+
+        Returns:
+            str: The JSON encoded summary of to_dict().
+        """
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Dumps the metrics in the Prometheus text exposition format, as a
+        histogram and an error counter per metric name, labelled by class.
+
+        Returns:
+            str: The exposition text.
+        """
+        by_name: dict[str, list[tuple[str, CallMetric]]] = {}
+        for (name, class_name), metric in sorted(self.get_metrics().items()):
+            by_name.setdefault(name, []).append((class_name, metric))
+
+        lines = []
+        for name, metrics in by_name.items():
+            seconds = f"{PREFIX}_{name}_seconds"
+            lines.append(f"# TYPE {seconds} histogram")
+            for class_name, metric in metrics:
+                histogram = metric.get_histogram()
+                label = f'class="{class_name}"'
+                buckets = histogram.get_buckets()
+                for upper_bound in PROMETHEUS_BUCKETS:
+                    count = sum(count for bound, count in buckets
+                                if bound <= upper_bound)
+                    lines.append(f'{seconds}_bucket{{{label},'
+                                 f'le="{upper_bound:g}"}} {count}')
+                lines.append(f'{seconds}_bucket{{{label},le="+Inf"}} '
+                             f'{histogram.get_count()}')
+                lines.append(f"{seconds}_sum{{{label}}} "
+                             f"{histogram.get_total()}")
+                lines.append(f"{seconds}_count{{{label}}} "
+                             f"{histogram.get_count()}")
+
+            errors = f"{PREFIX}_{name}_errors_total"
+            lines.append(f"# TYPE {errors} counter")
+            for class_name, metric in metrics:
+                for error, count in sorted(metric.get_errors().items()):
+                    lines.append(f'{errors}{{class="{class_name}",'
+                                 f'error="{error}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _subclasses(cls: type) -> list[type]:
+    """
+    Lists a class and all its subclasses.
+
+    Parameter:
+        cls (type): The root class.
+
+    Returns:
+        list[type]: The class followed by its subclasses, recursively.
+    """
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_subclasses(subclass))
+    return classes
+
+
+def _instrumented(method, metric: CallMetric):
+    """
+    Wraps a method so every call is recorded in a metric.
+
+    Parameters:
+        method: The original function.
+        metric (CallMetric): The metric to record into.
+
+    Returns:
+        The wrapping function.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception as error:
+            metric.record(time.perf_counter() - start, type(error).__name__)
+            raise
+        metric.record(time.perf_counter() - start)
+        return result
+    return wrapper
+
+
+# The instrumented methods: (root class or module, function name, metric
+# name). Orders placed through the CLI, the order service and the replay
+# engine go through Store.checkout and pricing.price_line
+HOT_PATH = ((Store, "checkout", "store_checkout"),
+            (Store, "checkout_cart", "store_checkout_cart"),
+            (Store, "order", "store_order"),
+            (Store, "validate_order", "store_validate_order"),
+            (Product, "buy", "product_buy"),
+            (pricing, "price_line", "pricing_price_line"),
+            (pricing, "price_line_cents", "pricing_price_line_cents"),
+            (Promotion, "apply_promotion", "promotion_apply_promotion"))
+
+_registry: MetricsRegistry | None = None
+_originals: list[tuple[type, str, object]] = []
+
+
+def enable(registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """
+    Swaps in the instrumented hot path methods. Every class defining one of
+    the methods, subclasses included, gets its own wrapper and metric;
+    module functions are labelled with the module name.
+
+    Parameter:
+        registry (MetricsRegistry, optional): Where to record, defaults to a
+                                              new registry.
+
+    Returns:
+        MetricsRegistry: The registry receiving the measurements.
+
+    Raises:
+        ValueError: If instrumentation is already enabled.
+    """
+    global _registry
+    if _registry is not None:
+        raise ValueError("Instrumentation is already enabled")
+    _registry = registry if registry is not None else MetricsRegistry()
+    for root, method_name, metric_name in HOT_PATH:
+        owners = _subclasses(root) if isinstance(root, type) else [root]
+        for cls in owners:
+            original = cls.__dict__.get(method_name)
+            if original is not None and not getattr(
+                    original, "__isabstractmethod__", False):
+                metric = _registry.get_metric(metric_name, cls.__name__)
+                setattr(cls, method_name, _instrumented(original, metric))
+                _originals.append((cls, method_name, original))
+    return _registry
+
+
+def disable() -> None:
+    """Restores the original hot path methods."""
+    global _registry
+    while _originals:
+        cls, method_name, original = _originals.pop()
+        setattr(cls, method_name, original)
+    _registry = None
+
+
+def get_registry() -> MetricsRegistry | None:
+    """
+    Retrieves the registry of the enabled instrumentation.
+
+    Returns:
+        MetricsRegistry | None: The registry, None while disabled.
+    """
+    return _registry
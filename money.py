@@ -0,0 +1,65 @@
+"""
+Integer-cents money helpers for exact order totals.
+
+Prices are converted to whole cents once, through their decimal
+representation, and every following sum and promotion runs in int
+arithmetic, so totals are exact no matter how many lines an order has.
+Fractions of a cent produced by promotions are rounded half up.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+
+CENTS_PER_UNIT = 100
+
+
+def to_cents(amount: float | int) -> int:
+    """
+    Converts an amount to whole cents, rounding half up.
+
+    The float is converted through its shortest decimal representation, so
+    1.005 becomes 101 cents, not the 100 that round(1.005 * 100) yields.
+
+    Parameter:
+        amount (float | int): The amount in currency units.
+
+    Returns:
+        int: The amount in cents.
+
+    Raises:
+        ValueError: If amount is not a finite number.
+    """
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    try:
+        return int((Decimal(repr(amount)) * CENTS_PER_UNIT)
+                   .quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except ArithmeticError:
+        raise ValueError("Amount must be a finite number") from None
+
+
+def divide_half_up(numerator: int, denominator: int) -> int:
+    """
+    Divides two non-negative ints, rounding half up.
+
+    Parameters:
+        numerator (int): The dividend.
+        denominator (int): The divisor.
+
+    Returns:
+        int: The rounded quotient.
+    """
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+def format_cents(cents: int) -> str:
+    """
+    Formats cents as an amount with two decimals.
+
+    Parameter:
+        cents (int): The amount in cents.
+
+    Returns:
+        str: The amount, e.g. "1450.05".
+    """
+    sign = "-" if cents < 0 else ""
+    units, rest = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"{sign}{units}.{rest:02d}"
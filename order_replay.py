@@ -0,0 +1,311 @@
+"""
+Streams recorded orders from a log file through a store for load testing.
+
+The log holds one order per line as JSON, either a list of
+[product name, quantity] pairs or an object with such a list under "items".
+Orders are read lazily, so the log is never loaded into memory.
+
+Usage:
+    python order_replay.py orders.jsonl [--snapshot catalog.snap]
+                           [--mode checkout|validate] [--threads 4]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+import time
+
+from latency import LatencyHistogram
+from store import QuantityExceededError, MaximumExceededError
+
+REASON_QUANTITY = "quantity_exceeded"
+REASON_MAXIMUM = "maximum_exceeded"
+REASON_UNKNOWN_PRODUCT = "unknown_product"
+REASON_INVALID = "invalid"
+REASON_ERROR = "error"
+
+# Unexpected exceptions kept in a report, the rest are only counted
+MAX_ERRORS = 10
+
+
+class ReplayReport:
+    """
+    Throughput, latency and rejections of a replay.
+
+    Attributes:
+        __histogram (LatencyHistogram): Latency of every processed order.
+        __accepted (int): The number of accepted orders.
+        __rejected (dict[str, int]): Rejected order count per reason.
+        __seconds (float): The duration of the replay.
+        __errors (list[str]): The first MAX_ERRORS unexpected exceptions.
+        __lock (threading.Lock): Guards the counters for threaded replays.
+    """
+
+    def __init__(self):
+        """Initializes an empty report."""
+        self.__histogram = LatencyHistogram()
+        self.__accepted: int = 0
+        self.__rejected: dict[str, int] = {}
+        self.__seconds: float = 0.0
+        self.__errors: list[str] = []
+        self.__lock = threading.Lock()
+
+    def record(self, seconds: float, reason: str | None):
+        """
+        Records one processed order.
+
+        Parameters:
+            seconds (float): The order latency.
+            reason (str | None): The rejection reason, None if accepted.
+        """
+        with self.__lock:
+            self.__histogram.record(seconds)
+            if reason is None:
+                self.__accepted += 1
+            else:
+                self.__rejected[reason] = self.__rejected.get(reason, 0) + 1
+
+    def record_error(self, seconds: float, error: Exception):
+        """
+        Records an order that failed with an unexpected exception.
+
+        Parameters:
+            seconds (float): The order latency.
+            error (Exception): The exception.
+        """
+        self.record(seconds, REASON_ERROR)
+        with self.__lock:
+            if len(self.__errors) < MAX_ERRORS:
+                self.__errors.append(f"{type(error).__name__}: {error}")
+
+    def get_errors(self) -> list[str]:
+        """
+        Retrieves the first unexpected exceptions.
+
+        Returns:
+            list[str]: Up to MAX_ERRORS exceptions as "Type: message".
+        """
+        return list(self.__errors)
+
+    def set_seconds(self, seconds: float):
+        """Sets the duration of the replay."""
+        self.__seconds = seconds
+
+    def get_order_count(self) -> int:
+        """
+        Retrieves the number of processed orders.
+
+        Returns:
+            int: Accepted and rejected orders.
+        """
+        return self.__histogram.get_count()
+
+    def get_accepted(self) -> int:
+        """
+        Retrieves the number of accepted orders.
+
+        Returns:
+            int: The accepted order count.
+        """
+        return self.__accepted
+
+    def get_rejected(self) -> dict[str, int]:
+        """
+        Retrieves the rejected order counts.
+
+        Returns:
+            dict[str, int]: The count per rejection reason.
+        """
+        return dict(self.__rejected)
+
+    def get_throughput(self) -> float:
+        """
+        Retrieves the replay throughput.
+
+        Returns:
+            float: Orders per second.
+        """
+        return self.get_order_count() / self.__seconds if self.__seconds \
+            else 0.0
+
+    def get_latency_percentile(self, percent: float) -> float:
+        """
+        Estimates an order latency percentile.
+
+        Parameter:
+            percent (float): The percentile, e.g. 99 for p99.
+
+        Returns:
+            float: The latency in seconds.
+        """
+        return self.__histogram.percentile(percent)
+
+    def summary(self) -> str:
+        """
+        Formats the report for printing.
+
+        Returns:
+            str: A multi-line summary.
+        """
+        latencies = "  ".join(
+            f"p{percent}={self.get_latency_percentile(percent) * 1e6:.1f}us"
+            for percent in (50, 95, 99))
+        rejected = ", ".join(f"{reason}: {count}" for reason, count
+                             in sorted(self.__rejected.items())) or "none"
+        errors = "".join(f"\nerror: {error}" for error in self.__errors)
+        return (f"{self.get_order_count()} orders, {self.__accepted} accepted,"
+                f" {self.get_throughput():.0f} orders/s\n"
+                f"latency: {latencies}\n"
+                f"rejected: {rejected}{errors}")
+
+
+def read_orders(path: str):
+    """
+    Streams the orders of a log file.
+
+    Parameter:
+        path (str): The order log.
+
+    Yields:
+        list[tuple[str, int]] | None: The (product name, quantity) lines of
+                                      an order, None for a malformed line or
+                                      a quantity that is not an int.
+    """
+    with open(path, encoding="utf-8") as log:
+        for line in log:
+            if not line.strip():
+                continue
+            try:
+                order = json.loads(line)
+                if isinstance(order, dict):
+                    order = order["items"]
+                lines = [(name, quantity) for name, quantity in order]
+            except (ValueError, KeyError, TypeError):
+                yield None
+                continue
+            yield lines if all(map(is_valid_line, lines)) else None
+
+
+def is_valid_line(line: tuple) -> bool:
+    """
+    Checks the types of an order line, JSON logs may hold any value.
+
+    Parameter:
+        line (tuple): A (product name, quantity) line.
+
+    Returns:
+        bool: True if the name is a string and the quantity an int.
+    """
+    name, quantity = line
+    return (isinstance(name, str) and isinstance(quantity, int)
+            and not isinstance(quantity, bool))
+
+
+def replay_order(best_buy, lines: list[tuple[str, int]] | None,
+                 mode: str) -> str | None:
+    """
+    Runs one order through the store.
+
+    Parameters:
+        best_buy: The store, Store or another store with the same API.
+        lines (list[tuple[str, int]] | None): The order lines by name.
+        mode (str): "checkout" for the single-pass checkout, "validate" for
+                    validate_order followed by order.
+
+    Returns:
+        str | None: The rejection reason, None if the order was accepted.
+    """
+    if lines is None or not all(map(is_valid_line, lines)):
+        return REASON_INVALID
+    shopping_list = []
+    for name, quantity in lines:
+        product = best_buy.get_product(name)
+        if product is None:
+            return REASON_UNKNOWN_PRODUCT
+        shopping_list.append((product, quantity))
+    try:
+        if mode == "validate":
+            best_buy.validate_order(shopping_list)
+            best_buy.order(shopping_list)
+        else:
+            best_buy.checkout(shopping_list)
+    except QuantityExceededError:
+        return REASON_QUANTITY
+    except MaximumExceededError:
+        return REASON_MAXIMUM
+    except ValueError:
+        return REASON_INVALID
+    return None
+
+
+def replay_orders(best_buy, path: str, mode: str = "checkout",
+                  threads: int = 1) -> ReplayReport:
+    """
+    Replays an order log against a store.
+
+    Parameters:
+        best_buy: The store to run the orders against.
+        path (str): The order log.
+        mode (str): "checkout" or "validate", see replay_order.
+        threads (int): Worker threads. With more than one, orders run
+                       concurrently and at most 4 per thread are in flight,
+                       which keeps memory bounded.
+
+    Returns:
+        ReplayReport: Throughput, latency percentiles and rejections. An
+                      order that fails with an unexpected exception is
+                      counted as "error" and the replay goes on.
+    """
+    report = ReplayReport()
+
+    def run(lines):
+        start = time.perf_counter()
+        try:
+            reason = replay_order(best_buy, lines, mode)
+        except Exception as error:
+            report.record_error(time.perf_counter() - start, error)
+        else:
+            report.record(time.perf_counter() - start, reason)
+
+    start = time.perf_counter()
+    if threads <= 1:
+        for lines in read_orders(path):
+            run(lines)
+    else:
+        in_flight = threading.BoundedSemaphore(threads * 4)
+
+        def run_and_release(lines):
+            try:
+                run(lines)
+            finally:
+                in_flight.release()
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for lines in read_orders(path):
+                in_flight.acquire()
+                executor.submit(run_and_release, lines)
+    report.set_seconds(time.perf_counter() - start)
+    return report
+
+
+def main():
+    """Replays an order log against a snapshot or the default store."""
+    from main import create_store
+    from store import Store
+
+    parser = argparse.ArgumentParser(description="Replay an order log")
+    parser.add_argument("path")
+    parser.add_argument("--snapshot")
+    parser.add_argument("--mode", choices=("checkout", "validate"),
+                        default="checkout")
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    best_buy = (Store.load_snapshot(args.snapshot) if args.snapshot
+                else create_store())
+    print(replay_orders(best_buy, args.path, args.mode,
+                        args.threads).summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""
+asyncio front-end that serves the store to many clients at once.
+
+The service speaks a line protocol: every request and response is one JSON
+object per line.
+
+    {"op": "list"}
+    {"op": "total"}
+    {"op": "order", "items": [["MacBook Air M2", 2], ["Shipping", 1]]}
+
+Responses carry `ok`, either `result` or `error`, and the server side
+`latency_ms` of the request.
+
+Usage:
+    python order_service.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from latency import LatencyHistogram
+from store import Store
+
+# The operations the service answers
+OPERATIONS = ("list", "total", "order")
+
+
+class OrderService:
+    """
+    Serves list, total and order requests for a Store over TCP.
+
+    Store operations run in worker threads (Store.checkout is thread-safe),
+    so a slow order never blocks the event loop.
+
+    Attributes:
+        __store (Store): The store the requests are run against.
+        __host (str): The interface to listen on.
+        __port (int): The port to listen on, 0 picks a free port.
+        __server (asyncio.Server | None): The running server.
+        __latencies (dict[str, LatencyHistogram]): Latencies per operation.
+    """
+
+    def __init__(self, store: Store, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initializes the service.
+
+        Parameters:
+            store (Store): The store the requests are run against.
+            host (str): The interface to listen on.
+            port (int): The port to listen on, 0 picks a free port.
+        """
+        self.__store = store
+        self.__host = host
+        self.__port = port
+        self.__server: asyncio.Server | None = None
+        self.__latencies: dict[str, LatencyHistogram] = {}
+
+    async def start(self) -> int:
+        """
+        Starts listening for clients.
+
+        Returns:
+            int: The port the service listens on.
+        """
+        self.__server = await asyncio.start_server(self.__handle_client,
+                                                   self.__host, self.__port)
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Starts the service if needed and serves until cancelled."""
+        if self.__server is None:
+            await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self):
+        """Stops accepting clients and waits for the server to close."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    def get_latency_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Summarizes the request latencies per operation.
+
+        Returns:
+            dict[str, dict[str, float]]: count, mean_ms, p99_ms and max_ms
+                                         per operation.
+        """
+        return {op: {"count": histogram.get_count(),
+                     "mean_ms": histogram.get_total() / histogram.get_count()
+                     * 1000,
+                     "p99_ms": histogram.percentile(99) * 1000,
+                     "max_ms": histogram.get_maximum() * 1000}
+                for op, histogram in self.__latencies.items()}
+
+    async def __handle_client(self, reader: asyncio.StreamReader,
+                              writer: asyncio.StreamWriter):
+        """
+        Answers the requests of one client until it disconnects.
+
+        Parameters:
+            reader (asyncio.StreamReader): The client's request stream.
+            writer (asyncio.StreamWriter): The client's response stream.
+        """
+        try:
+            while line := await reader.readline():
+                response = await self.handle_request(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: bytes) -> dict:
+        """
+        Runs one request and measures its latency.
+
+        Parameter:
+            line (bytes): The JSON encoded request.
+
+        Returns:
+            dict: The response, see the module documentation.
+        """
+        start = time.perf_counter()
+        op = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            op = request.get("op")
+            if op == "list":
+                result = await asyncio.to_thread(self.__list_products)
+            elif op == "total":
+                result = self.__store.get_total_quantity()
+            elif op == "order":
+                shopping_list = self.__shopping_list(request.get("items", []))
+                result = await asyncio.to_thread(self.__store.order,
+                                                 shopping_list)
+            else:
+                raise ValueError(f"Unknown operation: {op}")
+            response = {"ok": True, "result": result}
+        except (ValueError, TypeError) as error:
+            response = {"ok": False, "error": str(error).strip()}
+
+        latency = time.perf_counter() - start
+        # Unknown operations share one histogram, so clients cannot grow
+        # the statistics without bound
+        key = op if op in OPERATIONS else "invalid"
+        histogram = self.__latencies.get(key)
+        if histogram is None:
+            histogram = self.__latencies.setdefault(key, LatencyHistogram())
+        histogram.record(latency)
+        response["latency_ms"] = latency * 1000
+        return response
+
+    def __list_products(self) -> list[dict]:
+        """
+        Describes every active product.
+
+        Returns:
+            list[dict]: name, price, quantity and promotion per product.
+        """
+        return [{"name": product.get_name(),
+                 "price": product.get_price(),
+                 "quantity": product.get_quantity(),
+                 "promotion": (product.get_promotion().get_name()
+                               if product.get_promotion() else None)}
+                for product in self.__store.get_all_products()]
+
+    def __shopping_list(self, items: list) -> list[tuple]:
+        """
+        Resolves the (name, quantity) pairs of a request to products.
+
+        Parameter:
+            items (list): The requested [name, quantity] pairs.
+
+        Returns:
+            list[tuple[Product, int]]: The shopping list for Store.order.
+
+        Raises:
+            ValueError: If a product is unknown or inactive.
+        """
+        shopping_list = []
+        for name, quantity in items:
+            product = self.__store.get_product(name)
+            if product is None or not product.is_active():
+                raise ValueError(f"Unknown product: {name}")
+            shopping_list.append((product, quantity))
+        return shopping_list
+
+
+def main():
+    """Serves the default store until interrupted."""
+    from main import create_store
+
+    parser = argparse.ArgumentParser(description="BestBuy order service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    service = OrderService(create_store(), args.host, args.port)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print(service.get_latency_stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, pricing falls back to scalar math
+    np = None
+
+from pricing_cache import PRICING_CACHE
+from products import Product
+
+
+def price_line(product: Product, quantity: int) -> float:
+    """
+    Prices a single order line exactly like Product.buy, without touching
+    the stock.
+
+    Parameters:
+        product (Product): The product of the line.
+        quantity (int): The ordered quantity.
+
+    Returns:
+        float: The total price of the line after promotions.
+    """
+    promotion = product.get_current_promotion()
+    if promotion:
+        return PRICING_CACHE.apply(promotion, product, quantity)
+    return quantity * product.get_price()
+
+
+def price_line_cents(product: Product, quantity: int) -> int:
+    """
+    Prices a single order line in whole cents with int arithmetic only.
+
+    Parameters:
+        product (Product): The product of the line.
+        quantity (int): The ordered quantity.
+
+    Returns:
+        int: The total price of the line after promotions, in cents.
+    """
+    promotion = product.get_current_promotion()
+    if promotion:
+        return promotion.apply_promotion_cents(product.get_price_cents(),
+                                               quantity)
+    return quantity * product.get_price_cents()
+
+
+def price_orders(orders: list[list[tuple[Product, int]]]) -> list[float]:
+    """
+    Prices many shopping lists at once without changing any stock.
+
+    The lines of all orders are flattened and grouped by promotion, each
+    group is priced with one call to Promotion.apply_promotion_batch and the
+    line totals are summed back per order in their original sequence. The
+    operations and the summation order match Store.order, so the totals are
+    identical to the scalar path.
+
+    Parameter:
+        orders (list[list[tuple[Product, int]]]):
+                            Shopping lists of (product, quantity) tuples.
+
+    Returns:
+        list[float]: The total cost of each order.
+    """
+    if np is None:
+        return [_price_order_scalar(shopping_list) for shopping_list in orders]
+
+    line_products: list[Product] = []
+    order_indexes: list[int] = []
+    quantities: list[int] = []
+    for order_index, shopping_list in enumerate(orders):
+        for product, quantity in shopping_list:
+            line_products.append(product)
+            order_indexes.append(order_index)
+            quantities.append(quantity)
+
+    line_count = len(line_products)
+    prices = np.fromiter((product.get_price() for product in line_products),
+                         dtype=np.float64, count=line_count)
+    quantity_array = np.array(quantities, dtype=np.int64)
+    line_totals = np.empty(line_count, dtype=np.float64)
+
+    groups: dict = {}
+    for line, product in enumerate(line_products):
+        groups.setdefault(product.get_current_promotion(), []).append(line)
+
+    for promotion, lines in groups.items():
+        lines = np.array(lines, dtype=np.int64)
+        if promotion:
+            group_products = [line_products[line] for line in lines]
+            line_totals[lines] = promotion.apply_promotion_batch(
+                group_products, prices[lines], quantity_array[lines])
+        else:
+            line_totals[lines] = quantity_array[lines] * prices[lines]
+
+    # np.add.at accumulates unbuffered, in line order, starting from 0.0,
+    # which reproduces the `total_cost += ...` loop of Store.order
+    totals = np.zeros(len(orders), dtype=np.float64)
+    np.add.at(totals, np.array(order_indexes, dtype=np.int64), line_totals)
+    return totals.tolist()
+
+
+def _price_order_scalar(shopping_list: list[tuple[Product, int]]) -> float:
+    """
+    Prices one shopping list line by line.
+
+    Parameter:
+        shopping_list (list[tuple[Product, int]]): The order lines.
+
+    Returns:
+        float: The total cost of the order.
+    """
+    total_cost: float = 0.0
+    for product, quantity in shopping_list:
+        total_cost += price_line(product, quantity)
+    return total_cost
@@ -0,0 +1,132 @@
+import functools
+
+
+class _PricedAt:
+    """
+    Stand-in product passed to apply_promotion on a cache miss, so cached
+    results depend on nothing but the key. Promotions price a line from
+    product.get_price() and the quantity only.
+    """
+
+    __slots__ = ("__price",)
+
+    def __init__(self, price: float):
+        self.__price = price
+
+    def get_price(self) -> float:
+        return self.__price
+
+
+class PricingCache:
+    """
+    Bounded LRU cache of promoted line prices, keyed on the promotion object,
+    the product price and the quantity.
+
+    Changing a product's price or promotion changes the key, so stale
+    entries are never hit and age out of the LRU. Promotion.set_percent
+    clears the cache because the percent is not part of the key.
+
+    The cache is disabled (maxsize 0) by default: for the built-in
+    promotions a lookup costs more than the few float operations it saves.
+    Enable it with set_maxsize() for promotions that are expensive to apply.
+
+    Attributes:
+        __maxsize (int): The maximum number of cached prices, 0 if disabled.
+        __lookup: The functools.lru_cache wrapped price function, or None.
+        __hits (int): Hits before the last clear.
+        __misses (int): Misses before the last clear.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        Initializes an empty cache.
+
+        Parameter:
+            maxsize (int, optional): The maximum number of cached prices,
+                                     0 disables the cache. Defaults to 0.
+        """
+        self.__lookup = None
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.set_maxsize(maxsize)
+
+    def get_maxsize(self) -> int:
+        """
+        Retrieves the cache size.
+
+        Returns:
+            int: The maximum number of cached prices, 0 if disabled.
+        """
+        return self.__maxsize
+
+    def set_maxsize(self, maxsize: int):
+        """
+        Resizes the cache, dropping all cached prices and statistics.
+
+        Parameter:
+            maxsize (int): The maximum number of cached prices, 0 disables
+                           the cache.
+
+        Raises:
+            ValueError: If maxsize is not a non-negative int.
+        """
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError("Maxsize must be a non-negative int")
+        if self.__lookup is not None:
+            self.__lookup.cache_clear()
+        self.__hits = self.__misses = 0
+        self.__maxsize = maxsize
+        self.__lookup = (functools.lru_cache(maxsize)(self.__compute)
+                         if maxsize else None)
+
+    @staticmethod
+    def __compute(promotion, price: float, quantity: int) -> float:
+        """Applies a promotion on a cache miss."""
+        return promotion.apply_promotion(_PricedAt(price), quantity)
+
+    def apply(self, promotion, product, quantity: int) -> float:
+        """
+        Prices an order line through the cache.
+
+        Parameters:
+            promotion (Promotion): The promotion of the product.
+            product (Product): The product of the line.
+            quantity (int): The ordered quantity.
+
+        Returns:
+            float: The total price after applying the promotion.
+        """
+        if self.__lookup is None:
+            return promotion.apply_promotion(product, quantity)
+        return self.__lookup(promotion, product.get_price(), quantity)
+
+    def clear(self):
+        """Drops all cached prices, keeping the hit statistics."""
+        if self.__lookup is not None:
+            info = self.__lookup.cache_info()
+            self.__hits += info.hits
+            self.__misses += info.misses
+            self.__lookup.cache_clear()
+
+    def get_stats(self) -> dict[str, float]:
+        """
+        Retrieves the cache statistics.
+
+        Returns:
+            dict[str, float]: hits, misses, hit_rate (0.0 without lookups),
+                              size and maxsize.
+        """
+        hits, misses, size = self.__hits, self.__misses, 0
+        if self.__lookup is not None:
+            info = self.__lookup.cache_info()
+            hits += info.hits
+            misses += info.misses
+            size = info.currsize
+        lookups = hits + misses
+        return {"hits": hits, "misses": misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "size": size, "maxsize": self.__maxsize}
+
+
+# The cache used by Product.buy and pricing.price_line
+PRICING_CACHE = PricingCache()
@@ -1,3 +1,8 @@
+import weakref
+
+from money import to_cents
+from pricing_cache import PRICING_CACHE
+from promotion_registry import PROMOTION_REGISTRY
 from promotions import Promotion
 
 
@@ -8,11 +13,22 @@ class Product:
     Attributes:
         __name (str): The name of the product.
         __price (float): The price of the product.
+        __price_cents (int | None): The price in whole cents, converted on
+                                    first use.
         __quantity (int): The quantity available in stock.
         __is_active (bool): Status indicating if the product is active.
         __promotion (Promotion): An optional promotion associated with the product.
+        __category (str | None): An optional category, used to look up
+                                 category promotions in the registry.
+        __observers (tuple): Weak references to the objects (e.g. stores)
+                             notified when the product's state changes, so
+                             a discarded store is not kept alive by its
+                             products.
     """
 
+    __slots__ = ("__promotion", "__name", "__price", "__quantity",
+                 "__is_active", "__observers", "__category", "__price_cents")
+
     def __init__(self, name: str, price: float, quantity: int):
         """
         Initializes a Product with a name, price, and quantity.
@@ -25,8 +41,79 @@ class Product:
         self.__promotion: Promotion | None = None
         self.__name: str = name  # Private attribute, encapsulation
         self.__price: float = price
+        self.__price_cents: int | None = None
         self.__quantity: int = quantity
         self.__is_active: bool = True
+        self.__observers: tuple = ()
+        self.__category: str | None = None
+
+    def add_observer(self, observer):
+        """
+        Registers an observer that is notified about state changes.
+
+        The observer must provide an
+        `on_product_changed(product, attribute, old_value, new_value)` method
+        and an `on_product_renaming(product, new_name)` method, which may
+        reject a new name by raising ValueError before it is set.
+
+        The product only keeps a weak reference, the observer stops being
+        notified once it is garbage collected.
+
+        Parameter:
+            observer: The object to notify.
+        """
+        observers = self.__live_observers()
+        if all(registered is not observer for registered in observers):
+            observers.append(observer)
+        self.__observers = tuple(weakref.ref(registered)
+                                 for registered in observers)
+
+    def remove_observer(self, observer):
+        """
+        Unregisters a previously added observer.
+
+        Parameter:
+            observer: The object to stop notifying.
+        """
+        self.__observers = tuple(weakref.ref(registered)
+                                 for registered in self.__live_observers()
+                                 if registered is not observer)
+
+    def __live_observers(self) -> list:
+        """
+        Resolves the weak references to the observers.
+
+        Returns:
+            list: The observers that are still alive.
+        """
+        observers = [reference() for reference in self.__observers]
+        return [observer for observer in observers if observer is not None]
+
+    def __getstate__(self):
+        """
+        Drops the observers when pickling, they belong to this process.
+
+        Returns:
+            tuple: The instance dict (if any) and the slot values, without
+                   observers.
+        """
+        state, slots = super().__getstate__()
+        return state, dict(slots, _Product__observers=())
+
+    def _notify(self, attribute: str, old_value, new_value):
+        """
+        Informs every observer that an attribute of the product changed.
+
+        Parameters:
+            attribute (str): The name of the changed attribute.
+            old_value: The value before the change.
+            new_value: The value after the change.
+        """
+        for reference in self.__observers:
+            observer = reference()
+            if observer is not None:
+                observer.on_product_changed(self, attribute, old_value,
+                                            new_value)
 
     def get_promotion(self):
         """
@@ -48,10 +135,48 @@ class Product:
             ValueError: If promotion is not a valid Promotion instance.
         """
         if isinstance(promotion, Promotion) and promotion:
-            self.__promotion = promotion
+            old_promotion, self.__promotion = self.__promotion, promotion
+            self._notify("promotion", old_promotion, promotion)
         else:
             raise ValueError("Promotion must be a non-empty")
 
+    def get_current_promotion(self):
+        """
+        Retrieves the promotion that prices the product right now: the
+        product's own promotion if set, else the highest priority promotion
+        of the registry that applies to it.
+
+        Returns:
+            Promotion | None: The promotion, None if none applies.
+        """
+        return self.get_promotion() or PROMOTION_REGISTRY.get_promotion(self)
+
+    def get_category(self):
+        """
+        Retrieves the category of the product.
+
+        Returns:
+            str | None: The category, None if not set.
+        """
+        return self.__category
+
+    def set_category(self, category: str | None):
+        """
+        Sets the category of the product.
+
+        Parameter:
+            category (str | None): The category, None to clear it.
+
+        Raises:
+            ValueError: If category is neither None nor a non-empty string.
+        """
+        if category is None or (isinstance(category, str)
+                                and category.strip()):
+            old_category, self.__category = self.__category, category
+            self._notify("category", old_category, category)
+        else:
+            raise ValueError("Category must be a non-empty string")
+
     def get_name(self):
         """
         Retrieves the name of the product.
@@ -70,10 +195,14 @@ class Product:
             name (str): The new name for the product.
 
         Raises:
-            ValueError: If name is not a non-empty string.
+            ValueError: If name is not a non-empty string or an observer
+            rejects it, e.g. a store that already has a product of that name.
         """
         if isinstance(name, str) and name.strip():
-            self.__name = name
+            for observer in self.__live_observers():
+                observer.on_product_renaming(self, name)
+            old_name, self.__name = self.__name, name
+            self._notify("name", old_name, name)
         else:
             raise ValueError("Name must be a non-empty string")
 
@@ -97,10 +226,40 @@ class Product:
             ValueError: If price is not a float or is negative.
         """
         if isinstance(price, float) and price >= 0.0:
-            self.__price = price
+            old_price, self.__price = self.__price, price
+            self.__price_cents = None
+            self._notify("price", old_price, price)
         else:
             raise ValueError("Price must be a float")
 
+    def get_price_cents(self) -> int:
+        """
+        Retrieves the price of the product in whole cents.
+
+        Returns:
+            int: The price in cents, rounded half up.
+        """
+        price_cents = self.__price_cents
+        if price_cents is None:
+            price_cents = self.__price_cents = to_cents(self.__price)
+        return price_cents
+
+    def set_price_cents(self, price_cents: int):
+        """
+        Sets the price of the product in whole cents.
+
+        Parameter:
+            price_cents (int): The new price in cents.
+
+        Raises:
+            ValueError: If price_cents is not a non-negative int.
+        """
+        if isinstance(price_cents, int) and price_cents >= 0:
+            self.set_price(price_cents / 100)
+            self.__price_cents = price_cents
+        else:
+            raise ValueError("Price cents must be a non-negative int")
+
     def get_quantity(self):
         """
         Retrieves the quantity of the product.
@@ -121,7 +280,8 @@ class Product:
             ValueError: If quantity is not an integer or is negative.
         """
         if isinstance(quantity, int) and quantity >= 0:
-            self.__quantity = quantity
+            old_quantity, self.__quantity = self.__quantity, quantity
+            self._notify("quantity", old_quantity, quantity)
         else:
             raise ValueError("Quantity must be a int")
 
@@ -148,7 +308,9 @@ class Product:
             ValueError: If is_active is not a boolean.
         """
         if isinstance(is_active, bool):
-            self.__is_active = is_active
+            old_is_active, self.__is_active = self.__is_active, is_active
+            if old_is_active != is_active:
+                self._notify("is_active", old_is_active, is_active)
         else:
             raise ValueError("Is_active must be a bool")
 
@@ -178,17 +340,18 @@ class Product:
 
         Returns:
             float: The total price after applying promotions, if any.
+
+        Raises:
+            ValueError: If the quantity is larger than the stock.
         """
-        try:
-            # Buys a given quantity of the product. Skip if NonStockedProduct
-            if not isinstance(self, NonStockedProduct):
-                self.__buy_product(quantity)
-        except ValueError as value_error:
-            print(f"Value Error: {value_error}")
-        else:
-            if self.get_promotion():
-                return self.get_promotion().apply_promotion(self, quantity)
-            return quantity * self.get_price()
+        # Buys a given quantity of the product. Skip if NonStockedProduct
+        if not isinstance(self, NonStockedProduct):
+            self.__buy_product(quantity)
+
+        promotion = self.get_current_promotion()
+        if promotion:
+            return PRICING_CACHE.apply(promotion, self, quantity)
+        return quantity * self.get_price()
 
     def show(self):
         """
@@ -275,7 +438,7 @@ class Product:
         Returns:
             bool: True if this product's price is less, False otherwise.
         """
-        return other.get_price() < self.get_price()
+        return self.get_price() < other.get_price()
 
     def __contains__(self, item):
         """
@@ -307,6 +470,8 @@ class NonStockedProduct(Product):
     A product that is non-stocked and has no quantity limit.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, price: float):
         """
         Initializes a NonStockedProduct with a name and price, setting quantity to 0.
@@ -315,10 +480,7 @@ class NonStockedProduct(Product):
             name (str): The name of the non-stocked product.
             price (float): The price of the non-stocked product.
         """
-        self.__name = name  # Private attribute, encapsulation
-        self.__price = price
-        super().__init__(self.__name, self.__price,
-                         0)
+        super().__init__(name, price, 0)
 
 
 class LimitedProduct(Product):
@@ -329,6 +491,8 @@ class LimitedProduct(Product):
         __maximum (int): The maximum order quantity.
     """
 
+    __slots__ = ("__maximum",)
+
     def __init__(self, name: str, price: float, quantity: int, maximum: int):
         """
         Initializes a LimitedProduct with a maximum order limit.
@@ -339,12 +503,8 @@ class LimitedProduct(Product):
             quantity (int): The available quantity in stock.
             maximum (int): The maximum order quantity allowed.
         """
-        self.__name = name  # Private attribute, encapsulation
-        self.__price = price
-        self.__quantity = quantity
         self.__maximum = maximum
-        super().__init__(self.__name, self.__price,
-                         self.__quantity)
+        super().__init__(name, price, quantity)
 
     def get_maximum(self):
         """
@@ -369,6 +529,3 @@ class LimitedProduct(Product):
             self.__maximum = maximum
         else:
             raise ValueError("Maximum must be a int")
-
-    def __hash__(self):
-        return hash(self.__name)
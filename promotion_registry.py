@@ -0,0 +1,351 @@
+"""
+Indexed registry of SKU, category and time scoped promotions.
+
+Promotions are registered for product names (SKUs), categories or every
+product, each with an optional validity window. Each scope keeps two
+structures over its windows, compiled in O(n log n) on the first lookup
+after a change:
+
+- the sorted window boundaries with the highest priority entry of every
+  segment between two boundaries, so finding the promotion of a product is
+  a dict lookup and a bisect per scope, however many promotions overlap;
+- a centered interval tree, so listing every promotion valid at a point in
+  time costs O(log n + k) for k results.
+"""
+import bisect
+import heapq
+import itertools
+import math
+import threading
+import time
+
+from promotions import Promotion
+
+
+def _rank(entry: tuple) -> tuple[int, int]:
+    """Orders entries by descending priority, then registration."""
+    return -entry[2], entry[3]
+
+
+class _IntervalNode:
+    """
+    A node of a centered interval tree.
+
+    Attributes:
+        center (float): A start of one of the node's entries.
+        by_start (list[tuple]): The entries containing center, by start.
+        by_end (list[tuple]): The same entries, by descending end.
+        left (_IntervalNode | None): Entries ending at or before center.
+        right (_IntervalNode | None): Entries starting after center.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, entries: list[tuple]):
+        """
+        Builds the subtree of the given entries. The center is the median
+        start, so each side gets at most half of the entries.
+
+        Parameter:
+            entries (list[tuple]): (start, end, priority, entry id, promotion)
+                                   entries.
+        """
+        center = sorted(entry[0] for entry in entries)[len(entries) // 2]
+        left, right, here = [], [], []
+        for entry in entries:
+            if entry[1] <= center:
+                left.append(entry)
+            elif entry[0] > center:
+                right.append(entry)
+            else:
+                here.append(entry)
+        self.center = center
+        self.by_start = sorted(here, key=lambda entry: entry[0])
+        self.by_end = sorted(here, key=lambda entry: entry[1], reverse=True)
+        self.left = _IntervalNode(left) if left else None
+        self.right = _IntervalNode(right) if right else None
+
+    def stab(self, moment: float, found: list[tuple]):
+        """
+        Collects the entries whose window contains a point in time.
+
+        Parameters:
+            moment (float): The point in time.
+            found (list[tuple]): Receives the entries.
+        """
+        node = self
+        while node is not None:
+            if moment < node.center:
+                for entry in node.by_start:
+                    if entry[0] > moment:
+                        break
+                    found.append(entry)
+                node = node.left
+            else:
+                for entry in node.by_end:
+                    if entry[1] <= moment:
+                        break
+                    found.append(entry)
+                node = node.right
+
+
+class _IntervalIndex:
+    """
+    The registered promotions of one scope, indexed by validity window.
+
+    Attributes:
+        __entries (dict[int, tuple]): (start, end, priority, entry id,
+                                      promotion) per entry id.
+        __compiled (tuple | None): (boundaries, top entry per segment,
+                                   interval tree), None when it has to be
+                                   rebuilt.
+        __lock (threading.Lock): Guards the entries while compiling.
+    """
+
+    def __init__(self):
+        """Initializes an empty index."""
+        self.__entries: dict[int, tuple] = {}
+        self.__compiled: tuple | None = ([], [], None)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def add(self, entry_id: int, entry: tuple):
+        """Adds an entry and marks the index for rebuilding."""
+        with self.__lock:
+            self.__entries[entry_id] = entry
+            self.__compiled = None
+
+    def remove(self, entry_id: int):
+        """Removes an entry and marks the index for rebuilding."""
+        with self.__lock:
+            del self.__entries[entry_id]
+            self.__compiled = None
+
+    def __compile(self) -> tuple:
+        """
+        Sweeps over the sorted window boundaries with a heap of the started
+        entries, dropping ended ones lazily, and records the top entry of
+        every segment. Then builds the interval tree.
+
+        Returns:
+            tuple: (boundaries, top entry per segment, interval tree).
+        """
+        entries = list(self.__entries.values())
+        starting: dict[float, list[tuple]] = {}
+        ending: dict[float, list[int]] = {}
+        for entry in entries:
+            starting.setdefault(entry[0], []).append(entry)
+            ending.setdefault(entry[1], []).append(entry[3])
+
+        boundaries = sorted(starting.keys() | ending.keys())
+        tops = []
+        heap: list[tuple] = []
+        ended: set[int] = set()
+        for bound in boundaries:
+            ended.update(ending.get(bound, ()))
+            for entry in starting.get(bound, ()):
+                heapq.heappush(heap, (_rank(entry), entry))
+            while heap and heap[0][1][3] in ended:
+                heapq.heappop(heap)
+            tops.append(heap[0][1] if heap else None)
+        return boundaries, tops, _IntervalNode(entries) if entries else None
+
+    def __get_compiled(self) -> tuple:
+        """Retrieves the compiled structures, compiling them if needed."""
+        compiled = self.__compiled
+        if compiled is None:
+            with self.__lock:
+                if self.__compiled is None:
+                    self.__compiled = self.__compile()
+                compiled = self.__compiled
+        return compiled
+
+    def top_at(self, moment: float) -> tuple | None:
+        """
+        Retrieves the highest priority entry valid at a point in time.
+
+        Parameter:
+            moment (float): The point in time as a UNIX timestamp.
+
+        Returns:
+            tuple | None: The entry, None if none is valid.
+        """
+        boundaries, tops, _ = self.__get_compiled()
+        segment = bisect.bisect_right(boundaries, moment) - 1
+        return tops[segment] if segment >= 0 else None
+
+    def active_at(self, moment: float) -> list[tuple]:
+        """
+        Retrieves the entries valid at a point in time.
+
+        Parameter:
+            moment (float): The point in time as a UNIX timestamp.
+
+        Returns:
+            list[tuple]: The active entries, in no particular order.
+        """
+        tree = self.__get_compiled()[2]
+        found: list[tuple] = []
+        if tree is not None:
+            tree.stab(moment, found)
+        return found
+
+
+class PromotionRegistry:
+    """
+    Promotions scoped to SKUs, categories or every product, with optional
+    validity windows, answering which promotions apply to a product now.
+
+    Attributes:
+        __scopes (dict[int, list[tuple[str, str | None]]]): The (kind, key)
+                                                            scopes per entry.
+        __by_sku (dict[str, _IntervalIndex]): Entries per product name.
+        __by_category (dict[str, _IntervalIndex]): Entries per category.
+        __global (_IntervalIndex): Entries for every product.
+        __ids (itertools.count): Entry id generator.
+        __lock (threading.Lock): Serializes changes to the registry.
+    """
+
+    def __init__(self):
+        """Initializes an empty registry."""
+        self.__scopes: dict[int, list[tuple[str, str | None]]] = {}
+        self.__by_sku: dict[str, _IntervalIndex] = {}
+        self.__by_category: dict[str, _IntervalIndex] = {}
+        self.__global = _IntervalIndex()
+        self.__ids = itertools.count()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__scopes)
+
+    def __index(self, kind: str, key: str | None,
+                create: bool = False) -> _IntervalIndex | None:
+        """Retrieves the index of a scope."""
+        if kind == "global":
+            return self.__global
+        indexes = self.__by_sku if kind == "sku" else self.__by_category
+        if create:
+            return indexes.setdefault(key, _IntervalIndex())
+        return indexes.get(key)
+
+    def add(self, promotion: Promotion, skus: list[str] = (),
+            categories: list[str] = (), start: float | None = None,
+            end: float | None = None, priority: int = 0) -> int:
+        """
+        Registers a promotion. Without SKUs and categories it applies to
+        every product.
+
+        Parameters:
+            promotion (Promotion): The promotion.
+            skus (list[str], optional): Product names it applies to.
+            categories (list[str], optional): Categories it applies to.
+            start (float, optional): UNIX timestamp it starts at, None for
+                                     always.
+            end (float, optional): UNIX timestamp it ends at (exclusive),
+                                   None for never.
+            priority (int, optional): Promotions with a higher priority win.
+                                      Defaults to 0.
+
+        Returns:
+            int: The entry id, used to remove the promotion again.
+
+        Raises:
+            ValueError: If the promotion is invalid or the window is empty.
+        """
+        if not isinstance(promotion, Promotion):
+            raise ValueError("Promotion must be a Promotion")
+        if not isinstance(priority, int):
+            raise ValueError("Priority must be a int")
+        start = -math.inf if start is None else start
+        end = math.inf if end is None else end
+        if start >= end:
+            raise ValueError("Start must be before end")
+
+        scopes = list(dict.fromkeys(
+            [("sku", sku) for sku in skus]
+            + [("category", category) for category in categories]
+            or [("global", None)]))
+        with self.__lock:
+            entry_id = next(self.__ids)
+            entry = (start, end, priority, entry_id, promotion)
+            for kind, key in scopes:
+                self.__index(kind, key, create=True).add(entry_id, entry)
+            self.__scopes[entry_id] = scopes
+        return entry_id
+
+    def remove(self, entry_id: int):
+        """
+        Unregisters a promotion.
+
+        Parameter:
+            entry_id (int): The id returned by add().
+
+        Raises:
+            ValueError: If the entry does not exist.
+        """
+        with self.__lock:
+            if entry_id not in self.__scopes:
+                raise ValueError(f"Unknown promotion entry: {entry_id}")
+            for kind, key in self.__scopes.pop(entry_id):
+                index = self.__index(kind, key)
+                index.remove(entry_id)
+                if not len(index) and kind != "global":
+                    indexes = (self.__by_sku if kind == "sku"
+                               else self.__by_category)
+                    del indexes[key]
+
+    def get_promotions(self, product, at: float | None = None) \
+            -> list[Promotion]:
+        """
+        Retrieves the promotions that apply to a product.
+
+        Parameters:
+            product (Product): The product.
+            at (float, optional): UNIX timestamp, defaults to now.
+
+        Returns:
+            list[Promotion]: The promotions, highest priority first.
+        """
+        if not self.__scopes:
+            return []
+        moment = time.time() if at is None else at
+        entries = self.__global.active_at(moment)
+        for index in self.__scoped_indexes(product):
+            entries.extend(index.active_at(moment))
+        entries.sort(key=_rank)
+        return list(dict.fromkeys(entry[4] for entry in entries))
+
+    def get_promotion(self, product, at: float | None = None) \
+            -> Promotion | None:
+        """
+        Retrieves the highest priority promotion that applies to a product.
+
+        Parameters:
+            product (Product): The product.
+            at (float, optional): UNIX timestamp, defaults to now.
+
+        Returns:
+            Promotion | None: The promotion, None if none applies.
+        """
+        if not self.__scopes:
+            return None
+        moment = time.time() if at is None else at
+        best = self.__global.top_at(moment)
+        for index in self.__scoped_indexes(product):
+            top = index.top_at(moment)
+            if top is not None and (best is None or _rank(top) < _rank(best)):
+                best = top
+        return best[4] if best is not None else None
+
+    def __scoped_indexes(self, product) -> list[_IntervalIndex]:
+        """Retrieves the SKU and category indexes of a product, if any."""
+        return [index for index in (
+            self.__by_sku.get(product.get_name()),
+            self.__by_category.get(product.get_category()))
+            if index is not None]
+
+
+# The registry consulted by Product.buy and pricing
+PROMOTION_REGISTRY = PromotionRegistry()
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
 
+from money import divide_half_up, to_cents
+from pricing_cache import PRICING_CACHE
+
 
 class Promotion(ABC):
     """
@@ -12,6 +15,8 @@ class Promotion(ABC):
                          for applicable promotions.
     """
 
+    __slots__ = ("__name", "__percent")
+
     def __init__(self, name: str, percent=0):
         """
         Initializes the Promotion with a name and optional percentage discount.
@@ -58,7 +63,8 @@ class Promotion(ABC):
 
     def set_percent(self, percent: int):
         """
-        Sets the discount percentage for the promotion.
+        Sets the discount percentage for the promotion and drops the cached
+        prices, which do not include the percent in their key.
 
         Parameter:
             percent (int): The discount percentage to set.
@@ -68,6 +74,7 @@ class Promotion(ABC):
         """
         if isinstance(percent, int) and percent >= 0:
             self.__percent = percent
+            PRICING_CACHE.clear()
         else:
             raise ValueError("Percent must be a int")
 
@@ -85,12 +92,59 @@ class Promotion(ABC):
         """
         pass
 
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Calculates the total price in whole cents after the promotion.
+        Subclasses override this with exact int arithmetic; this fallback
+        rounds the float result of apply_promotion.
+
+        Parameters:
+            price_cents (int): The product price in cents.
+            quantity (int): The quantity of the product.
+
+        Returns:
+            int: The total price in cents.
+        """
+        return to_cents(self.apply_promotion(_CentsPrice(price_cents),
+                                             quantity))
+
+    def apply_promotion_batch(self, products: list, prices, quantities):
+        """
+        Calculates the promoted line totals of many order lines at once.
+        Subclasses override this with array arithmetic that performs the
+        same operations as apply_promotion, so results are identical.
+
+        Parameters:
+            products (list): The product of each line.
+            prices (np.ndarray): The price of each line's product.
+            quantities (np.ndarray): The ordered quantity of each line.
+
+        Returns:
+            list[float] | np.ndarray: The total price of each line.
+        """
+        return [self.apply_promotion(product, int(quantity))
+                for product, quantity in zip(products, quantities)]
+
+
+class _CentsPrice:
+    """Stand-in product priced in cents, for Promotion.apply_promotion_cents."""
+
+    __slots__ = ("__price_cents",)
+
+    def __init__(self, price_cents: int):
+        self.__price_cents = price_cents
+
+    def get_price(self) -> float:
+        return self.__price_cents / 100
+
 
 class SecondHalfPrice(Promotion):
     """
     Promotion where every second product is at half price.
     """
 
+    __slots__ = ()
+
     def apply_promotion(self, product, quantity) -> float:
         """
         Applies the second-half-price promotion.
@@ -106,12 +160,45 @@ class SecondHalfPrice(Promotion):
         return (((quantity - half) * product.get_price())
                 + product.get_price() * .50 * half)
 
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Applies the second-half-price promotion in whole cents, rounding the
+        half price items half up.
+
+        Parameters:
+            price_cents (int): The product price in cents.
+            quantity (int): The quantity of the product.
+
+        Returns:
+            int: The total price in cents.
+        """
+        half = quantity // 2
+        return ((quantity - half) * price_cents
+                + divide_half_up(price_cents * half, 2))
+
+    def apply_promotion_batch(self, products: list, prices, quantities):
+        """
+        Applies the second-half-price promotion to many lines at once.
+
+        Parameters:
+            products (list): The product of each line.
+            prices (np.ndarray): The price of each line's product.
+            quantities (np.ndarray): The ordered quantity of each line.
+
+        Returns:
+            np.ndarray: The total price of each line.
+        """
+        half = quantities // 2
+        return ((quantities - half) * prices) + prices * .50 * half
+
 
 class ThirdOneFree(Promotion):
     """
     Promotion where every third product is free.
     """
 
+    __slots__ = ()
+
     def apply_promotion(self, product, quantity) -> float:
         """
         Applies the third-one-free promotion.
@@ -125,12 +212,41 @@ class ThirdOneFree(Promotion):
         """
         return product.get_price() * (quantity - (quantity // 3))
 
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Applies the third-one-free promotion in whole cents.
+
+        Parameters:
+            price_cents (int): The product price in cents.
+            quantity (int): The quantity of the product.
+
+        Returns:
+            int: The total price in cents.
+        """
+        return price_cents * (quantity - (quantity // 3))
+
+    def apply_promotion_batch(self, products: list, prices, quantities):
+        """
+        Applies the third-one-free promotion to many lines at once.
+
+        Parameters:
+            products (list): The product of each line.
+            prices (np.ndarray): The price of each line's product.
+            quantities (np.ndarray): The ordered quantity of each line.
+
+        Returns:
+            np.ndarray: The total price of each line.
+        """
+        return prices * (quantities - (quantities // 3))
+
 
 class PercentDiscount(Promotion):
     """
     Promotion that applies a percentage discount to the total price.
     """
 
+    __slots__ = ()
+
     def apply_promotion(self, product, quantity) -> float:
         """
         Applies a percentage discount to the total price of the product.
@@ -144,3 +260,33 @@ class PercentDiscount(Promotion):
         """
         gross_total = (product.get_price() * quantity)
         return gross_total - (gross_total * (self.get_percent() / 100))
+
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Applies the percentage discount in whole cents, rounding the
+        discounted total half up.
+
+        Parameters:
+            price_cents (int): The product price in cents.
+            quantity (int): The quantity of the product.
+
+        Returns:
+            int: The total price in cents.
+        """
+        return divide_half_up(price_cents * quantity
+                              * (100 - self.get_percent()), 100)
+
+    def apply_promotion_batch(self, products: list, prices, quantities):
+        """
+        Applies the percentage discount to many lines at once.
+
+        Parameters:
+            products (list): The product of each line.
+            prices (np.ndarray): The price of each line's product.
+            quantities (np.ndarray): The ordered quantity of each line.
+
+        Returns:
+            np.ndarray: The total price of each line.
+        """
+        gross_total = (prices * quantities)
+        return gross_total - (gross_total * (self.get_percent() / 100))
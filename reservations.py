@@ -0,0 +1,168 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class ReservationBook:
+    """
+    Stock held per cart until checkout or expiry.
+
+    Each cart has a deadline that every reservation pushes back by its TTL.
+    Deadlines live in a min-heap, so expiring carts pops only the due ones;
+    when a deadline moves, the old heap entry is skipped as stale.
+
+    Attributes:
+        __carts (dict[str, dict[int, list]]): [product, quantity] per
+                                              product id, per cart.
+        __deadlines (dict[str, float]): The current deadline of every cart.
+        __heap (list[tuple[float, int, str]]): (deadline, sequence, cart id)
+                                               entries, stale ones included.
+        __reserved (dict[int, int]): Total reserved quantity per product id.
+        __clock: Returns the current time in seconds.
+        __sequence (itertools.count): Breaks ties between equal deadlines.
+        __lock (threading.Lock): Guards the book against concurrent changes.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        """
+        Initializes an empty book.
+
+        Parameter:
+            clock (optional): Returns the current time in seconds.
+                              Defaults to time.monotonic.
+        """
+        self.__carts: dict[str, dict[int, list]] = {}
+        self.__deadlines: dict[str, float] = {}
+        self.__heap: list[tuple[float, int, str]] = []
+        self.__reserved: dict[int, int] = {}
+        self.__clock = clock
+        self.__sequence = itertools.count()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__carts)
+
+    def get_reserved(self, product) -> int:
+        """
+        Retrieves the quantity of a product held by all carts.
+
+        Parameter:
+            product (Product): The product.
+
+        Returns:
+            int: The reserved quantity.
+        """
+        return self.__reserved.get(id(product), 0)
+
+    def get_cart_quantity(self, cart_id: str, product) -> int:
+        """
+        Retrieves the quantity of a product held by one cart.
+
+        Parameters:
+            cart_id (str): The cart.
+            product (Product): The product.
+
+        Returns:
+            int: The quantity reserved by the cart.
+        """
+        line = self.__carts.get(cart_id, {}).get(id(product))
+        return line[1] if line else 0
+
+    def get_cart(self, cart_id: str) -> list[tuple]:
+        """
+        Retrieves the reservations of a cart.
+
+        Parameter:
+            cart_id (str): The cart.
+
+        Returns:
+            list[tuple[Product, int]]: The reserved (product, quantity)
+                                       lines, empty for an unknown cart.
+        """
+        with self.__lock:
+            return [tuple(line)
+                    for line in self.__carts.get(cart_id, {}).values()]
+
+    def get_deadline(self, cart_id: str) -> float | None:
+        """
+        Retrieves the time a cart expires at.
+
+        Parameter:
+            cart_id (str): The cart.
+
+        Returns:
+            float | None: The deadline on the book's clock, None for an
+                          unknown cart.
+        """
+        return self.__deadlines.get(cart_id)
+
+    def reserve(self, cart_id: str, product, quantity: int, ttl: float):
+        """
+        Adds a reservation to a cart and pushes its deadline back.
+
+        Parameters:
+            cart_id (str): The cart.
+            product (Product): The reserved product.
+            quantity (int): The reserved quantity.
+            ttl (float): Seconds from now until the cart expires.
+        """
+        with self.__lock:
+            line = self.__carts.setdefault(cart_id, {}).setdefault(
+                id(product), [product, 0])
+            line[1] += quantity
+            self.__reserved[id(product)] = (self.__reserved.get(id(product), 0)
+                                            + quantity)
+            deadline = self.__clock() + ttl
+            self.__deadlines[cart_id] = deadline
+            heapq.heappush(self.__heap,
+                           (deadline, next(self.__sequence), cart_id))
+
+    def release(self, cart_id: str) -> list[tuple]:
+        """
+        Drops a cart and its reservations. Its heap entry turns stale.
+
+        Parameter:
+            cart_id (str): The cart.
+
+        Returns:
+            list[tuple[Product, int]]: The released lines, empty for an
+                                       unknown cart.
+        """
+        with self.__lock:
+            return self.__release(cart_id)
+
+    def __release(self, cart_id: str) -> list[tuple]:
+        """Drops a cart; the caller holds the lock."""
+        lines = self.__carts.pop(cart_id, {})
+        self.__deadlines.pop(cart_id, None)
+        for product_id, (_, quantity) in lines.items():
+            remaining = self.__reserved[product_id] - quantity
+            if remaining:
+                self.__reserved[product_id] = remaining
+            else:
+                del self.__reserved[product_id]
+        return [tuple(line) for line in lines.values()]
+
+    def expire(self, now: float | None = None) -> list[str]:
+        """
+        Releases every cart whose deadline passed. Only due heap entries are
+        visited.
+
+        Parameter:
+            now (float, optional): The current time, defaults to the clock.
+
+        Returns:
+            list[str]: The expired carts.
+        """
+        if not self.__heap:
+            return []
+        now = self.__clock() if now is None else now
+        expired = []
+        with self.__lock:
+            while self.__heap and self.__heap[0][0] <= now:
+                deadline, _, cart_id = heapq.heappop(self.__heap)
+                if self.__deadlines.get(cart_id) == deadline:
+                    self.__release(cart_id)
+                    expired.append(cart_id)
+        return expired
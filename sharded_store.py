@@ -0,0 +1,404 @@
+import itertools
+import multiprocessing
+import os
+import zlib
+
+from products import Product, NonStockedProduct
+from store import Store, QuantityExceededError
+
+
+def shard_for(name: str, shard_count: int) -> int:
+    """
+    Maps a product name to its shard. crc32 is used instead of hash() because
+    string hashes are randomized per process.
+
+    Parameters:
+        name (str): The product name.
+        shard_count (int): The number of shards.
+
+    Returns:
+        int: The shard index.
+    """
+    return zlib.crc32(name.encode()) % shard_count
+
+
+class _Shard:
+    """
+    The state of one worker process: a Store with part of the catalog plus
+    the stock held by prepared, not yet committed, transactions.
+
+    Attributes:
+        __store (Store): The shard's part of the catalog.
+        __held (dict[str, int]): Quantity held per product name.
+        __prepared (dict[int, list[tuple[str, int]]]): Lines per transaction.
+    """
+
+    def __init__(self, product_list: list[Product]):
+        """
+        Initializes the shard.
+
+        Parameter:
+            product_list (list[Product]): The products owned by this shard.
+        """
+        self.__store = Store(product_list)
+        self.__held: dict[str, int] = {}
+        self.__prepared: dict[int, list[tuple[str, int]]] = {}
+
+    def handle(self, op: str, args: tuple):
+        """
+        Runs one coordinator request.
+
+        Parameters:
+            op (str): The operation name.
+            args (tuple): The operation arguments.
+
+        Returns:
+            The operation result.
+        """
+        return getattr(self, f"op_{op}")(*args)
+
+    def op_prepare(self, txid: int, lines: list[tuple[str, int]]):
+        """Validates the lines and holds their stock (phase one)."""
+        self.__validate(lines)
+        for name, quantity in lines:
+            self.__held[name] = self.__held.get(name, 0) + quantity
+        self.__prepared[txid] = lines
+
+    def op_commit(self, txid: int) -> float:
+        """Applies the held lines of a prepared transaction (phase two)."""
+        lines = self.__release(txid)
+        return self.__store.checkout(self.__shopping_list(lines))
+
+    def op_abort(self, txid: int):
+        """Releases the stock held by a prepared transaction."""
+        self.__release(txid)
+
+    def op_order(self, lines: list[tuple[str, int]]) -> float:
+        """Validates and applies an order that only touches this shard."""
+        self.__validate(lines)
+        return self.__store.checkout(self.__shopping_list(lines))
+
+    def op_order_many(self, orders: list[list[tuple[str, int]]]) -> list:
+        """Runs many single-shard orders, returning totals or errors."""
+        results = []
+        for lines in orders:
+            try:
+                results.append(self.op_order(lines))
+            except ValueError as error:
+                results.append(error)
+        return results
+
+    def op_total(self) -> int:
+        """Returns the shard's total quantity."""
+        return self.__store.get_total_quantity()
+
+    def op_products(self) -> list[Product]:
+        """Returns copies of the shard's active products."""
+        return self.__store.get_all_products()
+
+    def op_add(self, product: Product):
+        """Adds a product to the shard."""
+        self.__store.add_product(product)
+
+    def __shopping_list(self, lines: list[tuple[str, int]]) -> list[tuple]:
+        """
+        Resolves product names to the shard's products.
+
+        Raises:
+            ValueError: If a product is unknown.
+        """
+        shopping_list = []
+        for name, quantity in lines:
+            product = self.__store.get_product(name)
+            if product is None:
+                raise ValueError(f"Unknown product: {name}")
+            shopping_list.append((product, quantity))
+        return shopping_list
+
+    def __validate(self, lines: list[tuple[str, int]]):
+        """
+        Checks the lines against the stock that is not held by prepared
+        transactions. Every check checkout() makes is done here, so a
+        prepared transaction cannot fail to commit.
+
+        Raises:
+            ValueError: If the order cannot be fulfilled.
+        """
+        aggregated: dict[str, int] = {}
+        for name, quantity in lines:
+            if not isinstance(quantity, int) or quantity <= 0:
+                raise ValueError(
+                    "Error while making order! Quantity must be a positive int\n")
+            aggregated[name] = aggregated.get(name, 0) + quantity
+        for product, _ in self.__shopping_list(lines):
+            name = product.get_name()
+            held = self.__held.get(name, 0)
+            if (not isinstance(product, NonStockedProduct)
+                    and product.get_quantity() - held < aggregated[name]):
+                raise QuantityExceededError(
+                    "Error while making order! Quantity larger than what exists\n")
+        self.__store.validate_order(
+            [(product, aggregated[product.get_name()])
+             for product, _ in self.__shopping_list(lines)])
+
+    def __release(self, txid: int) -> list[tuple[str, int]]:
+        """Drops the holds of a transaction and returns its lines."""
+        lines = self.__prepared.pop(txid)
+        for name, quantity in lines:
+            self.__held[name] -= quantity
+            if not self.__held[name]:
+                del self.__held[name]
+        return lines
+
+
+def _shard_worker(connection, product_list: list[Product]):
+    """
+    Process entry point: serves coordinator requests until told to stop.
+
+    Parameters:
+        connection: The worker end of the coordinator pipe.
+        product_list (list[Product]): The products owned by this shard.
+    """
+    shard = _Shard(product_list)
+    while True:
+        op, args = connection.recv()
+        if op == "stop":
+            break
+        try:
+            connection.send((True, shard.handle(op, args)))
+        except (ValueError, KeyError) as error:
+            connection.send((False, error))
+    connection.close()
+
+
+class ShardedStore:
+    """
+    Spreads the catalog over worker processes so orders use several cores.
+
+    Products are partitioned by the crc32 of their name. Orders are given as
+    (product or name, quantity) lines; orders that touch one shard are sent
+    to it directly, orders that span shards run a two-phase prepare/commit
+    so either every shard applies its part or none does.
+
+    Attributes:
+        __shard_count (int): The number of worker processes.
+        __connections (list): Coordinator pipe ends, one per shard.
+        __processes (list): The worker processes.
+        __txids (itertools.count): Transaction id generator.
+    """
+
+    def __init__(self, product_list: list[Product],
+                 shard_count: int | None = None):
+        """
+        Starts the worker processes and distributes the catalog.
+
+        Parameters:
+            product_list (list[Product]): The catalog to distribute.
+            shard_count (int, optional): Number of shards, defaults to the
+                                         number of CPUs.
+        """
+        self.__shard_count = shard_count or os.cpu_count() or 1
+        partitions = [[] for _ in range(self.__shard_count)]
+        for product in product_list:
+            partitions[shard_for(product.get_name(),
+                                 self.__shard_count)].append(product)
+
+        self.__connections = []
+        self.__processes = []
+        for partition in partitions:
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker,
+                                              args=(child_end, partition),
+                                              daemon=True)
+            process.start()
+            child_end.close()
+            self.__connections.append(parent_end)
+            self.__processes.append(process)
+        self.__txids = itertools.count()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the worker processes."""
+        for connection in self.__connections:
+            connection.send(("stop", ()))
+            connection.close()
+        for process in self.__processes:
+            process.join()
+        self.__connections = []
+        self.__processes = []
+
+    def get_shard_count(self) -> int:
+        """
+        Retrieves the number of shards.
+
+        Returns:
+            int: The number of worker processes.
+        """
+        return self.__shard_count
+
+    def __call(self, shard: int, op: str, *args):
+        """Sends one request to a shard and waits for its result."""
+        self.__connections[shard].send((op, args))
+        return self.__receive(shard)
+
+    def __receive(self, shard: int):
+        """Waits for a shard's result, raising its error if it failed."""
+        ok, result = self.__connections[shard].recv()
+        if not ok:
+            raise result
+        return result
+
+    def __receive_all(self, shards: list[int]) -> list:
+        """
+        Reads the result of every given shard, so no reply is left in a
+        pipe, and raises the first error afterwards.
+        """
+        results, error = [], None
+        for shard in shards:
+            try:
+                results.append(self.__receive(shard))
+            except (ValueError, KeyError) as shard_error:
+                error = error or shard_error
+        if error is not None:
+            raise error
+        return results
+
+    def __broadcast(self, op: str, *args) -> list:
+        """Sends the same request to every shard and collects the results."""
+        for connection in self.__connections:
+            connection.send((op, args))
+        return self.__receive_all(range(self.__shard_count))
+
+    def __split(self, shopping_list: list[tuple]) -> dict[int, list]:
+        """
+        Groups the lines of a shopping list by shard.
+
+        Parameter:
+            shopping_list (list[tuple]): (product or name, quantity) lines.
+
+        Returns:
+            dict[int, list[tuple[str, int]]]: Lines by name, per shard.
+        """
+        per_shard: dict[int, list] = {}
+        for item, quantity in shopping_list:
+            name = item.get_name() if isinstance(item, Product) else item
+            per_shard.setdefault(shard_for(name, self.__shard_count),
+                                 []).append((name, quantity))
+        return per_shard
+
+    def add_product(self, product: Product):
+        """
+        Adds a product to its shard.
+
+        Parameter:
+            product (Product): The product to add.
+        """
+        self.__call(shard_for(product.get_name(), self.__shard_count),
+                    "add", product)
+
+    def get_total_quantity(self) -> int:
+        """
+        Sums the total quantity of every shard.
+
+        Returns:
+            int: The sum of quantities for all products in the store.
+        """
+        return sum(self.__broadcast("total"))
+
+    def get_all_products(self) -> list[Product]:
+        """
+        Collects copies of the active products of every shard.
+
+        Returns:
+            list[Product]: The active products, grouped by shard.
+        """
+        return [product for products in self.__broadcast("products")
+                for product in products]
+
+    def order(self, shopping_list: list[tuple]) -> float:
+        """
+        Processes an order, with a two-phase commit when it spans shards.
+
+        Parameter:
+            shopping_list (list[tuple]): (product or name, quantity) lines.
+
+        Returns:
+            float: The total cost of the order.
+
+        Raises:
+            ValueError: If the order cannot be fulfilled; nothing is applied.
+        """
+        per_shard = self.__split(shopping_list)
+        if len(per_shard) == 1:
+            [(shard, lines)] = per_shard.items()
+            return self.__call(shard, "order", lines)
+        if not per_shard:
+            return 0.0
+
+        txid = next(self.__txids)
+        for shard, lines in per_shard.items():
+            self.__connections[shard].send(("prepare", (txid, lines)))
+        prepared, error = [], None
+        for shard in per_shard:
+            try:
+                self.__receive(shard)
+                prepared.append(shard)
+            except (ValueError, KeyError) as prepare_error:
+                error = error or prepare_error
+
+        if error is not None:
+            for shard in prepared:
+                self.__connections[shard].send(("abort", (txid,)))
+            self.__receive_all(prepared)
+            raise error
+
+        for shard in prepared:
+            self.__connections[shard].send(("commit", (txid,)))
+        return sum(self.__receive_all(prepared))
+
+    def order_many(self, orders: list[list[tuple]]) -> list:
+        """
+        Processes many orders, running the single-shard ones on all shards in
+        parallel and the cross-shard ones through order() afterwards.
+
+        Parameter:
+            orders (list[list[tuple]]): Shopping lists of
+                                        (product or name, quantity) lines.
+
+        Returns:
+            list[float | ValueError]: Per order, the total cost or the error
+                                      that rejected it.
+        """
+        results: list = [None] * len(orders)
+        batches: dict[int, list] = {}
+        positions: dict[int, list[int]] = {}
+        cross_shard = []
+        for position, shopping_list in enumerate(orders):
+            per_shard = self.__split(shopping_list)
+            if len(per_shard) == 1:
+                [(shard, lines)] = per_shard.items()
+                batches.setdefault(shard, []).append(lines)
+                positions.setdefault(shard, []).append(position)
+            elif not per_shard:
+                results[position] = 0.0
+            else:
+                cross_shard.append(position)
+
+        for shard, batch in batches.items():
+            self.__connections[shard].send(("order_many", (batch,)))
+        for shard in batches:
+            for position, result in zip(positions[shard],
+                                        self.__receive(shard)):
+                results[position] = result
+
+        for position in cross_shard:
+            try:
+                results[position] = self.order(orders[position])
+            except ValueError as error:
+                results[position] = error
+        return results
@@ -0,0 +1,330 @@
+"""
+Compact binary snapshot of a product catalog.
+
+Layout (little endian):
+
+    header      magic, promotion count, product count, names blob size,
+                last journal sequence included in the snapshot
+    promotions  kind, percent, name length, name       (one per promotion)
+    products    fixed size records, see PRODUCT_RECORD
+    names       UTF-8 product names, referenced by offset and length
+
+Promotions shared by several products are written once and restored as one
+shared object. Loading maps the file into memory and decodes the fixed size
+product records with struct.iter_unpack, without per-record reads.
+load_columns() instead reads the records as NumPy columns in one
+np.frombuffer call, for ColumnarStore.load_snapshot.
+"""
+import mmap
+import struct
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, only load_columns needs it
+    np = None
+
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import (Promotion, SecondHalfPrice, ThirdOneFree,
+                        PercentDiscount)
+
+MAGIC = b"BBSNAP01"
+HEADER = struct.Struct("<8sIIQQ")
+PROMOTION_HEADER = struct.Struct("<BiH")
+# kind, flags, promotion index (-1 for none), price, quantity, maximum,
+# name offset, name length
+PRODUCT_RECORD = struct.Struct("<BBidqqQI")
+
+# PRODUCT_RECORD as a NumPy record type, for load_columns
+PRODUCT_DTYPE = ([("kind", "u1"), ("flags", "u1"), ("promotion", "<i4"),
+                  ("price", "<f8"), ("quantity", "<i8"), ("maximum", "<i8"),
+                  ("name_offset", "<u8"), ("name_length", "<u4")])
+
+FLAG_ACTIVE = 1
+FLAG_INT_PRICE = 2  # Price was given as an int, restore it as one
+
+PRODUCT_KINDS = [Product, NonStockedProduct, LimitedProduct]
+PROMOTION_KINDS = [SecondHalfPrice, ThirdOneFree, PercentDiscount]
+
+
+def save_products(product_list: list[Product], path: str,
+                  sequence: int = 0) -> None:
+    """
+    Writes products, their stock, maximums, active flags and promotions to a
+    snapshot file.
+
+    Parameters:
+        product_list (list[Product]): The products to save.
+        path (str): The snapshot file to write.
+        sequence (int): The last order journal sequence reflected in the
+                        products, see journal.py.
+
+    Raises:
+        ValueError: If a product or promotion class cannot be stored.
+    """
+    promotion_indexes: dict[int, int] = {}
+    promotion_list: list[Promotion] = []
+    records = bytearray()
+    names = bytearray()
+
+    for product in product_list:
+        kind = _kind_of(product, PRODUCT_KINDS)
+        promotion = product.get_promotion()
+        promotion_index = -1
+        if promotion is not None:
+            promotion_index = promotion_indexes.get(id(promotion), -1)
+            if promotion_index < 0:
+                _kind_of(promotion, PROMOTION_KINDS)
+                promotion_index = len(promotion_list)
+                promotion_indexes[id(promotion)] = promotion_index
+                promotion_list.append(promotion)
+
+        name = product.get_name().encode()
+        maximum = (product.get_maximum()
+                   if isinstance(product, LimitedProduct) else 0)
+        flags = ((FLAG_ACTIVE if product.is_active() else 0)
+                 | (FLAG_INT_PRICE if isinstance(product.get_price(), int)
+                    else 0))
+        records += PRODUCT_RECORD.pack(kind, flags,
+                                       promotion_index, product.get_price(),
+                                       product.get_quantity(), maximum,
+                                       len(names), len(name))
+        names += name
+
+    with open(path, "wb") as snapshot:
+        snapshot.write(HEADER.pack(MAGIC, len(promotion_list),
+                                   len(product_list), len(names),
+                                   sequence))
+        for promotion in promotion_list:
+            name = promotion.get_name().encode()
+            snapshot.write(PROMOTION_HEADER.pack(
+                _kind_of(promotion, PROMOTION_KINDS),
+                promotion.get_percent(), len(name)))
+            snapshot.write(name)
+        snapshot.write(records)
+        snapshot.write(names)
+
+
+def load_products(path: str) -> list[Product]:
+    """
+    Restores the products of a snapshot file.
+
+    Parameter:
+        path (str): The snapshot file to read.
+
+    Returns:
+        list[Product]: The products, in the order they were saved.
+
+    Raises:
+        ValueError: If the file is not a snapshot.
+    """
+    with open(path, "rb") as snapshot:
+        with mmap.mmap(snapshot.fileno(), 0,
+                       access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return _decode(view)
+            finally:
+                view.release()
+
+
+def load_columns(path: str) -> dict:
+    """
+    Restores the products of a snapshot file as columns instead of objects.
+
+    Parameter:
+        path (str): The snapshot file to read.
+
+    Returns:
+        dict: "kinds", "prices", "quantities", "maximums", "active",
+              "name_offsets" and "name_lengths" as NumPy arrays and
+              "promotions" as a list, one entry per product in the order
+              they were saved, plus the encoded names as "name_blob", see
+              decode_names.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If the file is not a snapshot.
+    """
+    if np is None:
+        raise ImportError("load_columns requires numpy")
+    with open(path, "rb") as snapshot:
+        with mmap.mmap(snapshot.fileno(), 0,
+                       access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return _decode_columns(view)
+            finally:
+                view.release()
+
+
+def decode_names(blob: bytes, offsets, lengths) -> list[str]:
+    """
+    Decodes the names of loaded columns.
+
+    Parameters:
+        blob (bytes): The UTF-8 names blob.
+        offsets: The byte offset of every name.
+        lengths: The byte length of every name.
+
+    Returns:
+        list[str]: The names.
+    """
+    offsets, lengths = offsets.tolist(), lengths.tolist()
+    if blob.isascii():
+        # One decode for all names, then slices: byte offsets equal
+        # character offsets in ASCII text
+        text = blob.decode()
+        return [text[offset:offset + length]
+                for offset, length in zip(offsets, lengths)]
+    return [blob[offset:offset + length].decode()
+            for offset, length in zip(offsets, lengths)]
+
+
+def _decode_columns(view: memoryview) -> dict:
+    """
+    Decodes a mapped snapshot into columns. Every column is copied out of
+    the mapping, so the file can be closed afterwards.
+
+    Parameter:
+        view (memoryview): The snapshot bytes.
+
+    Returns:
+        dict: The columns, see load_columns.
+    """
+    promotion_list, offset, product_count, names_size = _decode_header(view)
+    records = np.frombuffer(view, dtype=PRODUCT_DTYPE, count=product_count,
+                            offset=offset)
+    try:
+        columns = {
+            "kinds": records["kind"].astype(np.int8),
+            "prices": records["price"].astype(np.float64),
+            "quantities": records["quantity"].astype(np.int64),
+            "maximums": records["maximum"].astype(np.int64),
+            "active": (records["flags"] & FLAG_ACTIVE).astype(bool),
+        }
+        promotion_indexes = records["promotion"].astype(np.intp)
+        name_offsets = records["name_offset"].copy()
+        name_lengths = records["name_length"].copy()
+    finally:
+        del records  # Releases the export of the mapping
+
+    records_end = offset + product_count * PRODUCT_RECORD.size
+    columns["name_blob"] = bytes(view[records_end:records_end + names_size])
+    columns["name_offsets"] = name_offsets
+    columns["name_lengths"] = name_lengths
+    # Index -1 picks the trailing None
+    promotion_table = np.array(promotion_list + [None], dtype=object)
+    columns["promotions"] = promotion_table[promotion_indexes].tolist()
+    return columns
+
+
+def read_sequence(path: str) -> int:
+    """
+    Reads the last journal sequence a snapshot file includes.
+
+    Parameter:
+        path (str): The snapshot file to read.
+
+    Returns:
+        int: The journal sequence stored in the header.
+
+    Raises:
+        ValueError: If the file is not a snapshot.
+    """
+    with open(path, "rb") as snapshot:
+        header = snapshot.read(HEADER.size)
+    if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a product snapshot")
+    return HEADER.unpack(header)[4]
+
+
+def _decode(view: memoryview) -> list[Product]:
+    """
+    Decodes a mapped snapshot.
+
+    Parameter:
+        view (memoryview): The snapshot bytes.
+
+    Returns:
+        list[Product]: The restored products.
+    """
+    promotion_list, offset, product_count, names_size = _decode_header(view)
+    records_end = offset + product_count * PRODUCT_RECORD.size
+    names = bytes(view[records_end:records_end + names_size])
+    product_list: list[Product] = []
+    append = product_list.append
+    for (kind, flags, promotion_index, price, quantity, maximum,
+         name_offset, name_length) in PRODUCT_RECORD.iter_unpack(
+            view[offset:records_end]):
+        name = names[name_offset:name_offset + name_length].decode()
+        if flags & FLAG_INT_PRICE:
+            price = int(price)
+        if kind == 0:
+            product = Product(name, price, quantity)
+        elif kind == 1:
+            product = NonStockedProduct(name, price)
+        else:
+            product = LimitedProduct(name, price, quantity, maximum)
+        if not flags & FLAG_ACTIVE:
+            product.deactivate()
+        if promotion_index >= 0:
+            product.set_promotion(promotion_list[promotion_index])
+        append(product)
+    return product_list
+
+
+def _decode_header(view: memoryview) -> tuple[list[Promotion], int, int, int]:
+    """
+    Decodes the header and the promotion table of a mapped snapshot.
+
+    Parameter:
+        view (memoryview): The snapshot bytes.
+
+    Returns:
+        tuple[list[Promotion], int, int, int]: The promotions, the offset of
+                                               the product records, the
+                                               product count and the size
+                                               of the names blob.
+
+    Raises:
+        ValueError: If the bytes are not a snapshot.
+    """
+    if len(view) < HEADER.size:
+        raise ValueError("Not a product snapshot")
+    magic, promotion_count, product_count, names_size, _ = \
+        HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a product snapshot")
+
+    offset = HEADER.size
+    promotion_list: list[Promotion] = []
+    for _ in range(promotion_count):
+        kind, percent, name_length = PROMOTION_HEADER.unpack_from(view,
+                                                                  offset)
+        offset += PROMOTION_HEADER.size
+        name = str(view[offset:offset + name_length], "utf-8")
+        offset += name_length
+        promotion_list.append(PROMOTION_KINDS[kind](name, percent=percent))
+    return promotion_list, offset, product_count, names_size
+
+
+def _kind_of(item, kinds: list[type]) -> int:
+    """
+    Finds the stored kind of a product or promotion. Exact classes are used
+    so subclasses with extra state are not silently truncated.
+
+    Parameters:
+        item: The product or promotion.
+        kinds (list[type]): The classes the format can store.
+
+    Returns:
+        int: The index of the item's class in kinds.
+
+    Raises:
+        ValueError: If the class cannot be stored.
+    """
+    try:
+        return kinds.index(type(item))
+    except ValueError:
+        raise ValueError(
+            f"Cannot snapshot {type(item).__name__} objects") from None
@@ -0,0 +1,429 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+import pricing
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import (Promotion, SecondHalfPrice, ThirdOneFree,
+                        PercentDiscount)
+from store import QuantityExceededError, MaximumExceededError
+
+PRODUCT_KINDS = [Product, NonStockedProduct, LimitedProduct]
+PROMOTION_KINDS = {promotion_class.__name__: promotion_class
+                   for promotion_class in (SecondHalfPrice, ThirdOneFree,
+                                           PercentDiscount)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    kind INTEGER NOT NULL,
+    price NOT NULL,  -- untyped, so int and float prices round-trip as given
+    quantity INTEGER NOT NULL CHECK (quantity >= 0),
+    maximum INTEGER,
+    is_active INTEGER NOT NULL,
+    promotion_kind TEXT,
+    promotion_name TEXT,
+    promotion_percent INTEGER
+);
+CREATE INDEX IF NOT EXISTS products_active ON products (is_active, position);
+"""
+
+COLUMNS = ("name, kind, price, quantity, maximum, is_active, promotion_kind,"
+           " promotion_name, promotion_percent")
+
+
+class ConnectionPool:
+    """
+    A fixed set of SQLite connections shared by threads. Readers run on their
+    own connection, and with WAL journaling they do not block the writer.
+
+    Attributes:
+        __connections (queue.Queue): The idle connections.
+        __all (list[sqlite3.Connection]): Every connection, for closing.
+    """
+
+    def __init__(self, database: str, size: int = 4):
+        """
+        Opens the connections.
+
+        Parameters:
+            database (str): The SQLite database file.
+            size (int): The number of connections.
+        """
+        self.__connections: queue.Queue = queue.Queue()
+        self.__all: list[sqlite3.Connection] = []
+        for _ in range(size):
+            # Transactions are managed explicitly with BEGIN IMMEDIATE
+            connection = sqlite3.connect(database, isolation_level=None,
+                                         check_same_thread=False,
+                                         timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__all.append(connection)
+            self.__connections.put(connection)
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection for the duration of the context."""
+        connection = self.__connections.get()
+        try:
+            yield connection
+        finally:
+            self.__connections.put(connection)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Borrows a connection and runs the context as one write transaction,
+        committed on success and rolled back on any error.
+        """
+        with self.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self):
+        """Closes every connection."""
+        for connection in self.__all:
+            connection.close()
+
+
+class SQLiteStore:
+    """
+    A Store whose catalog lives in a SQLite database instead of in memory.
+
+    It offers the Store API; products handed out are copies of their row,
+    so stock changes must go through the store (order/checkout). Orders run
+    as one transaction with conditional `UPDATE ... WHERE quantity >= ?`
+    decrements, so concurrent orders cannot oversell.
+
+    Attributes:
+        __pool (ConnectionPool): The connections to the database.
+        __promotions (dict[tuple, Promotion]): Promotion objects by their
+                                               stored columns, so products
+                                               share them like in a Store.
+    """
+
+    def __init__(self, database: str, product_list: list[Product] = None,
+                 pool_size: int = 4):
+        """
+        Opens (or creates) the database and loads the given products.
+
+        Parameters:
+            database (str): The SQLite database file.
+            product_list (list[Product], optional): Products to add.
+            pool_size (int): The number of pooled connections.
+        """
+        self.__pool = ConnectionPool(database, pool_size)
+        self.__promotions: dict[tuple, Promotion] = {}
+        with self.__pool.connection() as connection:
+            connection.executescript(SCHEMA)
+        if product_list:
+            self.add_products(product_list)
+
+    def close(self):
+        """Closes the database connections."""
+        self.__pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def __to_row(product: Product) -> tuple:
+        """
+        Converts a product to the values of its row.
+
+        Parameter:
+            product (Product): The product to store.
+
+        Returns:
+            tuple: The column values in COLUMNS order.
+
+        Raises:
+            ValueError: If the product or promotion class cannot be stored.
+        """
+        if type(product) not in PRODUCT_KINDS:
+            raise ValueError(f"Cannot store {type(product).__name__} objects")
+        promotion = product.get_promotion()
+        if promotion is not None and \
+                type(promotion).__name__ not in PROMOTION_KINDS:
+            raise ValueError(
+                f"Cannot store {type(promotion).__name__} objects")
+        return (product.get_name(), PRODUCT_KINDS.index(type(product)),
+                product.get_price(), product.get_quantity(),
+                product.get_maximum()
+                if isinstance(product, LimitedProduct) else None,
+                product.is_active(),
+                type(promotion).__name__ if promotion else None,
+                promotion.get_name() if promotion else None,
+                promotion.get_percent() if promotion else None)
+
+    def __to_product(self, row: tuple) -> Product:
+        """
+        Builds a product from a row.
+
+        Parameter:
+            row (tuple): The column values in COLUMNS order.
+
+        Returns:
+            Product: A detached copy of the stored product.
+        """
+        (name, kind, price, quantity, maximum, is_active, promotion_kind,
+         promotion_name, promotion_percent) = row
+        if kind == 0:
+            product = Product(name, price, quantity)
+        elif kind == 1:
+            product = NonStockedProduct(name, price)
+        else:
+            product = LimitedProduct(name, price, quantity, maximum)
+        if not is_active:
+            product.deactivate()
+        if promotion_kind:
+            key = (promotion_kind, promotion_name, promotion_percent)
+            if key not in self.__promotions:
+                self.__promotions[key] = PROMOTION_KINDS[promotion_kind](
+                    promotion_name, percent=promotion_percent)
+            product.set_promotion(self.__promotions[key])
+        return product
+
+    def add_product(self, product: Product):
+        """
+        Adds a product to the store's inventory.
+
+        Parameter:
+            product (Product): The product to add to the store's inventory.
+
+        Raises:
+            ValueError: If a product with the same name is already in the store.
+        """
+        self.add_products([product])
+
+    def add_products(self, product_list: list[Product]):
+        """
+        Adds many products with one executemany in one transaction.
+
+        Parameter:
+            product_list (list[Product]): The products to add.
+
+        Raises:
+            ValueError: If a name repeats or is already in the store; nothing
+            is added then.
+        """
+        rows = [self.__to_row(product) for product in product_list]
+        try:
+            with self.__pool.transaction() as connection:
+                connection.executemany(
+                    f"INSERT INTO products ({COLUMNS}) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.IntegrityError:
+            raise ValueError("Product already exists in store") from None
+
+    def remove_product(self, product):
+        """
+        Removes a product from the store's inventory.
+
+        Parameter:
+            product (Product): The product to remove from the store's inventory.
+
+        Raises:
+            ValueError: If the product is not in the store.
+        """
+        with self.__pool.transaction() as connection:
+            deleted = connection.execute(
+                "DELETE FROM products WHERE name = ?",
+                (product.get_name(),)).rowcount
+        if not deleted:
+            raise ValueError("Product not found in store")
+
+    def get_product(self, name: str) -> Product | None:
+        """
+        Looks up a product by its name through the unique index.
+
+        Parameter:
+            name (str): The name of the product.
+
+        Returns:
+            Product | None: A copy of the product, or None if not found.
+        """
+        with self.__pool.connection() as connection:
+            row = connection.execute(
+                f"SELECT {COLUMNS} FROM products WHERE name = ?",
+                (name,)).fetchone()
+        return None if row is None else self.__to_product(row)
+
+    def __contains__(self, product):
+        """Supports `product in store` through the name index."""
+        return self.get_product(product.get_name()) == product
+
+    def __len__(self):
+        """Returns the number of products in the store's inventory."""
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                "SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def get_products(self) -> list[Product]:
+        """
+        Retrieves copies of every product, in insertion order.
+
+        Returns:
+            list[Product]: The products in the store's inventory.
+        """
+        with self.__pool.connection() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM products ORDER BY position").fetchall()
+        return [self.__to_product(row) for row in rows]
+
+    def get_all_products(self) -> list[Product]:
+        """
+        Retrieves copies of the active products, in insertion order.
+
+        Returns:
+            list[Product]: A list of active products in the store.
+        """
+        with self.__pool.connection() as connection:
+            rows = connection.execute(
+                f"SELECT {COLUMNS} FROM products WHERE is_active = 1 "
+                f"ORDER BY position").fetchall()
+        return [self.__to_product(row) for row in rows]
+
+    def get_total_quantity(self) -> int:
+        """
+        Sums the quantity of all products in the database.
+
+        Returns:
+            int: The sum of quantities for all products in the store.
+        """
+        with self.__pool.connection() as connection:
+            return connection.execute(
+                "SELECT COALESCE(SUM(quantity), 0) FROM products").fetchone()[0]
+
+    @staticmethod
+    def __aggregate(shopping_list: list[tuple]) -> dict[str, int]:
+        """
+        Sums the ordered quantity per product name.
+
+        Parameter:
+            shopping_list (list[tuple]): (product, quantity) lines.
+
+        Returns:
+            dict[str, int]: The total quantity per product name.
+
+        Raises:
+            ValueError: If a quantity is not a positive int.
+        """
+        aggregated: dict[str, int] = {}
+        for product, order in shopping_list:
+            if not isinstance(order, int) or order <= 0:
+                raise ValueError(
+                    "Error while making order! Quantity must be a positive int\n")
+            name = product.get_name()
+            aggregated[name] = aggregated.get(name, 0) + order
+        return aggregated
+
+    @staticmethod
+    def __check_row(name: str, row: tuple | None, order: int):
+        """
+        Checks an aggregated order quantity against a product row.
+
+        Parameters:
+            name (str): The product name.
+            row (tuple | None): (kind, quantity, maximum), None if unknown.
+            order (int): The total quantity ordered.
+
+        Raises:
+            ValueError: If the product is unknown, the quantity exceeds the
+            stock or the maximum order limit.
+        """
+        if row is None:
+            raise ValueError(f"Product not found in store: {name}")
+        kind, quantity, maximum = row
+        if PRODUCT_KINDS[kind] is not NonStockedProduct and quantity < order:
+            raise QuantityExceededError(
+                "Error while making order! Quantity larger than what exists\n")
+        if maximum is not None and order > maximum:
+            raise MaximumExceededError(
+                f"Error while making order! The maximum order is {maximum}\n")
+
+    def validate_order(self, shopping_list: list[tuple]) -> None:
+        """
+        Validates the provided shopping list against the stored stock and
+        order limits.
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]):
+                                A list of tuples, each containing a Product
+                                and the quantity to be ordered.
+
+        Raises:
+            ValueError: If any product quantity exceeds the available quantity
+            or maximum order limit.
+        """
+        aggregated = self.__aggregate(shopping_list)
+        with self.__pool.connection() as connection:
+            for name, order in aggregated.items():
+                self.__check_row(name, connection.execute(
+                    "SELECT kind, quantity, maximum FROM products "
+                    "WHERE name = ?", (name,)).fetchone(), order)
+
+    def order(self, shopping_list: list[tuple]) -> float:
+        """
+        Processes an order in one transaction. Each product's stock is
+        decremented with a conditional UPDATE, and any failing line rolls the
+        whole order back.
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]):
+                                A list of tuples where each tuple consists of
+                                a Product and the quantity to be purchased.
+
+        Returns:
+            float: The total cost of the order.
+
+        Raises:
+            ValueError: If the order cannot be fulfilled.
+        """
+        aggregated = self.__aggregate(shopping_list)
+        with self.__pool.transaction() as connection:
+            stored = {}
+            for name, order in aggregated.items():
+                updated = connection.execute(
+                    "UPDATE products SET quantity = quantity - ?1, "
+                    "is_active = CASE WHEN quantity = ?1 THEN 0 "
+                    "ELSE is_active END "
+                    "WHERE name = ?2 AND kind != 1 AND quantity >= ?1 "
+                    "AND (maximum IS NULL OR maximum >= ?1)",
+                    (order, name)).rowcount
+                row = connection.execute(
+                    f"SELECT {COLUMNS} FROM products WHERE name = ?",
+                    (name,)).fetchone()
+                if not updated:
+                    # Either a non-stocked product, or the check failed
+                    self.__check_row(name, row and (row[1], row[3], row[4]),
+                                     order)
+                stored[name] = self.__to_product(row)
+
+            total_cost: float = 0.0
+            for product, order in shopping_list:
+                total_cost += pricing.price_line(stored[product.get_name()],
+                                                 order)
+        return total_cost
+
+    def checkout(self, shopping_list: list[tuple]) -> float:
+        """
+        Validates and applies an order all-or-nothing, see order().
+
+        Parameter:
+            shopping_list (list[tuple[Product, int]]): The order lines.
+
+        Returns:
+            float: The total cost of the order.
+        """
+        return self.order(shopping_list)
@@ -0,0 +1,110 @@
+import pytest
+
+import products
+import promotions
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with built listing indexes and low-stock
+    tracking.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450, quantity=100),
+        products.Product("Bose QuietComfort Earbuds", price=250, quantity=3),
+        products.Product("Google Pixel 7", price=500, quantity=250),
+        products.NonStockedProduct("Windows License", price=125),
+        products.LimitedProduct("Shipping", price=10, quantity=8, maximum=1)
+    ]
+    best_buy = store.Store(product_list)
+    best_buy.set_low_stock_threshold(5)
+    best_buy.list_products(sort_by="price")
+    yield best_buy
+
+
+def names(product_list) -> list[str]:
+    """Returns the names of the products."""
+    return [product.get_name() for product in product_list]
+
+
+class TestBULKUPDATE:
+    """
+    Test suite for Store.bulk_update.
+    """
+
+    def test_applies_all_fields(self, setup_data):
+        half_price = promotions.SecondHalfPrice("Second Half price!")
+        assert setup_data.bulk_update({
+            "MacBook Air M2": {"price": 1200.0, "promotion": half_price},
+            "Bose QuietComfort Earbuds": {"quantity": 40},
+            "Shipping": {"maximum": 2, "active": False},
+        }) == 3
+        macbook = setup_data.get_product("MacBook Air M2")
+        assert macbook.get_price() == 1200.0
+        assert macbook.get_promotion() is half_price
+        assert setup_data.get_product("Shipping").get_maximum() == 2
+        assert setup_data.get_total_quantity() == 398
+        assert "Shipping" not in names(setup_data.get_all_products())
+        assert setup_data.get_low_stock() == []
+
+    def test_updates_listing_indexes(self, setup_data):
+        setup_data.bulk_update({"Google Pixel 7": {"price": 5.0},
+                                "MacBook Air M2": {"quantity": 0}})
+        page, _ = setup_data.list_products(sort_by="price")
+        assert names(page) == ["Google Pixel 7", "Shipping", "Windows License",
+                               "Bose QuietComfort Earbuds"]
+        assert names(setup_data.get_products_in_price_band(0, 9)) == \
+            ["Google Pixel 7"]
+
+    def test_large_batch_rebuilds_indexes(self, monkeypatch):
+        monkeypatch.setattr(store, "BULK_REINDEX_LIMIT", 10)
+        product_list = [products.Product(f"Product {number:03d}",
+                                         price=float(number), quantity=10)
+                        for number in range(100)]
+        best_buy = store.Store(product_list)
+        best_buy.list_products(sort_by="price")
+        best_buy.bulk_update({f"Product {number:03d}":
+                              {"price": float(100 - number)}
+                              for number in range(100)})
+        page, _ = best_buy.list_products(sort_by="price", limit=3)
+        assert names(page) == ["Product 099", "Product 098", "Product 097"]
+
+    def test_quantity_zero_deactivates_unless_active_is_set(self, setup_data):
+        setup_data.bulk_update({"Google Pixel 7": {"quantity": 0},
+                                "Shipping": {"quantity": 0, "active": True}})
+        assert names(setup_data.get_all_products()) == \
+            ["MacBook Air M2", "Bose QuietComfort Earbuds", "Windows License",
+             "Shipping"]
+        assert names(setup_data.get_low_stock()) == \
+            ["Google Pixel 7", "Shipping", "Bose QuietComfort Earbuds"]
+
+    @pytest.mark.parametrize("changes", [
+        {"Unknown": {"price": 1.0}},
+        {"Google Pixel 7": {"colour": "red"}},
+        {"Google Pixel 7": {"price": 10}},
+        {"Google Pixel 7": {"quantity": -1}},
+        {"Google Pixel 7": {"quantity": True}},
+        {"Google Pixel 7": {"maximum": 1}},
+        {"Shipping": {"active": 1}},
+        {"Shipping": {"promotion": "30% off"}},
+    ])
+    def test_is_all_or_nothing(self, setup_data, changes):
+        with pytest.raises(ValueError):
+            setup_data.bulk_update({"MacBook Air M2": {"price": 1.0,
+                                                       "quantity": 1},
+                                    **changes})
+        macbook = setup_data.get_product("MacBook Air M2")
+        assert macbook.get_price() == 1450
+        assert macbook.get_quantity() == 100
+        assert setup_data.get_total_quantity() == 361
+
+    def test_single_changes_still_tracked(self, setup_data):
+        setup_data.bulk_update({"Google Pixel 7": {"price": 1.0}})
+        setup_data.get_product("Google Pixel 7").set_quantity(4)
+        assert setup_data.get_total_quantity() == 115
+        assert names(setup_data.get_cheapest(1)) == ["Google Pixel 7"]
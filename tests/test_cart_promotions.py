@@ -0,0 +1,113 @@
+import pytest
+
+import products
+import promotions
+import store
+from cart_promotions import (PromotionEngine, BundleRule, BuyXGetYRule,
+                             TieredSpendRule)
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with a small catalog of products.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1000, quantity=100),
+        products.Product("Bose QuietComfort Earbuds", price=250,
+                         quantity=500),
+        products.NonStockedProduct("Windows License", price=100),
+        products.LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+    ]
+    yield store.Store(product_list)
+
+
+class TestCARTPROMOTIONS:
+    """
+    Test suite for the cart-level promotion engine.
+    """
+
+    def test_bundle(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        windows = setup_data.get_product("Windows License")
+        engine = PromotionEngine([BundleRule(
+            "Office bundle", {"MacBook Air M2": 1, "Windows License": 1},
+            1050)])
+        pricing = engine.evaluate([(macbook, 2), (windows, 1)])
+        assert pricing.get_subtotal() == 2100
+        assert pricing.get_discounts() == [("Office bundle", 50)]
+        assert engine.evaluate([(macbook, 2)]).get_total() == 2000
+
+    def test_buy_x_get_y_with_duplicate_lines(self, setup_data):
+        earbuds = setup_data.get_product("Bose QuietComfort Earbuds")
+        engine = PromotionEngine([BuyXGetYRule(
+            "Buy 2 get 1", "Bose QuietComfort Earbuds", buy=2, get=1)])
+        assert engine.evaluate([(earbuds, 2), (earbuds, 5)]).get_total() \
+            == 1250
+
+    def test_tiered_spend_applies_after_item_rules(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        engine = PromotionEngine([
+            TieredSpendRule("Spend more", [(1000, 5), (2000, 10)]),
+            BuyXGetYRule("Buy 1 get 1", "MacBook Air M2", buy=1, get=1)])
+        pricing = engine.evaluate([(macbook, 2)])
+        assert [name for name, _ in pricing.get_discounts()] == \
+            ["Buy 1 get 1", "Spend more"]
+        assert pricing.get_total() == 950
+
+    def test_priority_and_stacking(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        exclusive = BuyXGetYRule("Exclusive", "MacBook Air M2", buy=1, get=1,
+                                 priority=10, stackable=False)
+        stacked = BuyXGetYRule("Stacked", "MacBook Air M2", buy=3, get=1)
+        tiered = TieredSpendRule("Spend more", [(0, 10)])
+        engine = PromotionEngine([stacked, tiered, exclusive])
+        assert engine.get_rules() == [exclusive, stacked, tiered]
+        assert engine.evaluate([(macbook, 4)]).get_discounts() == \
+            [("Exclusive", 2000)]
+        engine.remove_rule(exclusive)
+        assert engine.evaluate([(macbook, 4)]).get_discounts() == \
+            [("Stacked", 1000), ("Spend more", 300)]
+        assert engine.get_rules_for("MacBook Air M2") == [stacked]
+        with pytest.raises(ValueError):
+            engine.add_rule(stacked)
+
+    def test_per_product_promotions_apply_first(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        macbook.set_promotion(promotions.PercentDiscount("50% off!",
+                                                         percent=50))
+        engine = PromotionEngine([TieredSpendRule("Spend more", [(500, 10)])])
+        assert engine.evaluate([(macbook, 1)]).get_total() == 450
+
+    def test_store_checkout_uses_engine(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        setup_data.set_promotion_engine(PromotionEngine([
+            BuyXGetYRule("Buy 1 get 1", "MacBook Air M2", buy=1, get=1)]))
+        assert setup_data.order([(macbook, 2)]) == 1000
+        assert macbook.get_quantity() == 98
+        setup_data.set_promotion_engine(None)
+        assert setup_data.order([(macbook, 2)]) == 2000
+
+    def test_price_orders_uses_engine(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        shipping = setup_data.get_product("Shipping")
+        orders = [[(macbook, 2)], [(macbook, 1), (shipping, 1)], []]
+        setup_data.set_promotion_engine(PromotionEngine([
+            BuyXGetYRule("Buy 1 get 1", "MacBook Air M2", buy=1, get=1)]))
+        assert setup_data.price_orders(orders) == [1000, 1010, 0]
+        assert setup_data.order(orders[0]) == \
+            setup_data.price_orders(orders[:1])[0]
+        assert macbook.get_quantity() == 98
+        setup_data.set_promotion_engine(None)
+        assert setup_data.price_orders(orders) == [2000, 1010, 0]
+
+    def test_invalid_rules(self):
+        with pytest.raises(ValueError):
+            BuyXGetYRule("Invalid", "MacBook Air M2", buy=0, get=1)
+        with pytest.raises(ValueError):
+            BundleRule("Invalid", {}, 10)
+        with pytest.raises(ValueError):
+            TieredSpendRule("Invalid", [(100, 150)])
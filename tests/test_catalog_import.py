@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from catalog_import import import_catalog
+import products
+import promotions
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with one existing product.
+
+    Returns:
+        Store: The store to import into.
+    """
+    yield store.Store([products.Product("MacBook Air M2", price=1450,
+                                        quantity=100)])
+
+
+class TestCATALOGIMPORT:
+    """
+    Test suite for the streaming CSV/JSONL catalog import.
+    """
+
+    def test_import_csv(self, setup_data, tmp_path):
+        path = tmp_path / "catalog.csv"
+        path.write_text(
+            "type,name,price,quantity,maximum,promotion\n"
+            "product,Google Pixel 7,500,250,,\n"
+            "non_stocked,Windows License,125,,,thirty\n"
+            "limited,Shipping,10,250,1,\n"
+            "product,Broken,-5,1,,\n"
+            "limited,No Maximum,10,1,,\n"
+            "product,MacBook Air M2,1450,1,,\n")
+        thirty = promotions.PercentDiscount("30% off!", percent=30)
+
+        report = import_catalog(setup_data, str(path), batch_size=2,
+                                promotions={"thirty": thirty})
+        assert report.get_imported() == 3
+        assert report.get_rejected() == [
+            (5, "Price must be a float"),
+            (6, "Maximum must be a int"),
+            (7, "Product already exists in store")]
+        assert setup_data.get_product("Shipping").get_maximum() == 1
+        assert setup_data.get_product(
+            "Windows License").get_promotion() is thirty
+        assert setup_data.get_total_quantity() == 600
+        assert report.get_rows_per_second() > 0
+
+    def test_import_jsonl(self, setup_data, tmp_path):
+        path = tmp_path / "catalog.jsonl"
+        rows = [{"name": f"SKU-{number}", "price": 9.99, "quantity": number}
+                for number in range(100)]
+        path.write_text("\n".join(json.dumps(row) for row in rows)
+                        + "\nnot json\n")
+
+        report = import_catalog(setup_data, str(path), batch_size=16)
+        assert report.get_imported() == 100
+        assert report.get_rejected() == [(101, "Malformed row")]
+        assert not setup_data.get_product("SKU-0").is_active()
+        assert len(setup_data) == 101
+
+    def test_numbers_are_not_truncated(self, setup_data, tmp_path):
+        path = tmp_path / "catalog.jsonl"
+        rows = [{"name": "Fractional", "price": 1.0, "quantity": 2.7},
+                {"name": "Boolean", "price": 1.0, "quantity": True},
+                {"name": "Limited", "type": "limited", "price": 1.0,
+                 "quantity": 1, "maximum": 1.9},
+                {"name": "Whole Price", "price": 10, "quantity": 3}]
+        path.write_text("\n".join(json.dumps(row) for row in rows))
+        report = import_catalog(setup_data, str(path))
+        assert report.get_rejected() == [(1, "Quantity must be a int"),
+                                         (2, "Quantity must be a int"),
+                                         (3, "Maximum must be a int")]
+        assert setup_data.get_product("Whole Price").get_price() == 10.0
+
+        path = tmp_path / "catalog.csv"
+        path.write_text("name,price,quantity\n"
+                        "Fractional,1.0,2.7\n"
+                        "Blank,1.0,\n")
+        report = import_catalog(setup_data, str(path))
+        assert report.get_rejected() == [(2, "Quantity must be a int")]
+        assert setup_data.get_product("Blank").get_quantity() == 0
+
+    def test_rejected_details_are_bounded(self, setup_data, tmp_path):
+        path = tmp_path / "catalog.jsonl"
+        path.write_text("{}\n" * 50)
+        report = import_catalog(setup_data, str(path), max_rejected=5)
+        assert report.get_rejected_count() == 50
+        assert len(report.get_rejected()) == 5
@@ -0,0 +1,104 @@
+import pytest
+
+import products
+import promotions
+
+np = pytest.importorskip("numpy")
+
+from columnar_store import ColumnarStore  # noqa: E402
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a columnar store with the default catalog.
+
+    Returns:
+        ColumnarStore: A store with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450, quantity=100),
+        products.Product("Bose QuietComfort Earbuds", price=250,
+                         quantity=500),
+        products.NonStockedProduct("Windows License", price=125),
+        products.LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+    ]
+    product_list[0].set_promotion(
+        promotions.SecondHalfPrice("Second Half price!"))
+
+    yield ColumnarStore(product_list, capacity=2)
+
+
+class TestCOLUMNARSTORE:
+    """
+    Test suite for the NumPy backed store and its product row views.
+    """
+
+    def test_views_keep_product_classes(self, setup_data):
+        assert isinstance(setup_data.get_product("Shipping"),
+                          products.LimitedProduct)
+        assert isinstance(setup_data.get_product("Windows License"),
+                          products.NonStockedProduct)
+        assert setup_data.get_product("Shipping").get_maximum() == 1
+
+    def test_total_quantity(self, setup_data):
+        assert setup_data.get_total_quantity() == 850
+
+    def test_order_writes_columns(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        assert setup_data.order([(mac, 6)]) == 6525
+        assert setup_data.get_product("MacBook Air M2").get_quantity() == 94
+        assert setup_data.get_total_quantity() == 844
+
+    def test_active_filter(self, setup_data):
+        setup_data.get_product("Bose QuietComfort Earbuds").set_quantity(0)
+        names = [product.get_name()
+                 for product in setup_data.get_all_products()]
+        assert names == ["MacBook Air M2", "Windows License", "Shipping"]
+
+    def test_scale_prices(self, setup_data):
+        setup_data.scale_prices(2.0, mask=setup_data.active_mask())
+        assert setup_data.get_product("Shipping").get_price() == 20.0
+
+    def test_remove_product(self, setup_data):
+        setup_data.remove_product(setup_data.get_product("Shipping"))
+        assert setup_data.get_product("Shipping") is None
+        assert len(setup_data.get_products()) == 3
+        assert setup_data.get_total_quantity() == 600
+
+    def test_validate_order_aggregates_maximum(self, setup_data):
+        shipping = setup_data.get_product("Shipping")
+        with pytest.raises(ValueError,
+                           match="Error while making order! "
+                                 "The maximum order is 1\n"):
+            setup_data.validate_order([(shipping, 1), (shipping, 1)])
+
+    def test_failed_order_changes_nothing(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        bose = setup_data.get_product("Bose QuietComfort Earbuds")
+        with pytest.raises(ValueError,
+                           match="Quantity larger than what exists"):
+            setup_data.order([(bose, 10), (mac, 60), (mac, 60)])
+        assert setup_data.get_total_quantity() == 850
+        with pytest.raises(ValueError,
+                           match="Product not found in store: Unknown"):
+            setup_data.order([(bose, 10), (products.Product(
+                "Unknown", price=1.0, quantity=1), 1)])
+        with pytest.raises(ValueError, match="Quantity must be a int"):
+            setup_data.order([(bose, 10), (mac, 1.5)])
+        assert setup_data.get_total_quantity() == 850
+
+    def test_order_aggregates_lines(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        windows = setup_data.get_product("Windows License")
+        assert setup_data.order([(mac, 50), (windows, 2), (mac, 50)]) == \
+            2 * 54375 + 250
+        assert mac.get_quantity() == 0
+        assert not mac.is_active()
+        assert setup_data.get_total_quantity() == 750
+
+    def test_validate_order_quantity(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        with pytest.raises(ValueError,
+                           match="Quantity larger than what exists"):
+            setup_data.validate_order([(mac, 101)])
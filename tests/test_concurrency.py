@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+import products
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with several stocked products.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [products.Product(f"Product {number}", price=10.0,
+                                     quantity=1000)
+                    for number in range(8)]
+    yield store.Store(product_list)
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(number,))
+               for number in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+        assert not thread.is_alive()
+
+
+class TestCONCURRENCY:
+    """
+    Stress tests for concurrent checkouts against one shared store.
+    """
+
+    def test_no_oversell_on_one_product(self, setup_data):
+        product = setup_data.get_product("Product 0")
+        sold = []
+
+        def worker(_):
+            for _ in range(250):
+                try:
+                    setup_data.checkout([(product, 1)])
+                except ValueError:
+                    continue
+                sold.append(1)
+
+        run_threads(worker, 8)
+        assert len(sold) == 1000
+        assert product.get_quantity() == 0
+        assert setup_data.get_total_quantity() == 7000
+
+    def test_disjoint_products(self, setup_data):
+        def worker(number):
+            product = setup_data.get_product(f"Product {number}")
+            for _ in range(500):
+                setup_data.checkout([(product, 2)])
+
+        run_threads(worker, 8)
+        assert setup_data.get_total_quantity() == 0
+
+    def test_opposite_lock_order_does_not_deadlock(self, setup_data):
+        first = setup_data.get_product("Product 1")
+        second = setup_data.get_product("Product 2")
+
+        def worker(number):
+            lines = [(first, 1), (second, 1)]
+            if number % 2:
+                lines.reverse()
+            for _ in range(100):
+                setup_data.checkout(lines)
+
+        run_threads(worker, 8)
+        assert first.get_quantity() == 200
+        assert second.get_quantity() == 200
@@ -0,0 +1,149 @@
+import errno
+
+import pytest
+
+import journal
+from main import create_store
+
+
+@pytest.fixture
+def setup_data(tmp_path):
+    """
+    Fixture to set up a journaled store with an initial snapshot.
+
+    Returns:
+        tuple: The store, its journal and the snapshot and journal paths.
+    """
+    snapshot_path = str(tmp_path / "catalog.snap")
+    journal_path = str(tmp_path / "orders.journal")
+    best_buy = create_store()
+    best_buy.save_snapshot(snapshot_path)
+    order_journal = journal.OrderJournal(journal_path)
+    best_buy.set_journal(order_journal)
+    yield best_buy, order_journal, snapshot_path, journal_path
+    order_journal.close()
+
+
+class TestJOURNAL:
+    """
+    Test suite for the write-ahead order journal and crash recovery.
+    """
+
+    def test_checkout_is_journaled(self, setup_data):
+        best_buy, order_journal, _, journal_path = setup_data
+        mac = best_buy.get_product("MacBook Air M2")
+        best_buy.checkout([(mac, 2), (mac, 1)])
+        assert list(journal.read_journal(journal_path)) == \
+            [(1, [("MacBook Air M2", 3)])]
+
+    def test_rejected_order_is_not_journaled(self, setup_data):
+        best_buy, order_journal, _, journal_path = setup_data
+        with pytest.raises(ValueError):
+            best_buy.checkout([(best_buy.get_product("Shipping"), 2)])
+        assert order_journal.get_last_sequence() == 0
+
+    def test_closed_journal_rejects_order_unapplied(self, setup_data):
+        best_buy, order_journal, _, _ = setup_data
+        mac = best_buy.get_product("MacBook Air M2")
+        order_journal.close()
+        with pytest.raises(ValueError, match="Journal is closed"):
+            best_buy.checkout([(mac, 2)])
+        assert mac.get_quantity() == 100
+        assert best_buy.get_total_quantity() == 1100
+
+    def test_write_error_fails_waiters(self, setup_data, monkeypatch):
+        best_buy, _, _, _ = setup_data
+        mac = best_buy.get_product("MacBook Air M2")
+
+        def no_space(descriptor):
+            raise OSError(errno.ENOSPC, "No space left on device")
+        monkeypatch.setattr(journal.os, "fsync", no_space)
+        with pytest.raises(OSError, match="No space left"):
+            best_buy.checkout([(mac, 2)])
+        with pytest.raises(ValueError, match="Journal failed"):
+            best_buy.checkout([(mac, 1)])
+        assert mac.get_quantity() == 98
+
+    def test_recover_after_crash(self, setup_data):
+        best_buy, _, snapshot_path, journal_path = setup_data
+        best_buy.checkout([(best_buy.get_product("MacBook Air M2"), 5)])
+        best_buy.checkout([(best_buy.get_product("Shipping"), 1),
+                           (best_buy.get_product("Windows License"), 4)])
+
+        # Recover without closing the journal, as after a crash
+        recovered, recovered_journal = journal.recover(snapshot_path,
+                                                       journal_path)
+        try:
+            assert recovered.get_product("MacBook Air M2").get_quantity() == 95
+            assert recovered.get_product("Shipping").get_quantity() == 249
+            assert recovered.get_total_quantity() == \
+                best_buy.get_total_quantity()
+            assert recovered_journal.get_last_sequence() == 2
+        finally:
+            recovered_journal.close()
+
+    def test_bulk_restock_is_replayed(self, setup_data):
+        best_buy, _, snapshot_path, journal_path = setup_data
+        mac = best_buy.get_product("MacBook Air M2")
+        best_buy.bulk_update({"MacBook Air M2": {"quantity": 0}})
+        best_buy.bulk_update({"MacBook Air M2": {"quantity": 10},
+                              "Shipping": {"price": 12.0}})
+        best_buy.checkout([(mac, 5)])
+        assert list(journal.read_journal(journal_path))[1] == \
+            (2, {"set": [("MacBook Air M2", 10)]})
+
+        recovered, recovered_journal = journal.recover(snapshot_path,
+                                                       journal_path)
+        try:
+            assert recovered.get_product("MacBook Air M2").get_quantity() == 5
+            assert recovered_journal.get_last_sequence() == 3
+        finally:
+            recovered_journal.close()
+
+    def test_replay_past_stock_names_record(self, setup_data):
+        best_buy, order_journal, _, journal_path = setup_data
+        mac = best_buy.get_product("MacBook Air M2")
+        best_buy.checkout([(mac, 60)])
+        best_buy.checkout([(mac, 30)])
+        order_journal.close()
+        snapshot = create_store()
+        snapshot.get_product("MacBook Air M2").set_quantity(80)
+        with pytest.raises(ValueError, match="record 2 takes 30 of "
+                                             "'MacBook Air M2', but only 20"):
+            journal.replay(snapshot, journal_path)
+
+    def test_compaction(self, setup_data):
+        best_buy, order_journal, snapshot_path, journal_path = setup_data
+        best_buy.checkout([(best_buy.get_product("MacBook Air M2"), 5)])
+        journal.compact(best_buy, order_journal, snapshot_path)
+        assert list(journal.read_journal(journal_path)) == []
+        best_buy.checkout([(best_buy.get_product("MacBook Air M2"), 1)])
+
+        recovered, recovered_journal = journal.recover(snapshot_path,
+                                                       journal_path)
+        try:
+            assert recovered.get_product("MacBook Air M2").get_quantity() == 94
+            assert recovered_journal.get_last_sequence() == 2
+        finally:
+            recovered_journal.close()
+
+    def test_torn_tail_is_ignored(self, setup_data):
+        best_buy, order_journal, _, journal_path = setup_data
+        best_buy.checkout([(best_buy.get_product("MacBook Air M2"), 1)])
+        with open(journal_path, "ab") as file:
+            file.write(b"\x10\x00\x00")
+        assert len(list(journal.read_journal(journal_path))) == 1
+
+    def test_reopen_cuts_torn_tail(self, setup_data):
+        best_buy, order_journal, _, journal_path = setup_data
+        best_buy.checkout([(best_buy.get_product("MacBook Air M2"), 1)])
+        order_journal.close()
+        with open(journal_path, "ab") as file:
+            file.write(b"\x10\x00\x00")
+
+        reopened = journal.OrderJournal(journal_path)
+        best_buy.set_journal(reopened)
+        best_buy.checkout([(best_buy.get_product("MacBook Air M2"), 1)])
+        reopened.close()
+        assert [sequence for sequence, _ in
+                journal.read_journal(journal_path)] == [1, 2]
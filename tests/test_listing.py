@@ -0,0 +1,91 @@
+import pytest
+
+import products
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with twenty numbered products.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [products.Product(f"SKU-{number:02d}",
+                                     price=float(number % 7), quantity=5)
+                    for number in range(20)]
+    product_list.append(products.Product("Bose QuietComfort Earbuds",
+                                         price=250, quantity=500))
+    yield store.Store(product_list)
+
+
+def all_pages(best_buy, **query) -> list[list[str]]:
+    """
+    Follows the cursors of a listing until the last page.
+
+    Returns:
+        list[list[str]]: The product names of every page.
+    """
+    pages, cursor = [], None
+    while True:
+        page, cursor = best_buy.list_products(cursor=cursor, **query)
+        pages.append([product.get_name() for product in page])
+        if cursor is None:
+            return pages
+
+
+class TestLISTING:
+    """
+    Test suite for the paginated, sorted and filtered product listing.
+    """
+
+    def test_name_pages(self, setup_data):
+        pages = all_pages(setup_data, prefix="SKU-", limit=8)
+        assert [len(page) for page in pages] == [8, 8, 4]
+        assert sum(pages, []) == [f"SKU-{number:02d}" for number in range(20)]
+        descending = all_pages(setup_data, prefix="SKU-1", limit=4,
+                               descending=True)
+        assert sum(descending, []) == [f"SKU-{number}"
+                                       for number in range(19, 9, -1)]
+
+    def test_price_range(self, setup_data):
+        pages = all_pages(setup_data, sort_by="price", min_price=2,
+                          max_price=3, limit=3)
+        names = sum(pages, [])
+        assert names == ["SKU-02", "SKU-09", "SKU-16",
+                         "SKU-03", "SKU-10", "SKU-17"]
+        page, _ = setup_data.list_products(sort_by="price", descending=True,
+                                           limit=1)
+        assert page[0].get_name() == "Bose QuietComfort Earbuds"
+        page, _ = setup_data.list_products(min_price=100, limit=5)
+        assert [product.get_name() for product in page] == \
+            ["Bose QuietComfort Earbuds"]
+
+    def test_indexes_follow_changes(self, setup_data):
+        assert setup_data.list_products(prefix="SKU-00")[0]
+        sku = setup_data.get_product("SKU-00")
+        sku.set_price(99.0)
+        sku.set_name("Apple Watch")
+        setup_data.get_product("SKU-01").set_quantity(0)
+        setup_data.remove_product(setup_data.get_product("SKU-02"))
+        setup_data.add_product(products.Product("SKU-99", price=1.5,
+                                                quantity=1))
+
+        page, _ = setup_data.list_products(sort_by="price", max_price=2,
+                                           limit=10)
+        assert [product.get_name() for product in page] == \
+            ["SKU-07", "SKU-14", "SKU-08", "SKU-15", "SKU-99", "SKU-09",
+             "SKU-16"]
+        page, _ = setup_data.list_products(limit=1)
+        assert page == [sku]
+        setup_data.get_product("SKU-01").set_quantity(3)
+        setup_data.get_product("SKU-01").activate()
+        assert setup_data.list_products(prefix="SKU-01")[0][0].get_name() == \
+            "SKU-01"
+
+    def test_invalid_queries(self, setup_data):
+        with pytest.raises(ValueError):
+            setup_data.list_products(sort_by="quantity")
+        with pytest.raises(ValueError):
+            setup_data.list_products(limit=0)
@@ -38,7 +38,8 @@ class TestMagicMethods:
         assert setup_data.get_products()[0] > setup_data.get_products()[1]
 
     def test_less_than_product(self, setup_data):
-        assert setup_data.get_products()[0] < setup_data.get_products()[1]
+        assert setup_data.get_products()[1] < setup_data.get_products()[0]
+        assert not setup_data.get_products()[0] < setup_data.get_products()[1]
 
     def test_in_store(self, setup_data):
         assert setup_data.get_products()[0] in setup_data.get_products()
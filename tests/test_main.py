@@ -0,0 +1,105 @@
+import io
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture providing a fresh store.
+
+    Returns:
+        Store: The store of the application.
+    """
+    return main.create_store()
+
+
+class TestMAIN:
+    """
+    Test suite for the menu loop and the batch mode.
+    """
+
+    def test_loop_does_not_recurse(self, setup_data, monkeypatch, capsys):
+        """
+        Thousands of menu choices run in a flat loop without hitting the
+        recursion limit.
+        """
+        answers = iter(["2"] * 5000 + ["4"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+        main.start(setup_data)
+        assert capsys.readouterr().out.count("items in store") == 5000
+
+    def test_loop_quits_on_closed_stdin(self, setup_data, monkeypatch):
+        """
+        End of input ends the loop.
+        """
+        def closed(prompt=""):
+            raise EOFError
+        monkeypatch.setattr("builtins.input", closed)
+        main.start(setup_data)
+
+    def test_order_ends_on_closed_stdin(self, setup_data, monkeypatch,
+                                        capsys):
+        """
+        End of input in the middle of an order finishes the order and the
+        loop, as with printf '3\\n1\\n' | python main.py.
+        """
+        answers = iter(["3", "1", "2"])
+
+        def scripted(prompt=""):
+            try:
+                return next(answers)
+            except StopIteration:
+                raise EOFError from None
+        monkeypatch.setattr("builtins.input", scripted)
+        main.start(setup_data)
+        assert "Product added to list!" in capsys.readouterr().out
+        assert setup_data.get_product("MacBook Air M2").get_quantity() == 98
+
+    def test_batch_orders(self, setup_data, capsys):
+        """
+        Batch orders check out and report their total.
+        """
+        script = io.StringIO("# comment\n\n"
+                             "order Google Pixel 7=2, Shipping=1\n"
+                             "3 Google Pixel 7=1\n"
+                             "total\n")
+        assert main.run_batch(setup_data, script) == 0
+        assert setup_data.get_product("Google Pixel 7").get_quantity() == 247
+        output = capsys.readouterr().out
+        assert "Order made! Total payment: $1010.0" in output
+        assert "Total of 1096 items in store" in output
+
+    def test_batch_errors(self, setup_data, capsys):
+        """
+        Unknown commands and invalid orders are reported and counted, and a
+        failed order changes no stock.
+        """
+        script = io.StringIO("order Unknown=1\n"
+                             "order Google Pixel 7=x\n"
+                             "order Google Pixel 7=1, Shipping=2\n"
+                             "dance\n")
+        assert main.run_batch(setup_data, script) == 4
+        assert setup_data.get_product("Google Pixel 7").get_quantity() == 250
+        output = capsys.readouterr().out
+        assert "line 1: Error adding product! Unknown=1" in output
+        assert "line 4: Unknown command: dance" in output
+
+    def test_batch_quit_stops(self, setup_data):
+        """
+        Quit ends the script.
+        """
+        script = io.StringIO("quit\norder Unknown=1\n")
+        assert main.run_batch(setup_data, script) == 0
+
+    def test_main_batch_file(self, tmp_path, capsys):
+        """
+        main runs a script file and returns a failing status on errors.
+        """
+        path = tmp_path / "script.txt"
+        path.write_text("list\n")
+        assert main.main(["--batch", str(path)]) == 0
+        path.write_text("order Unknown=1\n")
+        assert main.main(["--batch", str(path)]) == 1
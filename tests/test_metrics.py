@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import metrics
+import pricing
+import products
+import promotions
+import store
+import util
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store and enable the instrumentation for one test.
+
+    Returns:
+        tuple[Store, MetricsRegistry]: The store and the metrics registry.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450, quantity=100),
+        products.LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+    ]
+    product_list[0].set_promotion(promotions.PercentDiscount("30% off!",
+                                                             percent=30))
+    registry = metrics.enable()
+    yield store.Store(product_list), registry
+    metrics.disable()
+
+
+class TestMETRICS:
+    """
+    Test suite for the opt-in hot path instrumentation.
+    """
+
+    def test_records_calls_and_errors(self, setup_data):
+        best_buy, registry = setup_data
+        macbook = best_buy.get_product("MacBook Air M2")
+        shipping = best_buy.get_product("Shipping")
+        best_buy.order([(macbook, 1)])
+        with pytest.raises(ValueError):
+            best_buy.order([(shipping, 2)])
+        with pytest.raises(ValueError):
+            best_buy.validate_order([(macbook, 1000)])
+        macbook.buy(1)
+
+        summary = registry.to_dict()
+        assert summary["store_order"]["Store"]["count"] == 2
+        assert summary["store_order"]["Store"]["errors"] == \
+            {"MaximumExceededError": 1}
+        assert summary["store_validate_order"]["Store"]["errors"] == \
+            {"QuantityExceededError": 1}
+        assert summary["product_buy"]["Product"]["count"] == 1
+        assert summary["promotion_apply_promotion"]["PercentDiscount"][
+            "count"] >= 2
+        assert "Promotion" not in summary["promotion_apply_promotion"]
+        assert json.loads(registry.to_json()) == summary
+
+    def test_prometheus_dump(self, setup_data):
+        best_buy, registry = setup_data
+        with pytest.raises(ValueError):
+            best_buy.order([(best_buy.get_product("Shipping"), 2)])
+        text = registry.to_prometheus()
+        assert "# TYPE bestbuy_store_order_seconds histogram" in text
+        assert 'bestbuy_store_order_seconds_bucket{class="Store",le="+Inf"} 1' \
+            in text
+        assert 'bestbuy_store_order_seconds_count{class="Store"} 1' in text
+        assert ('bestbuy_store_order_errors_total{class="Store",'
+                'error="MaximumExceededError"} 1') in text
+
+    def test_records_cli_orders(self, setup_data, capsys):
+        best_buy, registry = setup_data
+        macbook = best_buy.get_product("MacBook Air M2")
+        shipping = best_buy.get_product("Shipping")
+        util.validate_order_util(best_buy, [(macbook, 2), (shipping, 1)])
+        util.validate_order_util(best_buy, [(shipping, 2)])
+        assert "Order made!" in capsys.readouterr().out
+
+        summary = registry.to_dict()
+        assert summary["store_checkout"]["Store"]["count"] == 2
+        assert summary["store_checkout"]["Store"]["errors"] == \
+            {"MaximumExceededError": 1}
+        assert summary["pricing_price_line"]["pricing"]["count"] == 3
+        assert summary["promotion_apply_promotion"]["PercentDiscount"][
+            "count"] == 1
+
+    def test_disable_restores_methods(self, setup_data):
+        assert hasattr(store.Store.order, "__wrapped__")
+        with pytest.raises(ValueError):
+            metrics.enable()
+        metrics.disable()
+        assert metrics.get_registry() is None
+        assert not hasattr(store.Store.order, "__wrapped__")
+        assert not hasattr(products.Product.buy, "__wrapped__")
+        assert not hasattr(pricing.price_line, "__wrapped__")
+        assert not hasattr(promotions.SecondHalfPrice.apply_promotion,
+                           "__wrapped__")
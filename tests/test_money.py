@@ -0,0 +1,67 @@
+import pytest
+
+import products
+import promotions
+import store
+from money import to_cents, format_cents
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with cent-priced products.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("Cable", price=0.1, quantity=1000),
+        products.Product("Earbuds", price=19.99, quantity=1000),
+        products.NonStockedProduct("Windows License", price=125),
+    ]
+    yield store.Store(product_list)
+
+
+class TestMONEY:
+    """
+    Test suite for the integer-cents money mode.
+    """
+
+    def test_to_cents(self):
+        assert to_cents(1.005) == 101
+        assert to_cents(0.1) == 10
+        assert to_cents(1450) == 145000
+        assert format_cents(145005) == "1450.05"
+        assert format_cents(-5) == "-0.05"
+        with pytest.raises(ValueError):
+            to_cents(float("nan"))
+
+    def test_order_cents_is_exact(self, setup_data):
+        cable = setup_data.get_product("Cable")
+        shopping_list = [(cable, 1)] * 10
+        assert setup_data.order(shopping_list) != 1.0
+        assert setup_data.order_cents(shopping_list) == 100
+        assert cable.get_quantity() == 980
+
+    def test_promotions_in_cents(self, setup_data):
+        earbuds = setup_data.get_product("Earbuds")
+        earbuds.set_promotion(promotions.SecondHalfPrice("Second Half price!"))
+        assert setup_data.order_cents([(earbuds, 3)]) == 1999 * 2 + 1000
+        earbuds.set_promotion(promotions.ThirdOneFree("Third One Free!"))
+        assert setup_data.order_cents([(earbuds, 3)]) == 3998
+        earbuds.set_promotion(promotions.PercentDiscount("15% off",
+                                                         percent=15))
+        assert setup_data.order_cents([(earbuds, 1)]) == 1699
+        assert setup_data.order_cents([(earbuds, 1),
+                                       (setup_data.get_product(
+                                           "Windows License"), 1)]) == 14199
+
+    def test_price_cents_follow_price(self, setup_data):
+        cable = setup_data.get_product("Cable")
+        assert cable.get_price_cents() == 10
+        cable.set_price(0.25)
+        assert cable.get_price_cents() == 25
+        cable.set_price_cents(199)
+        assert cable.get_price() == 1.99
+        with pytest.raises(ValueError):
+            cable.set_price_cents(1.5)
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from latency import LatencyHistogram
+from main import create_store
+from order_replay import replay_orders
+
+
+@pytest.fixture
+def order_log(tmp_path):
+    """
+    Fixture writing a small order log.
+
+    Returns:
+        str: The path of the log.
+    """
+    orders = ([[["Google Pixel 7", 10]]] * 30
+              + [{"items": [["Shipping", 1], ["Shipping", 1]]}]
+              + [[["Unknown", 1]]]
+              + [[["MacBook Air M2", 1], ["Windows License", 2]]])
+    path = tmp_path / "orders.jsonl"
+    path.write_text("\n".join(json.dumps(order) for order in orders)
+                    + "\n{broken\n")
+    return str(path)
+
+
+class TestORDERREPLAY:
+    """
+    Test suite for the streaming order replay engine.
+    """
+
+    @pytest.mark.parametrize("mode, threads", [("checkout", 1),
+                                               ("validate", 1),
+                                               ("checkout", 4)])
+    def test_replay(self, order_log, mode, threads):
+        best_buy = create_store()
+        report = replay_orders(best_buy, order_log, mode, threads)
+        assert report.get_order_count() == 34
+        assert report.get_accepted() == 26
+        assert report.get_rejected() == {"quantity_exceeded": 5,
+                                         "maximum_exceeded": 1,
+                                         "unknown_product": 1,
+                                         "invalid": 1}
+        assert best_buy.get_product("Google Pixel 7").get_quantity() == 0
+        assert report.get_throughput() > 0
+        assert report.get_latency_percentile(50) <= \
+            report.get_latency_percentile(99)
+        assert "34 orders" in report.summary()
+
+    @pytest.mark.parametrize("mode, threads", [("validate", 1),
+                                               ("checkout", 4)])
+    def test_non_int_quantities_are_invalid(self, tmp_path, mode, threads):
+        path = tmp_path / "orders.jsonl"
+        path.write_text('[["Shipping", "1"]]\n[["Shipping", 1.0]]\n'
+                        '[["Shipping", true]]\n[["Shipping", 1]]\n')
+        best_buy = create_store()
+        report = replay_orders(best_buy, str(path), mode, threads)
+        assert report.get_accepted() == 1
+        assert report.get_rejected() == {"invalid": 3}
+        assert best_buy.get_product("Shipping").get_quantity() == 249
+
+    @pytest.mark.parametrize("threads", [1, 4])
+    def test_unexpected_errors_are_recorded(self, order_log, threads,
+                                            monkeypatch):
+        best_buy = create_store()
+
+        def broken(shopping_list):
+            raise RuntimeError("store is down")
+        monkeypatch.setattr(best_buy, "checkout", broken)
+        report = replay_orders(best_buy, order_log, "checkout", threads)
+        assert report.get_order_count() == 34
+        assert report.get_rejected() == {"error": 32, "unknown_product": 1,
+                                         "invalid": 1}
+        assert report.get_errors()[0] == "RuntimeError: store is down"
+        assert len(report.get_errors()) == 10
+        assert "error: RuntimeError: store is down" in report.summary()
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for microseconds in range(1, 1001):
+            histogram.record(microseconds / 1e6)
+        assert histogram.get_count() == 1000
+        assert histogram.percentile(50) == pytest.approx(500e-6, rel=0.05)
+        assert histogram.percentile(99) == pytest.approx(990e-6, rel=0.05)
+        assert histogram.percentile(100) == histogram.get_maximum()
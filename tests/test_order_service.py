@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+from main import create_store
+from order_service import OrderService
+
+
+async def request(port, *messages):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    responses = []
+    for message in messages:
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        responses.append(json.loads(await reader.readline()))
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+def run_with_service(best_buy, client):
+    async def scenario():
+        service = OrderService(best_buy)
+        port = await service.start()
+        try:
+            return await client(port), service.get_latency_stats()
+        finally:
+            await service.close()
+
+    return asyncio.run(scenario())
+
+
+class TestORDERSERVICE:
+    """
+    Test suite for the asyncio order service.
+    """
+
+    def test_list_and_total(self):
+        (listing, total), stats = run_with_service(
+            create_store(),
+            lambda port: request(port, {"op": "list"}, {"op": "total"}))
+        assert [item["name"] for item in listing["result"]][0] == \
+            "MacBook Air M2"
+        assert total["result"] == 1100
+        assert stats["list"]["count"] == 1
+        assert listing["latency_ms"] >= 0
+
+    def test_concurrent_orders(self):
+        best_buy = create_store()
+
+        async def clients(port):
+            order = {"op": "order", "items": [["Google Pixel 7", 1]]}
+            return await asyncio.gather(*(request(port, order)
+                                          for _ in range(50)))
+
+        responses, stats = run_with_service(best_buy, clients)
+        assert all(response["ok"] for [response] in responses)
+        assert best_buy.get_product("Google Pixel 7").get_quantity() == 200
+        assert stats["order"]["count"] == 50
+
+    def test_rejected_order(self):
+        [response], _ = run_with_service(
+            create_store(),
+            lambda port: request(port, {"op": "order",
+                                        "items": [["Shipping", 2]]}))
+        assert not response["ok"]
+        assert response["error"] == \
+            "Error while making order! The maximum order is 1"
+
+    def test_unknown_operation(self):
+        [response], _ = run_with_service(
+            create_store(), lambda port: request(port, {"op": "refund"}))
+        assert response == {"ok": False,
+                            "error": "Unknown operation: refund",
+                            "latency_ms": response["latency_ms"]}
+
+    def test_request_not_an_object(self):
+        responses, stats = run_with_service(
+            create_store(),
+            lambda port: request(port, [1], "order", {"op": "total"}))
+        assert [response["ok"] for response in responses] == \
+            [False, False, True]
+        assert responses[0]["error"] == "Request must be a JSON object"
+        assert stats["invalid"]["count"] == 2
+        assert stats["total"]["count"] == 1
+        assert stats["total"]["max_ms"] >= stats["total"]["mean_ms"] > 0
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+import pricing
+import products
+import promotions
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with one product per promotion type.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450.99, quantity=10 ** 9),
+        products.Product("Bose QuietComfort Earbuds", price=250,
+                         quantity=10 ** 9),
+        products.Product("Google Pixel 7", price=499.95, quantity=10 ** 9),
+        products.NonStockedProduct("Windows License", price=125.1),
+        products.LimitedProduct("Shipping", price=9.99, quantity=10 ** 9,
+                                maximum=10 ** 9)
+    ]
+    product_list[0].set_promotion(
+        promotions.SecondHalfPrice("Second Half price!"))
+    product_list[1].set_promotion(promotions.ThirdOneFree("Third One Free!"))
+    product_list[3].set_promotion(
+        promotions.PercentDiscount("30% off!", percent=30))
+    product_list[4].set_promotion(
+        promotions.PercentDiscount("17% off!", percent=17))
+
+    yield store.Store(product_list)
+
+
+def random_orders(best_buy, count):
+    rng = random.Random(42)
+    catalog = best_buy.get_products()
+    return [[(rng.choice(catalog), rng.randint(1, 50))
+             for _ in range(rng.randint(0, 8))]
+            for _ in range(count)]
+
+
+class TestPRICING:
+    """
+    Test suite for batch order pricing against the scalar order path.
+    """
+
+    def test_matches_order_exactly(self, setup_data):
+        orders = random_orders(setup_data, 500)
+        batch_totals = setup_data.price_orders(orders)
+        scalar_totals = [setup_data.order(order) for order in orders]
+        assert batch_totals == scalar_totals
+
+    def test_does_not_change_stock(self, setup_data):
+        before = setup_data.get_total_quantity()
+        setup_data.price_orders(random_orders(setup_data, 50))
+        assert setup_data.get_total_quantity() == before
+
+    def test_scalar_fallback(self, setup_data, monkeypatch):
+        orders = random_orders(setup_data, 100)
+        batch_totals = setup_data.price_orders(orders)
+        monkeypatch.setattr(pricing, "np", None)
+        assert setup_data.price_orders(orders) == batch_totals
+
+    def test_empty_orders(self, setup_data):
+        assert setup_data.price_orders([[], []]) == [0.0, 0.0]
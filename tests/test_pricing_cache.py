@@ -0,0 +1,62 @@
+import pytest
+
+import products
+import promotions
+from pricing_cache import PRICING_CACHE, PricingCache
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture enabling the shared pricing cache for one test.
+
+    Returns:
+        Product: A product with a 30% discount.
+    """
+    product = products.Product("MacBook Air M2", price=1000, quantity=100)
+    product.set_promotion(promotions.PercentDiscount("30% off!", percent=30))
+    PRICING_CACHE.set_maxsize(16)
+    yield product
+    PRICING_CACHE.set_maxsize(0)
+
+
+class TestPRICINGCACHE:
+    """
+    Test suite for the LRU cache of promoted line prices.
+    """
+
+    def test_hits_repeated_lines(self, setup_data):
+        assert setup_data.buy(2) == 1400
+        assert setup_data.buy(2) == 1400
+        stats = PRICING_CACHE.get_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_invalidated_by_changed_inputs(self, setup_data):
+        assert setup_data.buy(2) == 1400
+        setup_data.set_price(500.0)
+        assert setup_data.buy(2) == 700
+        setup_data.get_promotion().set_percent(50)
+        assert PRICING_CACHE.get_stats()["size"] == 0
+        assert setup_data.buy(2) == 500
+        setup_data.set_promotion(promotions.ThirdOneFree("Third One Free!"))
+        assert setup_data.buy(3) == 1000
+        assert PRICING_CACHE.get_stats()["hits"] == 0
+
+    def test_lru_eviction(self):
+        cache = PricingCache(2)
+        product = products.Product("Shipping", price=10, quantity=100)
+        promotion = promotions.SecondHalfPrice("Second Half price!")
+        for quantity in (1, 2, 3, 1):
+            cache.apply(promotion, product, quantity)
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (0, 4, 2)
+
+    def test_disabled_by_default(self):
+        cache = PricingCache()
+        product = products.Product("Shipping", price=10, quantity=100)
+        promotion = promotions.SecondHalfPrice("Second Half price!")
+        assert cache.apply(promotion, product, 2) == 15
+        assert cache.get_stats()["misses"] == 0
+        with pytest.raises(ValueError):
+            cache.set_maxsize(-1)
@@ -1,3 +1,6 @@
+import gc
+import weakref
+
 import pytest
 
 import products
@@ -215,6 +218,37 @@ class TestPRODUCT:
         total_cost = setup_data.order([(setup_data.get_products()[3], 5)])
         assert total_cost == 437.5
 
+    def test_products_and_promotions_are_slotted(self, setup_data):
+        """
+        Test that products and promotions carry no per-instance __dict__
+        and that subclasses do not duplicate the Product attributes.
 
+        Parameter:
+            setup_data (Store): The store instance with products.
+        """
+        for product in setup_data.get_products():
+            assert not hasattr(product, "__dict__")
+            assert not hasattr(product.get_promotion(), "__dict__")
+        shipping = setup_data.get_products()[4]
+        assert not hasattr(shipping, "_LimitedProduct__name")
+        assert shipping.get_name() == "Shipping"
 
+    def test_discarded_store_is_collected(self, setup_data):
+        """
+        Test that products do not keep a discarded store alive and keep
+        working without it.
 
+        Parameter:
+            setup_data (Store): The store instance with products.
+        """
+        product_list = setup_data.get_products()
+        other_store = store.Store([products.Product("Google Pixel 8",
+                                                    price=700, quantity=5)])
+        pixel = other_store.get_products()[0]
+        reference = weakref.ref(other_store)
+        del other_store
+        gc.collect()
+        assert reference() is None
+        pixel.set_quantity(4)
+        product_list[0].set_quantity(10)
+        assert setup_data.get_total_quantity() == 1010
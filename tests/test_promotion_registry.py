@@ -0,0 +1,114 @@
+import pytest
+
+import products
+import promotions
+import store
+from promotion_registry import PROMOTION_REGISTRY, PromotionRegistry
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a registry with SKU, category and global promotions.
+
+    Returns:
+        tuple[PromotionRegistry, dict[str, Promotion]]: The registry and its
+                                                        promotions by name.
+    """
+    registry = PromotionRegistry()
+    scoped = {
+        "sku": promotions.PercentDiscount("SKU 10% off", percent=10),
+        "category": promotions.PercentDiscount("Laptops 20% off", percent=20),
+        "global": promotions.ThirdOneFree("Third One Free!"),
+        "weekend": promotions.SecondHalfPrice("Weekend deal"),
+    }
+    registry.add(scoped["sku"], skus=["MacBook Air M2"], priority=1)
+    registry.add(scoped["category"], categories=["laptops"])
+    registry.add(scoped["global"], priority=-1)
+    registry.add(scoped["weekend"], categories=["laptops"], start=100,
+                 end=200, priority=5)
+    yield registry, scoped
+
+
+class TestPROMOTIONREGISTRY:
+    """
+    Test suite for the indexed promotion registry.
+    """
+
+    def test_scopes_and_priorities(self, setup_data):
+        registry, scoped = setup_data
+        macbook = products.Product("MacBook Air M2", price=1000, quantity=10)
+        macbook.set_category("laptops")
+        assert registry.get_promotions(macbook, at=0) == \
+            [scoped["sku"], scoped["category"], scoped["global"]]
+        assert registry.get_promotion(macbook, at=150) is scoped["weekend"]
+        assert registry.get_promotion(macbook, at=200) is scoped["sku"]
+
+        earbuds = products.Product("Earbuds", price=250, quantity=10)
+        assert registry.get_promotions(earbuds, at=150) == [scoped["global"]]
+
+    def test_remove(self, setup_data):
+        registry, scoped = setup_data
+        entry_id = registry.add(scoped["sku"], skus=["Earbuds", "Earbuds"],
+                                priority=3)
+        earbuds = products.Product("Earbuds", price=250, quantity=10)
+        assert registry.get_promotion(earbuds, at=0) is scoped["sku"]
+        registry.remove(entry_id)
+        assert registry.get_promotion(earbuds, at=0) is scoped["global"]
+        assert len(registry) == 4
+        with pytest.raises(ValueError):
+            registry.remove(entry_id)
+
+    def test_invalid_entries(self, setup_data):
+        registry, scoped = setup_data
+        with pytest.raises(ValueError):
+            registry.add(scoped["sku"], start=10, end=10)
+        with pytest.raises(ValueError):
+            registry.add("10% off")
+
+    def test_buy_and_order_consult_registry(self):
+        macbook = products.Product("MacBook Air M2", price=1000, quantity=10)
+        macbook.set_category("laptops")
+        best_buy = store.Store([macbook])
+        entry_id = PROMOTION_REGISTRY.add(
+            promotions.PercentDiscount("Laptops 50% off", percent=50),
+            categories=["laptops"])
+        try:
+            assert macbook.buy(1) == 500
+            assert best_buy.order([(macbook, 2)]) == 1000
+            macbook.set_promotion(promotions.ThirdOneFree("Third One Free!"))
+            assert best_buy.order([(macbook, 3)]) == 2000
+        finally:
+            PROMOTION_REGISTRY.remove(entry_id)
+        assert macbook.get_promotion().get_name() == "Third One Free!"
+
+    def test_category_validation(self):
+        product = products.Product("MacBook Air M2", price=1000, quantity=10)
+        assert product.get_category() is None
+        with pytest.raises(ValueError):
+            product.set_category("  ")
+
+    def test_many_overlapping_category_windows(self):
+        registry = PromotionRegistry()
+        laptop = products.Product("MacBook Air M2", price=1000, quantity=10)
+        laptop.set_category("laptops")
+        windows = {}
+        for number in range(300):
+            promotion = promotions.PercentDiscount(f"{number}% off",
+                                                   percent=number % 100)
+            start, end = number * 2, number * 2 + 150 + number % 40
+            priority = number % 7
+            windows[promotion] = (start, end, priority,
+                                  registry.add(promotion,
+                                               categories=["laptops"],
+                                               start=start, end=end,
+                                               priority=priority))
+        for moment in range(-1, 800, 7):
+            expected = sorted(
+                (promotion for promotion, (start, end, _, _)
+                 in windows.items() if start <= moment < end),
+                key=lambda promotion: (-windows[promotion][2],
+                                       windows[promotion][3]))
+            assert registry.get_promotions(laptop, at=moment) == expected
+            assert registry.get_promotion(laptop, at=moment) is \
+                (expected[0] if expected else None)
@@ -0,0 +1,63 @@
+import pytest
+
+import products
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with products of distinct prices and stock.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450, quantity=100),
+        products.Product("Bose QuietComfort Earbuds", price=250, quantity=3),
+        products.Product("Google Pixel 7", price=500, quantity=250),
+        products.NonStockedProduct("Windows License", price=125),
+        products.LimitedProduct("Shipping", price=10, quantity=8, maximum=1)
+    ]
+    yield store.Store(product_list)
+
+
+def names(product_list) -> list[str]:
+    """Returns the names of the products."""
+    return [product.get_name() for product in product_list]
+
+
+class TestQUERIES:
+    """
+    Test suite for the top-K, price band and low-stock queries.
+    """
+
+    def test_top_k(self, setup_data):
+        assert names(setup_data.get_cheapest(2)) == ["Shipping",
+                                                     "Windows License"]
+        assert names(setup_data.get_most_expensive(2)) == \
+            ["MacBook Air M2", "Google Pixel 7"]
+        assert setup_data.get_cheapest(10) == \
+            sorted(setup_data.get_all_products())
+
+    def test_price_band(self, setup_data):
+        assert names(setup_data.get_products_in_price_band(125, 500)) == \
+            ["Windows License", "Bose QuietComfort Earbuds", "Google Pixel 7"]
+        setup_data.get_product("Google Pixel 7").set_price(501.0)
+        assert names(setup_data.get_products_in_price_band(125, 500)) == \
+            ["Windows License", "Bose QuietComfort Earbuds"]
+
+    def test_low_stock(self, setup_data):
+        with pytest.raises(ValueError):
+            setup_data.get_low_stock()
+        setup_data.set_low_stock_threshold(10)
+        assert names(setup_data.get_low_stock()) == \
+            ["Bose QuietComfort Earbuds", "Shipping"]
+        earbuds = setup_data.get_product("Bose QuietComfort Earbuds")
+        setup_data.order([(earbuds, 3)])
+        setup_data.order([(setup_data.get_product("Google Pixel 7"), 245)])
+        assert names(setup_data.get_low_stock(2)) == \
+            ["Bose QuietComfort Earbuds", "Google Pixel 7"]
+        setup_data.get_product("Shipping").set_quantity(50)
+        setup_data.remove_product(earbuds)
+        assert names(setup_data.get_low_stock()) == ["Google Pixel 7"]
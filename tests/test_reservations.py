@@ -0,0 +1,83 @@
+import pytest
+
+import products
+import store
+from reservations import ReservationBook
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with a small catalog of products.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450, quantity=10),
+        products.NonStockedProduct("Windows License", price=125),
+        products.LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+    ]
+    yield store.Store(product_list)
+
+
+class TestRESERVATIONS:
+    """
+    Test suite for cart reservations with TTL expiry.
+    """
+
+    def test_reserved_stock_is_unavailable(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        setup_data.reserve("cart-1", macbook, 6)
+        assert setup_data.get_available_quantity(macbook) == 4
+        with pytest.raises(store.QuantityExceededError):
+            setup_data.reserve("cart-2", macbook, 5)
+        with pytest.raises(store.QuantityExceededError):
+            setup_data.order([(macbook, 5)])
+        with pytest.raises(store.QuantityExceededError):
+            setup_data.validate_order([(macbook, 5)])
+        assert setup_data.order([(macbook, 4)]) == 5800
+        assert macbook.get_quantity() == 6
+
+    def test_checkout_cart_sells_reservations(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        windows = setup_data.get_product("Windows License")
+        setup_data.reserve("cart-1", macbook, 8)
+        setup_data.reserve("cart-1", windows, 2)
+        setup_data.reserve("cart-1", macbook, 2)
+        assert setup_data.checkout_cart("cart-1") == 14750
+        assert macbook.get_quantity() == 0
+        assert setup_data.get_reservations().get_reserved(macbook) == 0
+        with pytest.raises(ValueError):
+            setup_data.checkout_cart("cart-1")
+
+    def test_maximum_counts_the_whole_cart(self, setup_data):
+        shipping = setup_data.get_product("Shipping")
+        setup_data.reserve("cart-1", shipping, 1)
+        setup_data.reserve("cart-2", shipping, 1)
+        with pytest.raises(store.MaximumExceededError):
+            setup_data.reserve("cart-1", shipping, 1)
+
+    def test_release_and_expiry(self, setup_data):
+        macbook = setup_data.get_product("MacBook Air M2")
+        setup_data.reserve("cart-1", macbook, 5)
+        assert setup_data.release_cart("cart-1") == [(macbook, 5)]
+        setup_data.reserve("cart-2", macbook, 10, ttl=0)
+        assert setup_data.order([(macbook, 10)]) == 14500
+
+    def test_expiry_pops_only_due_carts(self):
+        now = [0.0]
+        book = ReservationBook(clock=lambda: now[0])
+        product = products.Product("MacBook Air M2", price=1450, quantity=10)
+        book.reserve("short", product, 1, ttl=10)
+        book.reserve("long", product, 2, ttl=100)
+        now[0] = 5
+        book.reserve("short", product, 1, ttl=10)
+        assert book.get_deadline("short") == 15
+        now[0] = 12
+        assert book.expire() == []
+        now[0] = 20
+        assert book.expire() == ["short"]
+        assert book.get_reserved(product) == 2
+        assert book.expire(now=1000) == ["long"]
+        assert len(book) == 0
@@ -0,0 +1,87 @@
+import pytest
+
+import products
+from sharded_store import ShardedStore, shard_for
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """
+    Builds a catalog whose first two products live on different shards.
+
+    Returns:
+        list[Product]: The products to shard.
+    """
+    names = [f"Product {number}" for number in range(20)]
+    first = names[0]
+    other = next(name for name in names
+                 if shard_for(name, 2) != shard_for(first, 2))
+    product_list = [products.Product(name, price=10.0, quantity=5)
+                    for name in names]
+    product_list.append(products.LimitedProduct("Shipping", price=1.0,
+                                                quantity=100, maximum=1))
+    return product_list, first, other
+
+
+@pytest.fixture
+def setup_data(catalog):
+    product_list, first, other = catalog
+    with ShardedStore(product_list, shard_count=2) as sharded:
+        yield sharded, first, other
+
+
+class TestSHARDEDSTORE:
+    """
+    Test suite for the multi-process sharded store.
+    """
+
+    def test_total_quantity(self, setup_data):
+        sharded, _, _ = setup_data
+        assert sharded.get_total_quantity() == 200
+        assert len(sharded.get_all_products()) == 21
+
+    def test_cross_shard_order_commits(self, setup_data):
+        sharded, first, other = setup_data
+        assert sharded.order([(first, 2), (other, 3)]) == 50.0
+        assert sharded.get_total_quantity() == 195
+
+    def test_cross_shard_order_is_atomic(self, setup_data):
+        sharded, first, other = setup_data
+        with pytest.raises(ValueError, match="Quantity larger"):
+            sharded.order([(first, 2), (other, 6)])
+        assert sharded.get_total_quantity() == 200
+
+    @pytest.mark.parametrize("quantity", [0, -1, 1.5])
+    def test_cross_shard_invalid_quantity(self, setup_data, quantity):
+        sharded, first, other = setup_data
+        for lines in ([(first, 1), (other, quantity)],
+                      [(other, quantity), (first, 1)]):
+            with pytest.raises(ValueError, match="positive int"):
+                sharded.order(lines)
+            assert sharded.get_total_quantity() == 200
+        assert len(sharded.get_all_products()) == 21
+
+    def test_cross_shard_unknown_product(self, setup_data):
+        sharded, first, _ = setup_data
+        unknown = next(f"Unknown {number}" for number in range(20)
+                       if shard_for(f"Unknown {number}", 2)
+                       != shard_for(first, 2))
+        with pytest.raises(ValueError, match="Unknown product"):
+            sharded.order([(first, 1), (unknown, 1)])
+        assert sharded.get_total_quantity() == 200
+
+    def test_limited_product_maximum(self, setup_data):
+        sharded, first, _ = setup_data
+        with pytest.raises(ValueError, match="The maximum order is 1"):
+            sharded.order([("Shipping", 1), (first, 1), ("Shipping", 1)])
+        assert sharded.get_total_quantity() == 200
+
+    def test_order_many(self, setup_data):
+        sharded, first, other = setup_data
+        results = sharded.order_many([[(first, 5)], [(first, 1)],
+                                      [(first, 1), (other, 1)], []])
+        assert results[0] == 50.0
+        assert isinstance(results[1], ValueError)
+        assert isinstance(results[2], ValueError)
+        assert results[3] == 0.0
+        assert sharded.get_total_quantity() == 195
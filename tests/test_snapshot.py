@@ -0,0 +1,95 @@
+import pytest
+
+import products
+from main import create_store
+import snapshot
+import store
+
+
+class TestSNAPSHOT:
+    """
+    Test suite for saving and loading store snapshots.
+    """
+
+    def test_round_trip(self, tmp_path):
+        best_buy = create_store()
+        best_buy.get_product("Google Pixel 7").set_quantity(0)
+        path = str(tmp_path / "catalog.snap")
+        best_buy.save_snapshot(path)
+
+        restored = store.Store.load_snapshot(path)
+        assert [str(product) for product in restored.get_products()] == \
+            [str(product) for product in best_buy.get_products()]
+        assert restored.get_total_quantity() == 850
+        assert not restored.get_product("Google Pixel 7").is_active()
+        assert isinstance(restored.get_product("Shipping"),
+                          products.LimitedProduct)
+        assert restored.get_product("Shipping").get_maximum() == 1
+        assert isinstance(restored.get_product("Windows License"),
+                          products.NonStockedProduct)
+
+    def test_restored_order_totals(self, tmp_path):
+        best_buy = create_store()
+        path = str(tmp_path / "catalog.snap")
+        best_buy.save_snapshot(path)
+        restored = store.Store.load_snapshot(path)
+        assert restored.order(
+            [(restored.get_product("MacBook Air M2"), 6)]) == 6525
+
+    def test_shared_promotions_stay_shared(self, tmp_path):
+        best_buy = create_store()
+        promotion = best_buy.get_product("MacBook Air M2").get_promotion()
+        best_buy.get_product("Google Pixel 7").set_promotion(promotion)
+        path = str(tmp_path / "catalog.snap")
+        best_buy.save_snapshot(path)
+
+        restored = store.Store.load_snapshot(path)
+        assert (restored.get_product("MacBook Air M2").get_promotion()
+                is restored.get_product("Google Pixel 7").get_promotion())
+        assert restored.get_product(
+            "Windows License").get_promotion().get_percent() == 30
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "catalog.snap"
+        path.write_bytes(b"not a snapshot at all, definitely not")
+        with pytest.raises(ValueError, match="Not a product snapshot"):
+            snapshot.load_products(str(path))
+
+    def test_columnar_load(self, tmp_path):
+        pytest.importorskip("numpy")
+        from columnar_store import ColumnarStore
+
+        best_buy = create_store()
+        best_buy.get_product("Google Pixel 7").set_quantity(0)
+        best_buy.add_product(products.Product("Café Crème", price=2.5,
+                                              quantity=7))
+        path = str(tmp_path / "catalog.snap")
+        best_buy.save_snapshot(path)
+
+        columnar = ColumnarStore.load_snapshot(path)
+        assert columnar.get_total_quantity() == 857
+        assert len(columnar) == 6
+        copied = ColumnarStore(best_buy.get_products())
+        assert [str(product) for product in columnar.get_products()] == \
+            [str(product) for product in copied.get_products()]
+        assert not columnar.get_product("Google Pixel 7").is_active()
+        assert columnar.get_product("Shipping").get_maximum() == 1
+        assert (columnar.get_product("MacBook Air M2").get_promotion()
+                is not None)
+        assert columnar.order(
+            [(columnar.get_product("MacBook Air M2"), 6)]) == 6525
+        columnar.add_product(products.Product("Extra", price=1.0,
+                                              quantity=1))
+        assert columnar.get_total_quantity() == 852
+
+    def test_columnar_load_empty(self, tmp_path):
+        pytest.importorskip("numpy")
+        from columnar_store import ColumnarStore
+
+        path = str(tmp_path / "empty.snap")
+        snapshot.save_products([], path)
+        columnar = ColumnarStore.load_snapshot(path)
+        assert len(columnar) == 0
+        columnar.add_product(products.Product("Extra", price=1.0,
+                                              quantity=1))
+        assert columnar.get_total_quantity() == 1
@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from main import create_store
+import products
+from sqlite_store import SQLiteStore
+
+
+@pytest.fixture
+def setup_data(tmp_path):
+    """
+    Fixture to set up a SQLite store with the default catalog.
+
+    Returns:
+        SQLiteStore: A store backed by a temporary database file.
+    """
+    with SQLiteStore(str(tmp_path / "catalog.db"),
+                     create_store().get_products()) as best_buy:
+        yield best_buy
+
+
+class TestSQLITESTORE:
+    """
+    Test suite for the SQLite backed store.
+    """
+
+    def test_catalog(self, setup_data):
+        assert [str(product) for product in setup_data.get_products()] == \
+            [str(product) for product in create_store().get_products()]
+        assert setup_data.get_total_quantity() == 1100
+        assert len(setup_data) == 5
+
+    def test_order_prices_like_store(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        license_ = setup_data.get_product("Windows License")
+        assert setup_data.order([(mac, 6), (license_, 5)]) == 6525 + 437.5
+        assert setup_data.get_product("MacBook Air M2").get_quantity() == 94
+
+    def test_order_is_one_transaction(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        shipping = setup_data.get_product("Shipping")
+        with pytest.raises(ValueError, match="The maximum order is 1"):
+            setup_data.order([(mac, 5), (shipping, 2)])
+        assert setup_data.get_total_quantity() == 1100
+
+    def test_sold_out_product_is_deactivated(self, setup_data):
+        pixel = setup_data.get_product("Google Pixel 7")
+        setup_data.order([(pixel, 250)])
+        assert pixel.get_name() not in [
+            product.get_name() for product in setup_data.get_all_products()]
+
+    def test_validate_order(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        with pytest.raises(ValueError, match="Quantity larger"):
+            setup_data.validate_order([(mac, 60), (mac, 41)])
+
+    def test_add_and_remove(self, setup_data):
+        pixel = products.Product("Pixel Watch", price=300, quantity=7)
+        setup_data.add_product(pixel)
+        assert pixel in setup_data
+        with pytest.raises(ValueError, match="already exists"):
+            setup_data.add_products([products.Product("Tablet", 1.0, 1),
+                                     pixel])
+        assert setup_data.get_product("Tablet") is None
+        setup_data.remove_product(pixel)
+        assert setup_data.get_product("Pixel Watch") is None
+
+    def test_concurrent_orders_do_not_oversell(self, setup_data):
+        pixel = setup_data.get_product("Google Pixel 7")
+        sold = []
+
+        def worker():
+            for _ in range(50):
+                try:
+                    setup_data.order([(pixel, 1)])
+                except ValueError:
+                    continue
+                sold.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(sold) == 250
+        assert setup_data.get_product("Google Pixel 7").get_quantity() == 0
@@ -0,0 +1,156 @@
+import pytest
+
+import products
+import store
+
+
+@pytest.fixture
+def setup_data():
+    """
+    Fixture to set up a store with a small catalog of products.
+
+    Returns:
+        Store: An instance of the Store class with preloaded products.
+    """
+    product_list = [
+        products.Product("MacBook Air M2", price=1450, quantity=100),
+        products.Product("Bose QuietComfort Earbuds", price=250,
+                         quantity=500),
+        products.NonStockedProduct("Windows License", price=125),
+        products.LimitedProduct("Shipping", price=10, quantity=250, maximum=1)
+    ]
+
+    best_buy = store.Store(product_list)
+    yield best_buy
+
+
+class TestSTORE:
+    """
+    Test suite for the Store catalog: lookups, insertion order and removal.
+    """
+
+    def test_get_product_by_name(self, setup_data):
+        product = setup_data.get_product("Shipping")
+        assert isinstance(product, products.LimitedProduct)
+        assert setup_data.get_product("Unknown") is None
+
+    def test_products_keep_insertion_order(self, setup_data):
+        names = [product.get_name() for product in setup_data.get_products()]
+        assert names == ["MacBook Air M2", "Bose QuietComfort Earbuds",
+                         "Windows License", "Shipping"]
+
+    def test_contains(self, setup_data):
+        assert products.Product("MacBook Air M2", price=1450,
+                                quantity=1) in setup_data
+        assert products.Product("MacBook Air M2", price=999,
+                                quantity=1) not in setup_data
+
+    def test_remove_product(self, setup_data):
+        product = setup_data.get_product("Windows License")
+        setup_data.remove_product(product)
+        assert product not in setup_data
+        assert len(setup_data) == 3
+
+    def test_remove_missing_product(self, setup_data):
+        with pytest.raises(ValueError, match="Product not found in store"):
+            setup_data.remove_product(
+                products.Product("Google Pixel 7", price=500, quantity=250))
+
+    def test_add_duplicate_product(self, setup_data):
+        with pytest.raises(ValueError,
+                           match="Product already exists in store"):
+            setup_data.add_product(
+                products.Product("Shipping", price=10, quantity=1))
+
+    def test_set_products_rebuilds_index(self, setup_data):
+        pixel = products.Product("Google Pixel 7", price=500, quantity=250)
+        setup_data.set_products([pixel])
+        assert setup_data.get_products() == [pixel]
+        assert setup_data.get_product("Shipping") is None
+
+    def test_set_products_duplicate_keeps_store(self, setup_data):
+        before = setup_data.get_products()
+        with pytest.raises(ValueError,
+                           match="Product already exists in store"):
+            setup_data.set_products([
+                products.Product("Google Pixel 7", price=500, quantity=250),
+                products.Product("Google Pixel 7", price=450, quantity=10)])
+        assert setup_data.get_products() == before
+        assert setup_data.get_total_quantity() == 850
+        before[0].set_quantity(40)
+        assert setup_data.get_total_quantity() == 790
+
+    def test_total_quantity_follows_product_changes(self, setup_data):
+        assert setup_data.get_total_quantity() == 850
+        setup_data.get_product("MacBook Air M2").set_quantity(40)
+        assert setup_data.get_total_quantity() == 790
+        setup_data.order([(setup_data.get_product("Shipping"), 1)])
+        assert setup_data.get_total_quantity() == 789
+
+    def test_total_quantity_after_add_and_remove(self, setup_data):
+        pixel = products.Product("Google Pixel 7", price=500, quantity=250)
+        setup_data.add_product(pixel)
+        assert setup_data.get_total_quantity() == 1100
+        setup_data.remove_product(pixel)
+        pixel.set_quantity(10)
+        assert setup_data.get_total_quantity() == 850
+
+    def test_active_products_follow_deactivation(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        mac.set_quantity(0)
+        assert mac not in setup_data.get_all_products()
+        mac.set_quantity(5)
+        mac.activate()
+        assert setup_data.get_all_products()[0] is mac
+
+    def test_renamed_product_is_reindexed(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        mac.set_name("MacBook Air M3")
+        assert setup_data.get_product("MacBook Air M3") is mac
+        assert setup_data.get_product("MacBook Air M2") is None
+        assert setup_data.get_all_products()[0] is mac
+
+    def test_rename_to_existing_name_is_rejected(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        with pytest.raises(ValueError,
+                           match="Product already exists in store"):
+            mac.set_name("Shipping")
+        assert mac.get_name() == "MacBook Air M2"
+        assert len(setup_data) == 4
+        assert setup_data.get_product("Shipping").get_price() == 10
+        mac.set_name("MacBook Air M2")
+
+    def test_checkout_aggregates_stock(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        with pytest.raises(ValueError,
+                           match="Quantity larger than what exists"):
+            setup_data.checkout([(mac, 60), (mac, 60)])
+        assert mac.get_quantity() == 100
+
+    def test_checkout_is_all_or_nothing(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        shipping = setup_data.get_product("Shipping")
+        with pytest.raises(ValueError,
+                           match="The maximum order is 1"):
+            setup_data.checkout([(mac, 10), (shipping, 1), (shipping, 1)])
+        assert mac.get_quantity() == 100
+        assert shipping.get_quantity() == 250
+        assert setup_data.get_total_quantity() == 850
+
+    def test_checkout_applies_every_line(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        license_ = setup_data.get_product("Windows License")
+        total = setup_data.checkout([(mac, 10), (license_, 3), (mac, 5)])
+        assert total == 10 * 1450 + 3 * 125 + 5 * 1450
+        assert mac.get_quantity() == 85
+        assert license_.get_quantity() == 0
+
+    def test_checkout_rejects_non_positive_quantity(self, setup_data):
+        mac = setup_data.get_product("MacBook Air M2")
+        with pytest.raises(ValueError,
+                           match="Quantity must be a positive int"):
+            setup_data.checkout([(mac, -5)])
+
+    def test_buy_raises_on_insufficient_stock(self, setup_data):
+        with pytest.raises(ValueError, match="Quantity must be a int"):
+            setup_data.get_product("MacBook Air M2").buy(101)
@@ -28,7 +28,7 @@ def print_products(best_buy: Store) -> dict:
 def order_product(best_buy: Store) -> list:
     """
     Prompts the user to select products from the store and specify quantities
-    to create an order list.
+    to create an order list. Empty text or the end of input finishes it.
 
     Parameter:
         best_buy (Store): The store instance from which products are retrieved.
@@ -62,14 +62,15 @@ def order_product(best_buy: Store) -> list:
             print("Product added to list!\n")
         except ValueError:
             print("Error adding product!\n")
+        except EOFError:  # End of input finishes the order like empty text
+            break
     return list_products_for_order
 
 
 def validate_order_util(best_buy: Store,
                         list_products_for_order: list[(dict, int)]):
     """
-    Validates the provided list of products for an order, then completes the
-    order if validation succeeds.
+    Validates and completes the order in one all-or-nothing checkout.
 
     Parameters:
         best_buy (Store): The store instance where the order will be placed.
@@ -82,14 +83,13 @@ def validate_order_util(best_buy: Store,
                 order if successful.
     """
     try:
-        best_buy.validate_order(list_products_for_order)
+        total_payment = best_buy.checkout(list_products_for_order)
     except ValueError as validate_order:
         print(validate_order)
     else:
         if list_products_for_order:
             print("********")
-            print(
-                f"Order made! Total payment: ${best_buy.order(list_products_for_order)}\n")
+            print(f"Order made! Total payment: ${total_payment}\n")
         else:
             print("\n")
 